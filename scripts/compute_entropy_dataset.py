@@ -10,8 +10,17 @@ from pevolc.pipelines.compute_entropy import run_from_config
 def main() -> None:
     parser = argparse.ArgumentParser(description="Compute PE/MPE/WPE features from seismic data.")
     parser.add_argument("config", help="Path to YAML configuration file.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (overrides n_workers in the config).",
+    )
     args = parser.parse_args()
-    run_from_config(args.config)
+    dataset = run_from_config(args.config, n_workers=args.workers)
+    if "cache_stats" in dataset.attrs:
+        stats = dataset.attrs["cache_stats"]
+        print(f"Feature cache: {stats['hits']} hits, {stats['misses']} misses")
 
 
 if __name__ == "__main__":
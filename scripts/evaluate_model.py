@@ -9,17 +9,36 @@ import joblib
 import pandas as pd
 from sklearn.metrics import average_precision_score, roc_auc_score
 
+from pevolc.io import read_feature_table
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Evaluate a trained PE-based forecasting model.")
     parser.add_argument("model", type=Path, help="Path to joblib model.")
-    parser.add_argument("dataset", type=Path, help="CSV with features and labels.")
+    parser.add_argument("dataset", type=Path, help="CSV file or Parquet dataset with features and labels.")
     parser.add_argument("--label-column", default="label", help="Name of label column.")
+    parser.add_argument(
+        "--feature-columns",
+        nargs="+",
+        default=None,
+        help="Feature columns to load (default: every numeric column except the label).",
+    )
+    parser.add_argument(
+        "--time-range",
+        nargs=2,
+        type=float,
+        default=None,
+        metavar=("START", "STOP"),
+        help="Only evaluate windows with START <= start_s < STOP.",
+    )
     args = parser.parse_args()
 
     model = joblib.load(args.model)
-    df = pd.read_csv(args.dataset)
+    columns = None if args.feature_columns is None else [*args.feature_columns, args.label_column]
+    df = read_feature_table(args.dataset, columns=columns, time_range=args.time_range)
     y = df[args.label_column]
     X = df.drop(columns=[args.label_column])
+    if args.feature_columns is None:
+        X = X[[c for c in X.columns if pd.api.types.is_numeric_dtype(X[c])]]
     probs = model.predict_proba(X)
     auc = roc_auc_score(y, probs)
     pr_auc = average_precision_score(y, probs)
@@ -0,0 +1,42 @@
+"""Serve a trained forecaster over HTTP on localhost."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+
+from pevolc.models.serving import serve
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Score feature rows with a long-lived forecaster.")
+    parser.add_argument(
+        "model",
+        type=Path,
+        help="Joblib model or compiled .npz artifact (reloaded when it changes).",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: localhost only).")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    parser.add_argument("--max-batch-rows", type=int, default=4096, help="Rows per predict_proba call.")
+    parser.add_argument(
+        "--max-wait-ms", type=float, default=2.0, help="Time to wait for more requests per batch."
+    )
+    parser.add_argument(
+        "--reload-interval", type=float, default=1.0, help="Seconds between model file checks."
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    serve(
+        args.model,
+        host=args.host,
+        port=args.port,
+        max_batch_rows=args.max_batch_rows,
+        max_wait_ms=args.max_wait_ms,
+        reload_interval=args.reload_interval,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Core package for permutation entropy based eruption forecasting."""
 
 __all__ = [
+    "compiled",
     "entropy",
     "features",
     "io",
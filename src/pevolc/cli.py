@@ -14,10 +14,19 @@ def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Permutation entropy eruption forecasting")
     parser.add_argument("command", choices=["compute-entropy", "train"], help="Action to run")
     parser.add_argument("config", type=Path, help="Path to configuration file")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for compute-entropy (overrides n_workers in the config)",
+    )
     args = parser.parse_args(argv)
 
     if args.command == "compute-entropy":
-        run_entropy(args.config)
+        dataset = run_entropy(args.config, n_workers=args.workers)
+        if "cache_stats" in dataset.attrs:
+            stats = dataset.attrs["cache_stats"]
+            print(f"Feature cache: {stats['hits']} hits, {stats['misses']} misses")
     elif args.command == "train":
         run_training(args.config)
     else:  # pragma: no cover - guarded by argparse
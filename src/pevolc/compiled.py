@@ -0,0 +1,186 @@
+"""Dependency-light scoring artifacts for fitted forecasters.
+
+:func:`save_compiled` writes the fitted parameters of a
+:class:`~pevolc.models.PermutationEntropyForecaster` into a plain ``.npz``
+archive, and :func:`load_compiled` returns a :class:`CompiledForecaster` that
+reproduces its ``predict_proba`` with NumPy alone. Loading and scoring never
+import scikit-learn or unpickle estimators, which keeps cold starts cheap on
+alerting hosts.
+
+The archive holds, depending on the model type,
+
+``logreg``
+    ``coef`` and ``intercept`` of the logistic regression;
+``sgd``
+    ``mean`` and ``scale`` of the standardizer plus ``coef`` and ``intercept``;
+``random_forest`` / ``gradient_boosting``
+    every tree flattened into shared node arrays (``left``, ``right``,
+    ``feature``, ``threshold``, ``value``) with ``roots`` indexing the first
+    node of each tree; leaves point to themselves so that all trees are walked
+    together for ``depth`` steps. Gradient boosting adds the ``baseline``
+    log-odds and folds the learning rate into ``value``;
+
+together with ``n_features`` (the fitted width) and ``platt`` (slope,
+intercept) when the forecaster is calibrated.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+
+COMPILED_FORMAT_VERSION = 1
+COMPILED_MODEL_TYPES = ("logreg", "sgd", "random_forest", "gradient_boosting")
+
+# Rows scored per step of the tree walk; bounds the (n_trees, rows) index arrays.
+_TREE_BLOCK_ROWS = 4096
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return np.exp(-np.logaddexp(0.0, -z))
+
+
+def _flatten_trees(trees: Sequence[Any], leaf_value) -> dict[str, np.ndarray]:
+    """Concatenate fitted sklearn trees into one node table."""
+
+    lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        t = tree.tree_
+        nodes = np.arange(t.node_count)
+        leaf = t.children_left < 0
+        lefts.append(np.where(leaf, nodes, t.children_left) + offset)
+        rights.append(np.where(leaf, nodes, t.children_right) + offset)
+        features.append(np.where(leaf, 0, t.feature))
+        thresholds.append(np.where(leaf, 0.0, t.threshold))
+        values.append(leaf_value(t.value[:, 0, :]))
+        roots.append(offset)
+        offset += t.node_count
+    return {
+        "roots": np.asarray(roots, dtype=np.int64),
+        "left": np.concatenate(lefts).astype(np.int64),
+        "right": np.concatenate(rights).astype(np.int64),
+        "feature": np.concatenate(features).astype(np.int64),
+        "threshold": np.concatenate(thresholds).astype(float),
+        "value": np.concatenate(values).astype(float),
+        "depth": np.asarray(max(tree.tree_.max_depth for tree in trees)),
+    }
+
+
+def compile_forecaster(forecaster: Any) -> dict[str, np.ndarray]:
+    """NumPy arrays describing a fitted forecaster (see the module docstring)."""
+
+    model_type = forecaster.model_type
+    model = forecaster.model
+    if model_type == "logreg":
+        arrays = {"coef": model.coef_[0], "intercept": np.asarray(model.intercept_[0])}
+    elif model_type == "sgd":
+        scaler, clf = model.named_steps["scale"], model.named_steps["clf"]
+        arrays = {
+            "mean": scaler.mean_,
+            "scale": scaler.scale_,
+            "coef": clf.coef_[0],
+            "intercept": np.asarray(clf.intercept_[0]),
+        }
+    elif model_type == "random_forest":
+        positive = list(model.classes_).index(1)
+        arrays = _flatten_trees(
+            model.estimators_, lambda value: value[:, positive] / value.sum(axis=1)
+        )
+    elif model_type == "gradient_boosting":
+        trees = model.estimators_[:, 0]
+        rate = model.learning_rate
+        arrays = _flatten_trees(trees, lambda value: rate * value[:, 0])
+        # The initial estimator's log-odds, recovered through the public API.
+        x0 = np.zeros((1, model.n_features_in_))
+        offsets = sum(tree.predict(x0.astype(np.float32))[0] for tree in trees)
+        arrays["baseline"] = np.asarray(model.decision_function(x0)[0] - rate * offsets)
+    else:
+        raise ValueError(f"Unknown model_type '{model_type}' for compilation")
+    arrays = {
+        "model_type": np.asarray(model_type),
+        "n_features": np.asarray(model.n_features_in_),
+        **arrays,
+    }
+    arrays["format_version"] = np.asarray(COMPILED_FORMAT_VERSION)
+    if forecaster.calibrator is not None:
+        lr = forecaster.calibrator._lr
+        arrays["platt"] = np.array([lr.coef_[0, 0], lr.intercept_[0]])
+    return arrays
+
+
+def save_compiled(forecaster: Any, path: Path) -> Path:
+    """Write :func:`compile_forecaster` output to ``path`` (``.npz``) atomically."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    buffer = io.BytesIO()
+    np.savez(buffer, **compile_forecaster(forecaster))
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(buffer.getvalue())
+    os.replace(tmp, path)
+    return path
+
+
+class CompiledForecaster:
+    """NumPy-only scorer equivalent to the forecaster it was compiled from."""
+
+    def __init__(self, arrays: dict[str, np.ndarray]) -> None:
+        version = int(arrays["format_version"])
+        if version != COMPILED_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled format version {version}")
+        self.model_type = str(arrays["model_type"])
+        if self.model_type not in COMPILED_MODEL_TYPES:
+            raise ValueError(f"Unknown model_type '{self.model_type}' in compiled artifact")
+        self.arrays = arrays
+        self.n_features_in_ = int(arrays["n_features"]) if "n_features" in arrays else None
+
+    def _walk(self, X: np.ndarray) -> np.ndarray:
+        """Leaf value of every tree for every row, shape ``(n_trees, n_rows)``."""
+
+        a = self.arrays
+        # Trees compare float32 features against float64 thresholds, as sklearn does.
+        X = X.astype(np.float32)
+        out = np.empty((len(a["roots"]), len(X)))
+        for start in range(0, len(X), _TREE_BLOCK_ROWS):
+            block = X[start : start + _TREE_BLOCK_ROWS]
+            rows = np.arange(len(block))
+            node = np.repeat(a["roots"][:, None], len(block), axis=1)
+            for _ in range(int(a["depth"])):
+                go_left = block[rows, a["feature"][node]] <= a["threshold"][node]
+                node = np.where(go_left, a["left"][node], a["right"][node])
+            out[:, start : start + len(block)] = a["value"][node]
+        return out
+
+    def raw_proba(self, features: Sequence[Sequence[float]]) -> np.ndarray:
+        """Uncalibrated positive-class probabilities."""
+
+        a = self.arrays
+        X = np.atleast_2d(np.asarray(features, dtype=float))
+        if self.model_type == "logreg":
+            return _sigmoid(X @ a["coef"] + a["intercept"])
+        if self.model_type == "sgd":
+            return _sigmoid(((X - a["mean"]) / a["scale"]) @ a["coef"] + a["intercept"])
+        if self.model_type == "random_forest":
+            return self._walk(X).mean(axis=0)
+        return _sigmoid(a["baseline"] + self._walk(X).sum(axis=0))
+
+    def predict_proba(self, features: Sequence[Sequence[float]]) -> np.ndarray:
+        """Calibrated probabilities, as :meth:`PermutationEntropyForecaster.predict_proba`."""
+
+        probs = self.raw_proba(features)
+        if "platt" in self.arrays:
+            slope, intercept = self.arrays["platt"]
+            probs = _sigmoid(slope * probs + intercept)
+        return probs
+
+
+def load_compiled(path: Path) -> CompiledForecaster:
+    """Load an artifact written by :func:`save_compiled`."""
+
+    with np.load(path, allow_pickle=False) as archive:
+        return CompiledForecaster({name: archive[name] for name in archive.files})
@@ -1,8 +1,27 @@
 """Entropy computation modules."""
 
 from .pe import compute_pe
-from .mpe import compute_mpe
-from .wpe import compute_wpe
+from .mpe import MultiscalePyramid, compute_mpe
+from .wpe import compute_wpe, rolling_weights
+from .sliding import sliding_mpe, sliding_pe, sliding_wpe
+from .sweep import entropy_sweep, sweep_column
+from .batch import compute_mpe_batch, compute_pe_batch, compute_wpe_batch, window_view
 from .utils import coarse_grain
 
-__all__ = ["compute_pe", "compute_mpe", "compute_wpe", "coarse_grain"]
+__all__ = [
+    "compute_pe",
+    "compute_mpe",
+    "compute_wpe",
+    "coarse_grain",
+    "sliding_pe",
+    "sliding_wpe",
+    "sliding_mpe",
+    "rolling_weights",
+    "MultiscalePyramid",
+    "compute_pe_batch",
+    "compute_mpe_batch",
+    "compute_wpe_batch",
+    "window_view",
+    "entropy_sweep",
+    "sweep_column",
+]
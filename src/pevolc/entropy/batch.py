@@ -0,0 +1,192 @@
+"""Batched PE/WPE/MPE over many series at once.
+
+Each function takes a 2D array of shape ``(n_series, n_samples)``—for example
+many traces, or a zero-copy window view of one trace from
+:func:`window_view`—and evaluates every row with whole-array operations:
+embedding, pattern encoding, per-row histogram and entropy reduction. Results
+match the 1D functions applied row by row up to floating-point rounding. An
+optional ``memory_budget`` (bytes) processes the rows in groups whose
+intermediates stay within the budget.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+from .utils import (
+    _SPARSE_RATIO,
+    _as_samples,
+    _windows_per_chunk,
+    coarse_grain,
+    ordinal_pattern_indices,
+)
+from .wpe import rolling_weights
+
+
+def window_view(signal: Sequence[float], window: int, step: int) -> np.ndarray:
+    """Zero-copy ``(n_windows, window)`` view of sliding windows over a 1D trace.
+
+    Windows start at ``0, step, 2 * step, ...``; a trace shorter than ``window``
+    yields an empty view.
+    """
+
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step must be positive")
+    x = _as_samples(signal)
+    if len(x) < window:
+        return np.empty((0, window), dtype=x.dtype)
+    return np.lib.stride_tricks.sliding_window_view(x, window)[::step]
+
+
+def _as_batch(signals: np.ndarray | Sequence[Sequence[float]]) -> np.ndarray:
+    x = _as_samples(signals)
+    if x.ndim != 2:
+        raise ValueError("signals must be a 2D array of shape (n_series, n_samples)")
+    return x
+
+
+def _row_groups(x: np.ndarray, order: int, memory_budget: int | None) -> list[slice]:
+    """Row slices of ``x`` whose pattern-extraction intermediates fit the budget."""
+
+    if memory_budget is None:
+        return [slice(0, x.shape[0])]
+    rows = max(1, _windows_per_chunk(order, memory_budget) // max(x.shape[1], 1))
+    return [slice(i, i + rows) for i in range(0, x.shape[0], rows)]
+
+
+def _batch_entropy(
+    pattern_ids: np.ndarray,
+    order: int,
+    weights: np.ndarray | None,
+    base: float,
+    normalize: bool,
+) -> np.ndarray:
+    """Row-wise entropy of pattern ids of shape ``(n_series, n_windows)``.
+
+    Dense per-row histograms are used while ``order!`` is comparable to the
+    number of windows per row; otherwise only observed (row, pattern) pairs are
+    counted, as in :class:`~pevolc.entropy.utils.PatternHistogram`.
+    """
+
+    n_series, n_windows = pattern_ids.shape
+    n_patterns = math.factorial(order)
+    # Offset each row into its own block so one bincount yields every histogram.
+    offsets = np.arange(n_series, dtype=np.int64)[:, None] * n_patterns
+    flat_ids = (pattern_ids + offsets).ravel()
+    flat_weights = None if weights is None else np.asarray(weights, dtype=float).ravel()
+    if n_patterns > _SPARSE_RATIO * n_windows:
+        keys, inverse = np.unique(flat_ids, return_inverse=True)
+        counts = np.bincount(inverse, weights=flat_weights, minlength=len(keys)).astype(float)
+        rows = keys // n_patterns
+        totals = np.bincount(rows, weights=counts, minlength=n_series)
+        probs = counts / totals[rows]
+        plogp = np.bincount(rows, weights=probs * np.log(probs), minlength=n_series)
+    else:
+        counts = np.bincount(flat_ids, weights=flat_weights, minlength=n_series * n_patterns)
+        counts = counts.reshape(n_series, n_patterns).astype(float, copy=False)
+        totals = counts.sum(axis=1, keepdims=True)
+        probs = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+        plogp = np.zeros_like(probs)
+        np.log(probs, out=plogp, where=probs > 0)
+        plogp *= probs
+        plogp = plogp.sum(axis=1)
+    entropy = -plogp / math.log(base)
+    if normalize:
+        entropy /= math.log(math.factorial(order), base)
+    return entropy
+
+
+def compute_pe_batch(
+    signals: np.ndarray | Sequence[Sequence[float]],
+    order: int = 3,
+    delay: int = 1,
+    *,
+    base: float = math.e,
+    normalize: bool = True,
+    memory_budget: int | None = None,
+) -> np.ndarray:
+    """Permutation entropy of every row of a 2D array.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape ``(n_series,)``.
+    """
+
+    x = _as_batch(signals)
+    if x.shape[0] == 0:
+        return np.empty(0, dtype=float)
+    entropies = np.empty(x.shape[0], dtype=float)
+    for rows in _row_groups(x, order, memory_budget):
+        pattern_ids = ordinal_pattern_indices(x[rows], order, delay)
+        entropies[rows] = _batch_entropy(pattern_ids, order, None, base, normalize)
+    return entropies
+
+
+def compute_wpe_batch(
+    signals: np.ndarray | Sequence[Sequence[float]],
+    order: int = 3,
+    delay: int = 1,
+    *,
+    base: float = math.e,
+    normalize: bool = True,
+    weight_strategy: str = "variance",
+    memory_budget: int | None = None,
+) -> np.ndarray:
+    """Weighted permutation entropy of every row of a 2D array.
+
+    ``weight_strategy`` is as in :func:`pevolc.entropy.wpe.compute_wpe`.
+    Returns an array of shape ``(n_series,)``.
+    """
+
+    x = _as_batch(signals)
+    if x.shape[0] == 0:
+        return np.empty(0, dtype=float)
+    entropies = np.empty(x.shape[0], dtype=float)
+    for rows in _row_groups(x, order, memory_budget):
+        pattern_ids = ordinal_pattern_indices(x[rows], order, delay)
+        weights = rolling_weights(x[rows], order, delay, weight_strategy)
+        entropies[rows] = _batch_entropy(pattern_ids, order, weights, base, normalize)
+    return entropies
+
+
+def compute_mpe_batch(
+    signals: np.ndarray | Sequence[Sequence[float]],
+    scales: int | Sequence[int] = 5,
+    order: int = 3,
+    delay: int = 1,
+    *,
+    base: float = math.e,
+    normalize: bool = True,
+    memory_budget: int | None = None,
+) -> np.ndarray:
+    """Multiscale permutation entropy of every row of a 2D array.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape ``(n_series, n_scales)``; column ``j`` holds the entropy at
+        the ``j``-th requested scale.
+    """
+
+    x = _as_batch(signals)
+    if isinstance(scales, int):
+        scale_list = list(range(1, scales + 1))
+    else:
+        scale_list = list(scales)
+    entropies = np.empty((x.shape[0], len(scale_list)), dtype=float)
+    if x.shape[0] == 0:
+        return entropies
+    for j, scale in enumerate(scale_list):
+        entropies[:, j] = compute_pe_batch(
+            coarse_grain(x, scale),
+            order=order,
+            delay=delay,
+            base=base,
+            normalize=normalize,
+            memory_budget=memory_budget,
+        )
+    return entropies
@@ -5,6 +5,8 @@ from __future__ import annotations
 import math
 from typing import Sequence
 
+import numpy as np
+
 from .pe import compute_pe
 from .utils import coarse_grain
 
@@ -17,6 +19,7 @@ def compute_mpe(
     *,
     base: float = math.e,
     normalize: bool = True,
+    memory_budget: int | None = None,
 ) -> list[float]:
     """Compute multiscale permutation entropy over multiple coarse-grained scales.
 
@@ -26,7 +29,7 @@ def compute_mpe(
         Input time series.
     scales:
         Number of scales (1..scales inclusive) or explicit iterable of scales.
-    order, delay, base, normalize:
+    order, delay, base, normalize, memory_budget:
         Passed to :func:`compute_pe`.
     """
 
@@ -38,6 +41,66 @@ def compute_mpe(
     for scale in scale_list:
         coarse = coarse_grain(signal, scale)
         entropies.append(
-            compute_pe(coarse, order=order, delay=delay, base=base, normalize=normalize)
+            compute_pe(
+                coarse,
+                order=order,
+                delay=delay,
+                base=base,
+                normalize=normalize,
+                memory_budget=memory_budget,
+            )
         )
     return entropies
+
+
+class MultiscalePyramid:
+    """Coarse-grained levels of a whole trace.
+
+    ``level(scale, phase)`` is the series of block means over
+    ``x[phase + j * scale : phase + (j + 1) * scale]``; a window starting at
+    ``start`` with ``start % scale == phase`` finds its coarse-grained series as a
+    contiguous slice of that level. Levels are computed lazily (one linear pass
+    each) and cached. Each block is averaged exactly as :func:`coarse_grain`
+    averages it, so the means are bit-identical to coarse-graining the window
+    and tied means (quantized counts, clipped segments) order the same way.
+    """
+
+    def __init__(self, signal: Sequence[float]) -> None:
+        self._signal = np.asarray(signal)
+        self._levels: dict[tuple[int, int], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signal)
+
+    def level(self, scale: int, phase: int = 0) -> np.ndarray:
+        """Block means of length ``scale`` starting at sample ``phase``."""
+
+        if scale < 1:
+            raise ValueError("scale must be >= 1")
+        if not 0 <= phase < scale:
+            raise ValueError("phase must satisfy 0 <= phase < scale")
+        key = (scale, phase)
+        if key not in self._levels:
+            tail = self._signal[phase:]
+            self._levels[key] = (
+                coarse_grain(tail, scale) if len(tail) >= scale else np.empty(0, dtype=float)
+            )
+        return self._levels[key]
+
+    def window(self, start: int, length: int, scale: int, alignment: str = "exact") -> np.ndarray:
+        """Coarse-grained series of ``x[start:start + length]`` at ``scale``.
+
+        With ``alignment="floor"`` the start snaps down to a multiple of ``scale``.
+        """
+
+        if alignment == "exact":
+            phase = start % scale
+        elif alignment == "floor":
+            phase = 0
+        else:
+            raise ValueError(f"Unknown alignment '{alignment}'")
+        n_blocks = length // scale
+        if n_blocks == 0:
+            raise ValueError("signal too short for requested scale")
+        first = (start - phase) // scale
+        return self.level(scale, phase)[first : first + n_blocks]
@@ -5,9 +5,7 @@ from __future__ import annotations
 import math
 from typing import Sequence
 
-import numpy as np
-
-from .utils import pattern_distribution
+from .utils import pattern_histogram
 
 
 def compute_pe(
@@ -17,6 +15,7 @@ def compute_pe(
     *,
     base: float = math.e,
     normalize: bool = True,
+    memory_budget: int | None = None,
 ) -> float:
     """Compute permutation entropy for a 1D sequence.
 
@@ -32,11 +31,10 @@ def compute_pe(
         Logarithm base used in the entropy definition.
     normalize:
         If True, divide by ``log(order!)`` so the output lies in ``[0, 1]``.
+    memory_budget:
+        Optional bound in bytes on the intermediates of pattern extraction; the
+        trace is then processed in overlapping blocks with identical results.
     """
 
-    probs, _ = pattern_distribution(signal, order, delay)
-    nonzero = probs[probs > 0]
-    entropy = -np.sum(nonzero * np.log(nonzero) / math.log(base))
-    if normalize:
-        entropy /= math.log(math.factorial(order), base)
-    return float(entropy)
+    histogram = pattern_histogram(signal, order, delay, memory_budget=memory_budget)
+    return histogram.entropy(base=base, normalize=normalize)
@@ -0,0 +1,319 @@
+"""Incremental permutation entropy over sliding windows.
+
+Ordinal pattern ids are computed once for the whole trace; a histogram then
+slides along them, adding the ids that enter each window and removing the ones
+that leave. Entropy is updated from the changed bins only, so the total cost
+depends on the trace length rather than on the window/step overlap.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+from .mpe import MultiscalePyramid
+from .utils import _as_samples, ordinal_pattern_indices
+from .wpe import rolling_weights
+
+
+def _xlogx(values: np.ndarray) -> np.ndarray:
+    """Elementwise ``x * log(x)`` with the convention ``0 * log(0) = 0``."""
+
+    out = np.zeros(values.shape, dtype=float)
+    nonzero = values > 0
+    out[nonzero] = values[nonzero] * np.log(values[nonzero])
+    return out
+
+
+class SlidingPatternHistogram:
+    """Ordinal pattern histogram with an incrementally maintained entropy.
+
+    The histogram keeps ``S = sum_k c_k log c_k`` alongside the bin masses so that
+    the Shannon entropy ``log(N) - S / N`` can be refreshed after each update by
+    touching only the bins that changed.
+
+    With ``weighted=True`` every pattern carries a weight (WPE) and bins hold
+    weight sums. Integer occurrence counts are kept alongside, so a bin that
+    empties is reset to exactly zero; :meth:`refresh` rebuilds the sums from the
+    ids currently in the window to bound accumulated rounding error, and
+    :attr:`needs_refresh` flags when large weights have left the window.
+    """
+
+    # Rounding error scales with the largest mass seen since the last refresh.
+    _MAX_PEAK_RATIO = 1e3
+
+    def __init__(self, n_patterns: int, weighted: bool = False) -> None:
+        self.counts = np.zeros(n_patterns, dtype=np.int64)
+        self.mass = np.zeros(n_patterns, dtype=float) if weighted else None
+        self.total = 0.0
+        self.n_occupied = 0
+        self._sum_mlogm = 0.0
+        self._peak_total = 0.0
+
+    @property
+    def weighted(self) -> bool:
+        return self.mass is not None
+
+    @property
+    def needs_refresh(self) -> bool:
+        """Whether cancellation since the last refresh may have cost precision."""
+
+        return self._peak_total > self._MAX_PEAK_RATIO * self.total
+
+    def update(
+        self,
+        entering: np.ndarray,
+        leaving: np.ndarray,
+        entering_weights: np.ndarray | None = None,
+        leaving_weights: np.ndarray | None = None,
+    ) -> None:
+        """Add ``entering`` pattern ids and remove ``leaving`` ones.
+
+        Weighted histograms also need the weights of the entering and leaving ids.
+        """
+
+        ids = np.concatenate([entering, leaving])
+        if ids.size == 0:
+            return
+        changed, inverse = np.unique(ids, return_inverse=True)
+        n_entering = len(entering)
+        delta = np.bincount(inverse[:n_entering], minlength=len(changed)) - np.bincount(
+            inverse[n_entering:], minlength=len(changed)
+        )
+        before = self.counts[changed]
+        after = before + delta
+        if np.any(after < 0):
+            raise ValueError("Cannot remove patterns that are not in the histogram")
+        self.counts[changed] = after
+        if self.mass is not None:
+            if entering_weights is None or leaving_weights is None:
+                raise ValueError("weighted histograms need entering and leaving weights")
+            signed = np.concatenate([entering_weights, -np.asarray(leaving_weights)])
+            mass_before = self.mass[changed]
+            mass_after = mass_before + np.bincount(inverse, weights=signed, minlength=len(changed))
+            mass_after[after == 0] = 0.0
+            self.mass[changed] = mass_after
+            self._peak_total = max(self._peak_total, self.total + float(np.sum(entering_weights)))
+            self.total += float(signed.sum())
+        else:
+            mass_before, mass_after = before, after
+            self.total += n_entering - len(leaving)
+        self._sum_mlogm += float(_xlogx(mass_after).sum() - _xlogx(mass_before).sum())
+        self.n_occupied += int(np.count_nonzero(after) - np.count_nonzero(before))
+
+    def refresh(self, ids: np.ndarray, weights: np.ndarray | None = None) -> None:
+        """Recompute the running sums exactly from the ids currently in the window."""
+
+        bins, inverse = np.unique(ids, return_inverse=True)
+        if self.mass is not None:
+            mass = np.bincount(inverse, weights=weights, minlength=len(bins))
+            self.mass[bins] = mass
+        else:
+            mass = self.counts[bins]
+        self.total = float(mass.sum())
+        self._sum_mlogm = float(_xlogx(mass).sum())
+        self._peak_total = self.total
+
+    def entropy(self, order: int, base: float = math.e, normalize: bool = True) -> float:
+        """Entropy of the current histogram, matching :func:`compute_pe` conventions."""
+
+        if self.n_occupied <= 1:
+            # A single occupied bin has exactly zero entropy; avoid float residue.
+            return 0.0
+        entropy = (math.log(self.total) - self._sum_mlogm / self.total) / math.log(base)
+        if normalize:
+            entropy /= math.log(math.factorial(order), base)
+        return float(max(entropy, 0.0))
+
+
+def sliding_pe(
+    signal: Sequence[float],
+    window: int,
+    step: int,
+    order: int = 3,
+    delay: int = 1,
+    *,
+    base: float = math.e,
+    normalize: bool = True,
+    memory_budget: int | None = None,
+) -> np.ndarray:
+    """Compute permutation entropy for every sliding window of a 1D sequence.
+
+    Windows start at ``0, step, 2 * step, ...`` and span ``window`` samples, as in
+    :func:`pevolc.features.extract_entropy_features`. Values agree with calling
+    :func:`pevolc.entropy.pe.compute_pe` on each window up to floating-point
+    rounding. ``memory_budget`` (bytes) bounds the intermediates of pattern
+    extraction, see :func:`pevolc.entropy.utils.ordinal_pattern_indices`.
+
+    Returns
+    -------
+    np.ndarray
+        One entropy value per complete window.
+    """
+
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step must be positive")
+    x = _as_samples(signal)
+    starts = range(0, len(x) - window + 1, step)
+    entropies = np.empty(len(starts), dtype=float)
+    if len(starts) == 0:
+        return entropies
+    n_per_window = window - (order - 1) * delay
+    if n_per_window <= 0:
+        raise ValueError("Signal too short for requested order and delay")
+
+    pattern_ids = ordinal_pattern_indices(x, order, delay, memory_budget=memory_budget)
+    return _slide_entropy(pattern_ids, starts, n_per_window, order, base, normalize)
+
+
+def _slide_entropy(
+    pattern_ids: np.ndarray,
+    starts: Sequence[int],
+    length: int,
+    order: int,
+    base: float,
+    normalize: bool,
+    weights: np.ndarray | None = None,
+) -> np.ndarray:
+    """Entropy of ``pattern_ids[start:start + length]`` for increasing ``starts``.
+
+    With ``weights`` (aligned with ``pattern_ids``) the weighted entropy is
+    returned. The histogram is rebuilt exactly each time the window has fully
+    turned over, or earlier once large weights have left it, which keeps rounding
+    error bounded at linear total cost.
+    """
+
+    entropies = np.empty(len(starts), dtype=float)
+    hist = SlidingPatternHistogram(math.factorial(order), weighted=weights is not None)
+    prev_start = prev_end = last_refresh = 0
+    for i, start in enumerate(starts):
+        end = start + length
+        entering = slice(max(start, prev_end), end)
+        leaving = slice(prev_start, min(start, prev_end))
+        if weights is None:
+            hist.update(pattern_ids[entering], pattern_ids[leaving])
+        else:
+            hist.update(
+                pattern_ids[entering], pattern_ids[leaving], weights[entering], weights[leaving]
+            )
+        if start >= last_refresh + length or hist.needs_refresh:
+            hist.refresh(pattern_ids[start:end], None if weights is None else weights[start:end])
+            last_refresh = start
+        entropies[i] = hist.entropy(order, base=base, normalize=normalize)
+        prev_start, prev_end = start, end
+    return entropies
+
+
+def sliding_wpe(
+    signal: Sequence[float],
+    window: int,
+    step: int,
+    order: int = 3,
+    delay: int = 1,
+    *,
+    base: float = math.e,
+    normalize: bool = True,
+    weight_strategy: str = "variance",
+    memory_budget: int | None = None,
+) -> np.ndarray:
+    """Compute weighted permutation entropy for every sliding window.
+
+    Pattern ids and :func:`~pevolc.entropy.wpe.rolling_weights` are computed once
+    for the whole trace and a weighted histogram slides along them, so WPE costs
+    about the same as :func:`sliding_pe`. Values agree with calling
+    :func:`pevolc.entropy.wpe.compute_wpe` on each window up to floating-point
+    rounding. ``memory_budget`` is as in :func:`sliding_pe`.
+    """
+
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step must be positive")
+    x = _as_samples(signal)
+    starts = range(0, len(x) - window + 1, step)
+    if len(starts) == 0:
+        return np.empty(0, dtype=float)
+    n_per_window = window - (order - 1) * delay
+    if n_per_window <= 0:
+        raise ValueError("Signal too short for requested order and delay")
+
+    pattern_ids = ordinal_pattern_indices(x, order, delay, memory_budget=memory_budget)
+    weights = rolling_weights(x, order, delay, weight_strategy, memory_budget=memory_budget)
+    return _slide_entropy(
+        pattern_ids, starts, n_per_window, order, base, normalize, weights=weights
+    )
+
+
+def sliding_mpe(
+    signal: Sequence[float],
+    window: int,
+    step: int,
+    scales: int | Sequence[int] = 5,
+    order: int = 3,
+    delay: int = 1,
+    *,
+    base: float = math.e,
+    normalize: bool = True,
+    alignment: str = "exact",
+    memory_budget: int | None = None,
+) -> np.ndarray:
+    """Compute multiscale permutation entropy for every sliding window.
+
+    The trace is coarse-grained once into a :class:`MultiscalePyramid`; each
+    window then indexes its blocks and pattern ids instead of re-averaging its
+    own segment, and a sliding histogram runs over each pyramid level.
+
+    ``alignment`` controls windows whose start is not a multiple of the scale:
+
+    ``"exact"``
+        Use blocks that start at the window start (a pyramid level per phase), so
+        values agree with :func:`pevolc.entropy.mpe.compute_mpe` on every window
+        up to floating-point rounding.
+    ``"floor"``
+        Snap the window start down to the previous block boundary so every window
+        reuses the phase-0 level; misaligned windows are shifted up to
+        ``scale - 1`` samples earlier.
+
+    Block means are bit-identical to :func:`~pevolc.entropy.utils.coarse_grain`,
+    so tied means in quantized traces resolve to the same patterns.
+    ``memory_budget`` is as in :func:`sliding_pe` and applies per pyramid level.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape ``(n_windows, n_scales)``.
+    """
+
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step must be positive")
+    if alignment not in ("exact", "floor"):
+        raise ValueError(f"Unknown alignment '{alignment}'")
+    if isinstance(scales, int):
+        scale_list = list(range(1, scales + 1))
+    else:
+        scale_list = list(scales)
+    x = _as_samples(signal)
+    starts = np.arange(0, len(x) - window + 1, step)
+    entropies = np.empty((len(starts), len(scale_list)), dtype=float)
+    if len(starts) == 0:
+        return entropies
+
+    pyramid = MultiscalePyramid(x)
+    for j, scale in enumerate(scale_list):
+        if window // scale == 0:
+            raise ValueError("signal too short for requested scale")
+        n_per_window = window // scale - (order - 1) * delay
+        if n_per_window <= 0:
+            raise ValueError("Signal too short for requested order and delay")
+        phases = starts % scale if alignment == "exact" else np.zeros_like(starts)
+        for phase in np.unique(phases):
+            members = np.flatnonzero(phases == phase)
+            level = pyramid.level(scale, int(phase))
+            pattern_ids = ordinal_pattern_indices(
+                level, order, delay, memory_budget=memory_budget
+            )
+            block_starts = (starts[members] - phase) // scale
+            entropies[members, j] = _slide_entropy(
+                pattern_ids, block_starts, n_per_window, order, base, normalize
+            )
+    return entropies
@@ -0,0 +1,145 @@
+"""Multi-order / multi-delay entropy sweeps over sliding windows.
+
+Parameter grids usually evaluate PE/WPE/MPE for several embedding orders and
+delays on the same trace. :func:`entropy_sweep` does this in one pass:
+
+* for each delay, the pairwise comparisons needed by the largest order are
+  computed once and every smaller order reuses them (see
+  :func:`pevolc.entropy.utils._encode_orders`), optionally in memory-bounded
+  blocks;
+* coarse-grained series for MPE come from a single
+  :class:`~pevolc.entropy.mpe.MultiscalePyramid` shared by all delays and
+  orders;
+* per-window values are obtained by sliding histograms along the pattern ids,
+  as in :mod:`pevolc.entropy.sliding`.
+
+Columns are named with :func:`sweep_column`, e.g. ``pe_m4_tau2`` or
+``mpe_scale_3_m4_tau2``.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+from .mpe import MultiscalePyramid
+from .sliding import _slide_entropy
+from .utils import _as_samples, _encode_orders_chunked
+from .wpe import rolling_weights
+
+
+def sweep_column(feature: str, order: int, delay: int) -> str:
+    """Name of a sweep column, e.g. ``sweep_column("pe", 4, 2) == "pe_m4_tau2"``."""
+
+    return f"{feature}_m{order}_tau{delay}"
+
+
+def entropy_sweep(
+    signal: Sequence[float],
+    window: int,
+    step: int,
+    orders: Sequence[int],
+    delays: Sequence[int],
+    *,
+    scales: int | Sequence[int] = 0,
+    base: float = math.e,
+    normalize: bool = True,
+    pe: bool = True,
+    wpe: bool = True,
+    weight_strategy: str = "variance",
+    mpe_alignment: str = "exact",
+    memory_budget: int | None = None,
+) -> dict[str, np.ndarray]:
+    """Evaluate PE/WPE/MPE for every (order, delay) pair over sliding windows.
+
+    Parameters
+    ----------
+    signal:
+        Input 1D series.
+    window, step:
+        Window length and hop in samples; windows start at ``0, step, ...``.
+    orders, delays:
+        Embedding orders and delays; every combination is evaluated.
+    scales:
+        MPE scales (``k`` for ``1..k`` or an explicit iterable); ``0`` skips MPE.
+    pe, wpe:
+        Toggle the PE and WPE columns.
+    weight_strategy, mpe_alignment:
+        As in :func:`pevolc.entropy.sliding.sliding_wpe` and
+        :func:`pevolc.entropy.sliding.sliding_mpe`.
+    memory_budget:
+        Optional bound in bytes on pattern-extraction intermediates; the trace and
+        each pyramid level are then encoded in overlapping blocks.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        One array per column, each with one value per window. Values agree with
+        the single-configuration sliding functions up to floating-point rounding.
+    """
+
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step must be positive")
+    if mpe_alignment not in ("exact", "floor"):
+        raise ValueError(f"Unknown alignment '{mpe_alignment}'")
+    order_list = sorted(set(orders))
+    delay_list = sorted(set(delays))
+    scale_list = list(range(1, scales + 1)) if isinstance(scales, int) else list(scales)
+    x = _as_samples(signal)
+    starts = np.arange(0, len(x) - window + 1, step)
+    columns: dict[str, np.ndarray] = {}
+    if len(starts) == 0:
+        return columns
+    max_span = (order_list[-1] - 1) * delay_list[-1]
+    if window - max_span <= 0:
+        raise ValueError("Signal too short for requested order and delay")
+
+    for delay in delay_list:
+        encoded = _encode_orders_chunked(x, order_list, delay, memory_budget)
+        for order in order_list:
+            n_per_window = window - (order - 1) * delay
+            if pe:
+                columns[sweep_column("pe", order, delay)] = _slide_entropy(
+                    encoded[order], starts, n_per_window, order, base, normalize
+                )
+            if wpe:
+                weights = rolling_weights(
+                    x, order, delay, weight_strategy, memory_budget=memory_budget
+                )
+                columns[sweep_column("wpe", order, delay)] = _slide_entropy(
+                    encoded[order], starts, n_per_window, order, base, normalize, weights=weights
+                )
+
+    if scale_list:
+        pyramid = MultiscalePyramid(x)
+        mpe_values = {
+            (order, delay): np.empty((len(starts), len(scale_list)))
+            for order in order_list
+            for delay in delay_list
+        }
+        for j, scale in enumerate(scale_list):
+            n_blocks = window // scale
+            if n_blocks - max_span <= 0:
+                raise ValueError("Signal too short for requested order and delay")
+            phases = starts % scale if mpe_alignment == "exact" else np.zeros_like(starts)
+            for phase in np.unique(phases):
+                members = np.flatnonzero(phases == phase)
+                level = pyramid.level(scale, int(phase))
+                block_starts = (starts[members] - phase) // scale
+                for delay in delay_list:
+                    encoded = _encode_orders_chunked(level, order_list, delay, memory_budget)
+                    for order in order_list:
+                        mpe_values[order, delay][members, j] = _slide_entropy(
+                            encoded[order],
+                            block_starts,
+                            n_blocks - (order - 1) * delay,
+                            order,
+                            base,
+                            normalize,
+                        )
+        for (order, delay), values in mpe_values.items():
+            for j in range(len(scale_list)):
+                columns[sweep_column(f"mpe_scale_{j + 1}", order, delay)] = values[:, j]
+    return columns
@@ -7,83 +7,221 @@ lightweight validation used across PE/MPE/WPE implementations.
 from __future__ import annotations
 
 import math
-import itertools
-from functools import lru_cache
-from typing import Iterable, Sequence, Tuple
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Sequence, Tuple
 
 import numpy as np
 
 
+def _as_samples(signal: Sequence[float]) -> np.ndarray:
+    """Array view of ``signal`` that keeps integer and floating dtypes.
+
+    Ordinal patterns only compare samples, so int32 counts or float32 data are
+    encoded without a float64 copy; other inputs (lists of Python objects,
+    booleans) are converted to float64.
+    """
+
+    x = np.asarray(signal)
+    if x.dtype.kind in "iuf":
+        return x
+    return x.astype(float)
+
+
 def coarse_grain(signal: Sequence[float], scale: int) -> np.ndarray:
     """Coarse-grain a time series by averaging non-overlapping windows.
 
     Parameters
     ----------
     signal:
-        Input 1D series.
+        Input series. Multi-dimensional arrays are coarse-grained along the last
+        axis, one row per series.
     scale:
         Coarse-graining factor. A scale of ``k`` averages blocks of length ``k``.
 
     Returns
     -------
     np.ndarray
-        Coarse-grained series of length ``floor(len(signal) / scale)``.
+        Coarse-grained series of length ``floor(len(signal) / scale)``. Block means
+        of integer input are float64; float32 input stays float32.
     """
 
     if scale < 1:
         raise ValueError("scale must be >= 1")
-    x = np.asarray(signal, dtype=float)
-    usable = (len(x) // scale) * scale
+    x = _as_samples(signal)
+    usable = (x.shape[-1] // scale) * scale
     if usable == 0:
         raise ValueError("signal too short for requested scale")
-    trimmed = x[:usable]
-    reshaped = trimmed.reshape(-1, scale)
-    return reshaped.mean(axis=1)
+    trimmed = x[..., :usable]
+    reshaped = trimmed.reshape(x.shape[:-1] + (-1, scale))
+    return reshaped.mean(axis=-1)
 
 
 def _embed(signal: np.ndarray, order: int, delay: int) -> np.ndarray:
-    """Return delayed embedding matrix of shape (n_windows, order)."""
+    """Return delayed embedding matrix of shape (n_windows, order).
 
-    n = signal.shape[0]
+    Multi-dimensional inputs are embedded along the last axis, giving shape
+    ``(..., n_windows, order)``.
+    """
+
+    n = signal.shape[-1]
     window = (order - 1) * delay
     n_windows = n - window
     if n_windows <= 0:
         raise ValueError("Signal too short for requested order and delay")
-    strides = signal.strides[0]
+    strides = signal.strides[-1]
     # Use as_strided to avoid copies; inputs are small in tests and typical use.
     return np.lib.stride_tricks.as_strided(
         signal,
-        shape=(n_windows, order),
-        strides=(strides, delay * strides),
+        shape=signal.shape[:-1] + (n_windows, order),
+        strides=signal.strides[:-1] + (strides, delay * strides),
         writeable=False,
     )
 
 
-@lru_cache(maxsize=16)
-def _pattern_lookup(order: int) -> dict[tuple[int, ...], int]:
-    """Cached mapping from permutation tuple to dense index."""
-    permutations = list(itertools.permutations(range(order)))
-    return {perm: idx for idx, perm in enumerate(permutations)}
+def _pattern_dtype(order: int) -> np.dtype:
+    """Smallest signed integer dtype able to hold pattern ids ``0..order!-1``."""
+
+    max_id = math.factorial(order) - 1
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        if max_id <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"order={order} is too large for int64 pattern ids")
+
+
+def _encode_orders(x: np.ndarray, orders: Sequence[int], delay: int) -> dict[int, np.ndarray]:
+    """Encode the ordinal patterns of ``x`` (last axis) for several orders at once.
+
+    The index of the stable argsort permutation is its Lehmer code, which can be
+    written per element ``a`` as ``d_a * (m - 1 - r_a)!`` where ``r_a`` is the
+    stable rank of ``a`` and ``d_a`` the number of earlier elements strictly
+    greater than it. Both follow from pairwise comparisons, so no argsort and no
+    per-permutation table is needed.
+
+    Comparing elements ``a < b`` of the embedded vector at time ``t`` is
+    ``x[t + a*delay] > x[t + b*delay]``, a shifted slice of the lag-``(b - a)``
+    comparison over the whole trace. Only ``max(orders) - 1`` comparison arrays
+    are therefore computed, and the ranks for order ``m + 1`` extend those for
+    order ``m`` by comparing the new element only, so every requested order
+    shares the work of the largest one.
+    """
+
+    wanted = sorted(set(orders))
+    if not wanted or wanted[0] < 1:
+        raise ValueError("orders must be positive")
+    max_order = wanted[-1]
+    n = x.shape[-1]
+    if n - (max_order - 1) * delay <= 0:
+        raise ValueError("Signal too short for requested order and delay")
+    comparisons = {
+        lag: x[..., : n - lag * delay] > x[..., lag * delay :] for lag in range(1, max_order)
+    }
+    ranks: list[np.ndarray] = []
+    greater_before: list[np.ndarray] = []
+    encoded: dict[int, np.ndarray] = {}
+    for b in range(max_order):
+        n_windows = n - b * delay
+        ranks.append(np.zeros(x.shape[:-1] + (n_windows,), dtype=np.int8))
+        greater_before.append(np.zeros(x.shape[:-1] + (n_windows,), dtype=np.int8))
+        for a in range(b):
+            # Ties keep time order (stable sort): the earlier sample ranks lower.
+            gt = comparisons[b - a][..., a * delay : a * delay + n_windows]
+            ranks[a][..., :n_windows] += gt
+            ranks[b] += ~gt
+            greater_before[b] += gt
+        order = b + 1
+        if order not in wanted:
+            continue
+        dtype = _pattern_dtype(order)
+        weights = np.array([math.factorial(order - 1 - r) for r in range(order)], dtype=dtype)
+        pattern_ids = np.zeros(x.shape[:-1] + (n_windows,), dtype=dtype)
+        for a in range(1, order):
+            pattern_ids += greater_before[a][..., :n_windows] * weights[ranks[a][..., :n_windows]]
+        encoded[order] = pattern_ids
+    return encoded
+
+
+def _windows_per_chunk(max_order: int, memory_budget: int) -> int:
+    """Embedded windows per block so that encoding stays within ``memory_budget`` bytes.
+
+    Per window, a block holds one float sample, ``max_order - 1`` boolean
+    comparisons, two int8 rank accumulators per element and the pattern id.
+    """
+
+    bytes_per_window = 8 + (max_order - 1) + 2 * max_order + 8
+    return max(1, int(memory_budget) // bytes_per_window)
+
+
+def _iter_blocks(
+    x: np.ndarray, orders: Sequence[int], delay: int, memory_budget: int
+) -> Iterator[tuple[int, int, np.ndarray]]:
+    """Yield ``(start, stop, block)`` covering windows ``start..stop`` of the largest order.
+
+    Consecutive blocks overlap by ``(max(orders) - 1) * delay`` samples, so every
+    embedded vector lies entirely within one block. The last block runs to the end
+    of the trace, which also covers the extra trailing windows of smaller orders.
+    """
+
+    span = (max(orders) - 1) * delay
+    n = x.shape[-1]
+    n_windows = n - span
+    if n_windows <= 0:
+        raise ValueError("Signal too short for requested order and delay")
+    chunk = _windows_per_chunk(max(orders), memory_budget)
+    for start in range(0, n_windows, chunk):
+        stop = min(start + chunk, n_windows)
+        end = n if stop == n_windows else stop + span
+        yield start, stop, x[..., start:end]
+
+
+def _encode_orders_chunked(
+    x: np.ndarray, orders: Sequence[int], delay: int, memory_budget: int | None
+) -> dict[int, np.ndarray]:
+    """:func:`_encode_orders` processed in memory-bounded, overlapping blocks."""
 
+    if memory_budget is None:
+        return _encode_orders(_as_samples(x), orders, delay)
+    pieces: dict[int, list[np.ndarray]] = {order: [] for order in set(orders)}
+    n_windows = x.shape[-1] - (max(orders) - 1) * delay
+    for start, stop, block in _iter_blocks(x, orders, delay, memory_budget):
+        encoded = _encode_orders(_as_samples(block), orders, delay)
+        for order, ids in encoded.items():
+            pieces[order].append(ids if stop == n_windows else ids[..., : stop - start])
+    return {order: np.concatenate(parts, axis=-1) for order, parts in pieces.items()}
 
-def ordinal_pattern_indices(signal: Sequence[float], order: int, delay: int) -> np.ndarray:
+
+def ordinal_pattern_indices(
+    signal: Sequence[float], order: int, delay: int, *, memory_budget: int | None = None
+) -> np.ndarray:
     """Return ordinal pattern indices for each embedded window.
 
     The ordinal pattern is the permutation that sorts the values in the window.
-    Ties are broken by stable argsort, matching common PE practice.
+    Ties are broken by stable argsort, matching common PE practice. Indices follow
+    the lexicographic order of ``itertools.permutations(range(order))`` and use
+    the smallest integer dtype that holds ``order!`` patterns. Multi-dimensional
+    inputs are encoded along the last axis. Integer and float32 samples are
+    compared in their own dtype, without a float64 copy.
+
+    With ``memory_budget`` (bytes) the trace is encoded in overlapping blocks so
+    that intermediate arrays stay within the budget; ids are identical.
     """
 
-    x = np.asarray(signal, dtype=float)
-    emb = _embed(x, order, delay)
-    argsorted = np.argsort(emb, axis=1, kind="mergesort")
+    x = np.asarray(signal)
+    return _encode_orders_chunked(x, (order,), delay, memory_budget)[order]
 
-    lookup = _pattern_lookup(order)
-    pattern_ids = np.fromiter(
-        (lookup[tuple(row)] for row in argsorted),
-        count=argsorted.shape[0],
-        dtype=int,
-    )
-    return pattern_ids
+
+def iter_pattern_chunks(
+    signal: Sequence[float], order: int, delay: int, memory_budget: int
+) -> Iterator[np.ndarray]:
+    """Stream the pattern ids of :func:`ordinal_pattern_indices` in consecutive blocks.
+
+    Input blocks overlap by ``(order - 1) * delay`` samples and each block's
+    intermediates stay within ``memory_budget`` bytes; concatenating the yielded
+    arrays gives the one-shot result.
+    """
+
+    x = np.asarray(signal)
+    for start, stop, block in _iter_blocks(x, (order,), delay, memory_budget):
+        yield _encode_orders(_as_samples(block), (order,), delay)[order]
 
 
 def pattern_distribution(
@@ -102,18 +240,141 @@ def pattern_distribution(
         Raw (weighted) counts per pattern.
     """
 
-    pattern_ids = ordinal_pattern_indices(signal, order, delay)
+    return pattern_histogram(signal, order, delay, weights=weights, sparse=False).to_dense()
+
+
+# Histograms switch to the sparse representation when order! exceeds the number
+# of embedded windows by this factor.
+_SPARSE_RATIO = 8
+
+
+@dataclass(frozen=True)
+class PatternHistogram:
+    """Ordinal pattern histogram stored as observed ids and their (weighted) counts.
+
+    Only patterns that occur are stored, so memory scales with the number of
+    embedded windows rather than with ``order!``; forbidden patterns are counted
+    without materialising the dense vector.
+    """
+
+    order: int
+    ids: np.ndarray
+    counts: np.ndarray
+    total: float
+
+    @property
+    def n_patterns(self) -> int:
+        return math.factorial(self.order)
+
+    @property
+    def n_forbidden(self) -> int:
+        """Number of the ``order!`` patterns that never occur."""
+
+        return self.n_patterns - len(self.ids)
+
+    def probabilities(self) -> np.ndarray:
+        """Probability of each observed pattern, aligned with :attr:`ids`."""
+
+        if self.total == 0:
+            return np.zeros_like(self.counts)
+        return self.counts / self.total
+
+    def to_dense(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Dense ``(probs, counts)`` over all ``order!`` patterns."""
+
+        counts = np.zeros(self.n_patterns, dtype=float)
+        counts[self.ids] = self.counts
+        probs = np.zeros_like(counts)
+        probs[self.ids] = self.probabilities()
+        return probs, counts
+
+    def entropy(self, base: float = math.e, normalize: bool = True) -> float:
+        """Shannon entropy, matching :func:`pevolc.entropy.pe.compute_pe` conventions."""
+
+        return entropy_from_probabilities(
+            self.probabilities(), self.order, base=base, normalize=normalize
+        )
+
+
+def pattern_histogram(
+    signal: Sequence[float],
+    order: int,
+    delay: int,
+    weights: Sequence[float] | None = None,
+    sparse: bool | None = None,
+    *,
+    memory_budget: int | None = None,
+) -> PatternHistogram:
+    """Compute the (optionally weighted) ordinal pattern histogram of a sequence.
+
+    ``sparse=None`` picks the sparse representation automatically when ``order!``
+    is much larger than the number of embedded windows; both representations give
+    the same entropy. With ``memory_budget`` (bytes) pattern ids are streamed
+    block by block (see :func:`iter_pattern_chunks`) and only the histograms are
+    accumulated; counts are identical and weighted sums agree up to rounding.
+    """
+
+    if memory_budget is None:
+        pattern_ids = ordinal_pattern_indices(signal, order, delay)
+        return histogram_from_indices(pattern_ids, order, weights=weights, sparse=sparse)
+    w = None if weights is None else np.asarray(weights, dtype=float)
+    parts = []
+    start = 0
+    for pattern_ids in iter_pattern_chunks(signal, order, delay, memory_budget):
+        stop = start + len(pattern_ids)
+        chunk_weights = None if w is None else w[start:stop]
+        parts.append(histogram_from_indices(pattern_ids, order, weights=chunk_weights, sparse=True))
+        start = stop
+    if w is not None and w.shape[0] != start:
+        raise ValueError("weights length must match number of windows")
+    return merge_histograms(parts)
+
+
+def merge_histograms(parts: Sequence[PatternHistogram]) -> PatternHistogram:
+    """Combine histograms of consecutive blocks of the same trace."""
+
+    if not parts:
+        raise ValueError("no histograms to merge")
+    ids, inverse = np.unique(np.concatenate([p.ids for p in parts]), return_inverse=True)
+    counts = np.bincount(
+        inverse, weights=np.concatenate([p.counts for p in parts]), minlength=len(ids)
+    )
+    return PatternHistogram(parts[0].order, ids, counts, float(counts.sum()))
+
+
+def histogram_from_indices(
+    pattern_ids: np.ndarray,
+    order: int,
+    weights: Sequence[float] | None = None,
+    sparse: bool | None = None,
+) -> PatternHistogram:
+    """Same as :func:`pattern_histogram` for precomputed pattern ids."""
+
     n_patterns = math.factorial(order)
+    w = None
     if weights is not None:
         w = np.asarray(weights, dtype=float)
         if w.shape[0] != pattern_ids.shape[0]:
             raise ValueError("weights length must match number of windows")
-        counts = np.bincount(pattern_ids, weights=w, minlength=n_patterns)
-    else:
-        counts = np.bincount(pattern_ids, minlength=n_patterns).astype(float)
-    total = counts.sum()
-    if total == 0:
-        probs = np.zeros_like(counts)
-    else:
-        probs = counts / total
-    return probs, counts
+    if sparse is None:
+        sparse = n_patterns > _SPARSE_RATIO * len(pattern_ids)
+    if sparse:
+        ids, inverse = np.unique(pattern_ids, return_inverse=True)
+        counts = np.bincount(inverse, weights=w, minlength=len(ids)).astype(float)
+        return PatternHistogram(order, ids, counts, float(counts.sum()))
+    dense = np.bincount(pattern_ids, weights=w, minlength=n_patterns).astype(float)
+    occurrences = dense if w is None else np.bincount(pattern_ids, minlength=n_patterns)
+    ids = np.flatnonzero(occurrences)
+    return PatternHistogram(order, ids, dense[ids], float(dense.sum()))
+
+
+def entropy_from_probabilities(
+    probs: np.ndarray, order: int, base: float = math.e, normalize: bool = True
+) -> float:
+    """Shannon entropy of a pattern distribution, optionally normalised by ``log(order!)``."""
+
+    nonzero = probs[probs > 0]
+    entropy = -np.sum(nonzero * np.log(nonzero) / math.log(base))
+    if normalize:
+        entropy /= math.log(math.factorial(order), base)
+    return float(entropy)
@@ -7,7 +7,7 @@ from typing import Sequence
 
 import numpy as np
 
-from .utils import _embed, pattern_distribution
+from .utils import _as_samples, _iter_blocks, pattern_histogram
 
 
 def compute_wpe(
@@ -19,6 +19,7 @@ def compute_wpe(
     normalize: bool = True,
     weights: Sequence[float] | None = None,
     weight_strategy: str = "variance",
+    memory_budget: int | None = None,
 ) -> float:
     """Compute weighted permutation entropy for a 1D sequence.
 
@@ -32,25 +33,104 @@ def compute_wpe(
         Optional external weights per embedded window (length ``n_windows``).
     weight_strategy:
         If ``weights`` is None, compute weights internally. Supported:
-        ``"variance"`` (variance of each embedded window) or ``"energy"`` (sum
-        of squared amplitude).
+        ``"variance"`` (variance of each embedded window), ``"energy"`` (sum
+        of squared amplitude), ``"range"`` (max minus min) or ``"mad"`` (mean
+        absolute deviation); see :func:`rolling_weights`.
+    memory_budget:
+        As in :func:`pevolc.entropy.pe.compute_pe`; weighted sums then agree with
+        the one-shot path up to rounding.
     """
 
-    x = np.asarray(signal, dtype=float)
+    x = _as_samples(signal)
     if weights is None:
-        emb = _embed(x, order, delay)
-        if weight_strategy == "variance":
-            weights_arr = emb.var(axis=1)
-        elif weight_strategy == "energy":
-            weights_arr = np.sum(emb**2, axis=1)
-        else:
-            raise ValueError(f"Unknown weight_strategy '{weight_strategy}'")
-        weights_arr = np.where(weights_arr == 0, 1e-12, weights_arr)
+        weights_arr = rolling_weights(
+            x, order, delay, weight_strategy, memory_budget=memory_budget
+        )
     else:
         weights_arr = np.asarray(weights, dtype=float)
-    probs, _ = pattern_distribution(x, order, delay, weights=weights_arr)
-    nonzero = probs[probs > 0]
-    entropy = -np.sum(nonzero * np.log(nonzero) / math.log(base))
-    if normalize:
-        entropy /= math.log(math.factorial(order), base)
-    return float(entropy)
+    histogram = pattern_histogram(
+        x, order, delay, weights=weights_arr, memory_budget=memory_budget
+    )
+    return histogram.entropy(base=base, normalize=normalize)
+
+
+WEIGHT_STRATEGIES = ("variance", "energy", "range", "mad")
+
+
+def rolling_weights(
+    signal: Sequence[float],
+    order: int,
+    delay: int,
+    weight_strategy: str = "variance",
+    *,
+    memory_budget: int | None = None,
+) -> np.ndarray:
+    """Per-window WPE weights computed from running sums along the delayed lags.
+
+    Each embedded vector ``(x_t, x_{t+delay}, ..., x_{t+(order-1)delay})`` is
+    summarised without materialising the ``(n_windows, order)`` embedding: the
+    lags are visited one shifted slice at a time and accumulated into
+    ``n_windows``-long arrays. Supported strategies:
+
+    ``"variance"``
+        Population variance of the vector, accumulated as squared deviations from
+        the per-window mean (two passes), which stays accurate for large-amplitude
+        raw counts with a DC offset.
+    ``"energy"``
+        Sum of squared amplitudes.
+    ``"range"``
+        Absolute range ``max - min`` of the vector.
+    ``"mad"``
+        Mean absolute deviation from the per-window mean.
+
+    Multi-dimensional inputs are processed along the last axis. Zero weights are
+    replaced by a tiny positive value so that flat windows still contribute their
+    pattern. With ``memory_budget`` (bytes) the trace is processed in blocks
+    overlapping by ``(order - 1) * delay`` samples, giving identical weights.
+    """
+
+    if weight_strategy not in WEIGHT_STRATEGIES:
+        raise ValueError(f"Unknown weight_strategy '{weight_strategy}'")
+    x = _as_samples(signal)
+    if memory_budget is not None:
+        n_windows = x.shape[-1] - (order - 1) * delay
+        parts = [
+            rolling_weights(block, order, delay, weight_strategy)[..., : stop - start]
+            if stop < n_windows
+            else rolling_weights(block, order, delay, weight_strategy)
+            for start, stop, block in _iter_blocks(x, (order,), delay, memory_budget)
+        ]
+        return np.concatenate(parts, axis=-1)
+    n_windows = x.shape[-1] - (order - 1) * delay
+    if n_windows <= 0:
+        raise ValueError("Signal too short for requested order and delay")
+    lags = [x[..., k * delay : k * delay + n_windows] for k in range(order)]
+    out_shape = x.shape[:-1] + (n_windows,)
+
+    if weight_strategy == "energy":
+        weights_arr = np.zeros(out_shape, dtype=float)
+        for lag in lags:
+            weights_arr += np.square(lag, dtype=float)
+    elif weight_strategy == "range":
+        high = lags[0].astype(float)
+        low = high.copy()
+        for lag in lags[1:]:
+            np.maximum(high, lag, out=high)
+            np.minimum(low, lag, out=low)
+        weights_arr = np.subtract(high, low, out=high)
+    else:
+        mean = np.zeros(out_shape, dtype=float)
+        for lag in lags:
+            mean += lag
+        mean /= order
+        weights_arr = np.zeros(out_shape, dtype=float)
+        deviation = np.empty(out_shape, dtype=float)
+        for lag in lags:
+            np.subtract(lag, mean, out=deviation)
+            if weight_strategy == "variance":
+                np.multiply(deviation, deviation, out=deviation)
+            else:
+                np.abs(deviation, out=deviation)
+            weights_arr += deviation
+        weights_arr /= order
+    return np.where(weights_arr == 0, 1e-12, weights_arr)
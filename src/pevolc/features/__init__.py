@@ -1,9 +1,31 @@
 """Feature extraction modules."""
 
-from .seismic_features import WindowConfig, extract_basic_features, extract_entropy_features
+from .plan import FeaturePlan
+from .preprocessing import StreamingPreprocessor, design_filter, preprocess_blocks
+from .rolling import rolling_basic_stats
+from .seismic_features import (
+    WindowConfig,
+    extract_basic_features,
+    extract_entropy_columns,
+    extract_entropy_features,
+    extract_sweep_features,
+    iter_entropy_blocks,
+    select_sweep_columns,
+)
+from .streaming import StreamingEntropyExtractor
 
 __all__ = [
+    "FeaturePlan",
+    "StreamingEntropyExtractor",
+    "StreamingPreprocessor",
     "WindowConfig",
+    "design_filter",
     "extract_basic_features",
+    "extract_entropy_columns",
     "extract_entropy_features",
+    "extract_sweep_features",
+    "iter_entropy_blocks",
+    "preprocess_blocks",
+    "rolling_basic_stats",
+    "select_sweep_columns",
 ]
@@ -0,0 +1,111 @@
+"""Per-window feature plans that share entropy intermediates.
+
+PE, WPE and MPE at scale 1 all start from the same delayed embedding and
+ordinal pattern ids. A :class:`FeaturePlan` works out which intermediates the
+enabled :class:`~pevolc.features.seismic_features.WindowConfig` flags need,
+computes each one once per window, and derives every requested column from
+them. Values are identical to calling ``compute_pe``/``compute_wpe``/
+``compute_mpe`` separately.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+from pevolc.entropy.pe import compute_pe
+from pevolc.entropy.utils import (
+    _as_samples,
+    coarse_grain,
+    histogram_from_indices,
+    ordinal_pattern_indices,
+)
+from pevolc.entropy.wpe import rolling_weights
+
+if TYPE_CHECKING:
+    from .seismic_features import WindowConfig
+
+
+@dataclass(frozen=True)
+class FeaturePlan:
+    """Entropy columns requested for each window and how to compute them."""
+
+    order: int = 3
+    delay: int = 1
+    base: float = math.e
+    normalize: bool = True
+    pe: bool = True
+    wpe: bool = True
+    mpe_scales: tuple[int, ...] = ()
+
+    @classmethod
+    def from_config(cls, cfg: "WindowConfig") -> "FeaturePlan":
+        """Build the plan implied by the ``compute_*`` flags of ``cfg``."""
+
+        return cls(
+            order=cfg.order,
+            delay=cfg.delay,
+            base=cfg.base,
+            normalize=cfg.normalize,
+            pe=cfg.compute_pe,
+            wpe=cfg.compute_wpe,
+            mpe_scales=tuple(range(1, cfg.scales + 1)) if cfg.compute_mpe else (),
+        )
+
+    @property
+    def columns(self) -> list[str]:
+        """Output column names in record order."""
+
+        cols = []
+        if self.pe:
+            cols.append("pe")
+        if self.wpe:
+            cols.append("wpe")
+        cols.extend(f"mpe_scale_{i}" for i in range(1, len(self.mpe_scales) + 1))
+        return cols
+
+    def evaluate(
+        self, segment: Sequence[float], precomputed: Mapping[str, float] | None = None
+    ) -> dict[str, float]:
+        """Compute the planned columns for one window.
+
+        ``precomputed`` supplies columns already evaluated elsewhere (e.g. by a
+        whole-trace engine); they are passed through and reused as intermediates.
+        """
+
+        known = dict(precomputed or {})
+        x = _as_samples(segment)
+        pe_value = known.get("pe")
+        need_pe = self.pe or 1 in self.mpe_scales
+        need_wpe = self.wpe and "wpe" not in known
+        if (need_pe and pe_value is None) or need_wpe:
+            pattern_ids = ordinal_pattern_indices(x, self.order, self.delay)
+            if need_pe and pe_value is None:
+                histogram = histogram_from_indices(pattern_ids, self.order)
+                pe_value = histogram.entropy(base=self.base, normalize=self.normalize)
+            if need_wpe:
+                weights = rolling_weights(x, self.order, self.delay, "variance")
+                histogram = histogram_from_indices(pattern_ids, self.order, weights=weights)
+                known["wpe"] = histogram.entropy(base=self.base, normalize=self.normalize)
+
+        values: dict[str, float] = {}
+        if self.pe:
+            values["pe"] = pe_value
+        if self.wpe:
+            values["wpe"] = known["wpe"]
+        for i, scale in enumerate(self.mpe_scales, start=1):
+            key = f"mpe_scale_{i}"
+            if key in known:
+                values[key] = known[key]
+            elif scale == 1:
+                values[key] = pe_value
+            else:
+                values[key] = compute_pe(
+                    coarse_grain(x, scale),
+                    order=self.order,
+                    delay=self.delay,
+                    base=self.base,
+                    normalize=self.normalize,
+                )
+        return values
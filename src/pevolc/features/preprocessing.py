@@ -0,0 +1,227 @@
+"""Causal, stateful preprocessing for block-wise and streaming use.
+
+The offline pipeline band-passes a whole trace with zero-phase ``filtfilt`` and
+detrends/z-scores it with whole-trace statistics. The classes here produce the
+causal counterparts block by block with constant memory:
+
+* :class:`SOSFilter` runs a Butterworth filter as second-order sections with
+  carried ``sosfilt`` state;
+* :class:`CausalDetrend` removes the least-squares line fitted to all samples up
+  to and including the current one;
+* :class:`RunningZScore` standardises each sample with the running mean and
+  standard deviation of the samples seen so far (Welford/Chan updates).
+
+Every output sample depends only on the samples up to it, so the result does
+not depend on how the stream is cut into blocks (up to floating-point
+rounding). :class:`StreamingPreprocessor` chains the three stages. Filter designs
+are cached per (sampling rate, band, order) by :func:`design_filter`.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+from scipy.signal import butter, sosfilt, sosfilt_zi
+
+from pevolc.io import working_float_dtype
+
+PREPROCESSING_MODES = ("offline", "causal")
+
+
+@lru_cache(maxsize=64)
+def _design(
+    sampling_rate_hz: float, low: float | None, high: float | None, order: int, output: str
+) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+    nyq = 0.5 * sampling_rate_hz
+    if low is None:
+        btype, wn = "lowpass", high / nyq
+    elif high is None:
+        btype, wn = "highpass", low / nyq
+    else:
+        btype, wn = "bandpass", [low / nyq, high / nyq]
+    return butter(order, wn, btype=btype, output=output)
+
+
+def design_filter(
+    sampling_rate_hz: float,
+    low: float | None = None,
+    high: float | None = None,
+    order: int = 4,
+    output: str = "sos",
+) -> np.ndarray | tuple[np.ndarray, np.ndarray] | None:
+    """Butterworth low-, high- or band-pass design, cached per parameter set.
+
+    Returns second-order sections (``output="sos"``) or ``(b, a)`` coefficients
+    (``output="ba"``); ``None`` when neither bound is given. The design is
+    computed once per parameter set and callers receive copies.
+    """
+
+    if output not in ("sos", "ba"):
+        raise ValueError(f"Unknown filter output '{output}'")
+    if low is None and high is None:
+        return None
+    low = None if low is None else float(low)
+    high = None if high is None else float(high)
+    design = _design(float(sampling_rate_hz), low, high, int(order), output)
+    if isinstance(design, tuple):
+        return tuple(array.copy() for array in design)
+    return design.copy()
+
+
+class SOSFilter:
+    """Causal IIR filter in second-order sections with state carried across blocks.
+
+    The state is initialised on the first block as the steady state for a
+    constant input equal to the first sample, which avoids a start-up step.
+    """
+
+    def __init__(self, sos: np.ndarray) -> None:
+        self.sos = sos
+        self.reset()
+
+    def reset(self) -> None:
+        self._zi: np.ndarray | None = None
+
+    def process(self, block: Sequence[float]) -> np.ndarray:
+        x = np.asarray(block)
+        if len(x) == 0:
+            return x.astype(working_float_dtype(x.dtype))
+        if self._zi is None:
+            self._zi = sosfilt_zi(self.sos) * float(x[0])
+        y, self._zi = sosfilt(self.sos, x, zi=self._zi)
+        return y.astype(working_float_dtype(x.dtype), copy=False)
+
+
+class RunningZScore:
+    """Standardise each sample by the mean and std of all samples up to it.
+
+    Running moments are merged block by block with Chan's update and within a
+    block with cumulative sums centred on the carried mean, so memory is
+    constant. Samples whose running std is zero are only centred.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self._m2 / self.count)) if self.count else 0.0
+
+    def process(self, block: Sequence[float]) -> np.ndarray:
+        x = np.asarray(block)
+        dtype = working_float_dtype(x.dtype)
+        if len(x) == 0:
+            return x.astype(dtype)
+        dev = x.astype(np.float64) - self.mean
+        counts = self.count + np.arange(1, len(x) + 1)
+        s1 = np.cumsum(dev)
+        m2 = np.maximum(self._m2 + np.cumsum(dev * dev) - s1 * s1 / counts, 0.0)
+        means = self.mean + s1 / counts
+        stds = np.sqrt(m2 / counts)
+        out = (x - means) / np.where(stds > 0, stds, 1.0)
+        self.count, self.mean, self._m2 = int(counts[-1]), float(means[-1]), float(m2[-1])
+        return out.astype(dtype, copy=False)
+
+
+class CausalDetrend:
+    """Subtract the least-squares line through all samples up to the current one.
+
+    The running regression keeps the sample count, the means of time and value
+    and their co-moments; the first sample (no slope yet) maps to zero.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self._mean_t = 0.0
+        self._mean_x = 0.0
+        self._ctt = 0.0
+        self._ctx = 0.0
+
+    def process(self, block: Sequence[float]) -> np.ndarray:
+        x = np.asarray(block)
+        dtype = working_float_dtype(x.dtype)
+        if len(x) == 0:
+            return x.astype(dtype)
+        t = np.arange(self.count, self.count + len(x), dtype=np.float64)
+        dt = t - self._mean_t
+        dx = x.astype(np.float64) - self._mean_x
+        counts = self.count + np.arange(1, len(x) + 1)
+        s_t, s_x = np.cumsum(dt), np.cumsum(dx)
+        ctt = self._ctt + np.cumsum(dt * dt) - s_t * s_t / counts
+        ctx = self._ctx + np.cumsum(dt * dx) - s_t * s_x / counts
+        mean_t = self._mean_t + s_t / counts
+        mean_x = self._mean_x + s_x / counts
+        slope = np.divide(ctx, ctt, out=np.zeros_like(ctx), where=ctt > 0)
+        out = x - (mean_x + slope * (t - mean_t))
+        self.count = int(counts[-1])
+        self._mean_t, self._mean_x = float(mean_t[-1]), float(mean_x[-1])
+        self._ctt, self._ctx = float(ctt[-1]), float(ctx[-1])
+        return out.astype(dtype, copy=False)
+
+
+class StreamingPreprocessor:
+    """Band-pass, detrend and z-score a stream block by block, causally.
+
+    Stages run in the order of the offline pipeline (band-pass in
+    :mod:`pevolc.pipelines.compute_entropy`, then ``detrend`` and ``zscore`` as in
+    :class:`~pevolc.features.WindowConfig`); disabled stages are skipped.
+    """
+
+    def __init__(
+        self,
+        sampling_rate_hz: float,
+        low: float | None = None,
+        high: float | None = None,
+        order: int = 4,
+        detrend: bool = False,
+        zscore: bool = False,
+    ) -> None:
+        sos = design_filter(sampling_rate_hz, low, high, order)
+        self.stages: list[SOSFilter | CausalDetrend | RunningZScore] = []
+        if sos is not None:
+            self.stages.append(SOSFilter(sos))
+        if detrend:
+            self.stages.append(CausalDetrend())
+        if zscore:
+            self.stages.append(RunningZScore())
+
+    def reset(self) -> None:
+        for stage in self.stages:
+            stage.reset()
+
+    def process(self, block: Sequence[float]) -> np.ndarray:
+        x = np.asarray(block)
+        for stage in self.stages:
+            x = stage.process(x)
+        return x
+
+
+def preprocess_blocks(
+    signal: Sequence[float], preprocessor: StreamingPreprocessor, block_size: int
+) -> np.ndarray:
+    """Run ``preprocessor`` over ``signal`` in blocks of ``block_size`` samples.
+
+    Intermediates are bounded by the block size; only the output array has the
+    length of the trace.
+    """
+
+    if block_size <= 0:
+        raise ValueError("block_size must be positive")
+    x = np.asarray(signal)
+    out: np.ndarray | None = None
+    for start in range(0, len(x), block_size):
+        block = preprocessor.process(x[start : start + block_size])
+        if out is None:
+            out = np.empty(len(x), dtype=block.dtype)
+        out[start : start + len(block)] = block
+    return preprocessor.process(x) if out is None else out
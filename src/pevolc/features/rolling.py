@@ -0,0 +1,141 @@
+"""Descriptive statistics for every sliding window of a trace at once.
+
+Moments come from cumulative sums of the (median-centred) trace and its
+powers, restarted every ``window`` samples: a window's sum is the suffix sum of
+the block it starts in plus the prefix sum of the next block, so it only ever
+adds up its own samples and a high-amplitude burst elsewhere in the trace
+cannot cancel away the precision of later windows. Each window costs O(1)
+after one linear pass; maxima and minima use
+the van Herk/Gil-Werman sliding extremum, which needs three passes over the
+trace whatever the window length. The cost is therefore linear in the trace
+length and independent of how much consecutive windows overlap.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Sequence
+
+import numpy as np
+
+ROLLING_STATISTICS = ("mean", "std", "rms", "max", "min", "ptp", "kurtosis")
+BASIC_STATISTICS = ("mean", "std", "rms", "max", "min")
+
+
+def sliding_extremum(signal: Sequence[float], window: int, op: Callable = np.maximum) -> np.ndarray:
+    """Maximum (``op=np.maximum``) or minimum (``np.minimum``) of every window.
+
+    Returns one value per window start ``0 .. len(signal) - window``, computed
+    with block-wise prefix and suffix extrema (van Herk/Gil-Werman): the trace is
+    cut into blocks of ``window`` samples and each window's extremum combines the
+    suffix of the block it starts in with the prefix of the block it ends in.
+    """
+
+    x = np.asarray(signal)
+    n = x.shape[-1]
+    if window <= 0:
+        raise ValueError("window must be positive")
+    if n < window:
+        return np.empty(0, dtype=x.dtype)
+    n_blocks = -(-n // window)
+    if np.issubdtype(x.dtype, np.integer):
+        info = np.iinfo(x.dtype)
+        fill = info.min if op is np.maximum else info.max
+    else:
+        fill = -np.inf if op is np.maximum else np.inf
+    padded = np.full(n_blocks * window, fill, dtype=x.dtype)
+    padded[:n] = x
+    blocks = padded.reshape(n_blocks, window)
+    prefix = op.accumulate(blocks, axis=1).ravel()
+    suffix = op.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    n_windows = n - window + 1
+    return op(suffix[:n_windows], prefix[window - 1 : window - 1 + n_windows])
+
+
+def rolling_basic_stats(
+    signal: Sequence[float],
+    window: int,
+    step: int,
+    stats: Sequence[str] = BASIC_STATISTICS,
+) -> dict[str, np.ndarray]:
+    """Descriptive statistics of every window ``signal[s:s + window]``, ``s = 0, step, ...``.
+
+    Parameters
+    ----------
+    signal:
+        Input 1D series (any integer or floating dtype).
+    window, step:
+        Window length and hop in samples.
+    stats:
+        Names from :data:`ROLLING_STATISTICS`: ``mean``, ``std`` (population),
+        ``rms``, ``max``, ``min``, ``ptp`` (peak-to-peak) and ``kurtosis``
+        (excess, Fisher definition as in ``scipy.stats.kurtosis``).
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        One float array per requested statistic with one value per window. Values
+        match :func:`pevolc.features.extract_basic_features` on each window up to
+        floating-point rounding; maxima and minima are exact, and windows whose
+        samples are all equal get exactly zero ``std``.
+    """
+
+    unknown = [name for name in stats if name not in ROLLING_STATISTICS]
+    if unknown:
+        raise ValueError(f"Unknown statistic '{unknown[0]}'")
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step must be positive")
+    x = np.asarray(signal)
+    starts = np.arange(0, max(len(x) - window + 1, 0), step)
+    if len(starts) == 0:
+        return {name: np.empty(0) for name in stats}
+
+    high = sliding_extremum(x, window, np.maximum)[starts].astype(float)
+    low = sliding_extremum(x, window, np.minimum)[starts].astype(float)
+    values: dict[str, np.ndarray] = {"max": high, "min": low, "ptp": high - low}
+    if {"mean", "std", "rms", "kurtosis"} & set(stats):
+        # Centring keeps the running sums small for raw counts with a DC offset;
+        # the median, unlike the mean, is not dragged away by a transient burst.
+        shift = float(np.median(x))
+        y = x.astype(np.float64) - shift
+        power_sums = _window_sums(y, window, starts, 4 if "kurtosis" in stats else 2)
+        mean_y = power_sums[1] / window
+        variance = np.maximum(power_sums[2] / window - mean_y**2, 0.0)
+        mean_square = np.maximum(power_sums[2] / window + 2 * shift * mean_y + shift**2, 0.0)
+        # Flat windows are exact: no residue of cancellation in the running sums.
+        flat = values["ptp"] == 0
+        variance[flat] = 0.0
+        values["mean"] = np.where(flat, high, mean_y + shift)
+        values["std"] = np.sqrt(variance)
+        values["rms"] = np.where(flat, np.abs(high), np.sqrt(mean_square))
+        if "kurtosis" in stats:
+            m3 = power_sums[3] / window
+            m4 = power_sums[4] / window
+            central4 = m4 - 4 * mean_y * m3 + 6 * mean_y**2 * power_sums[2] / window
+            central4 -= 3 * mean_y**4
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values["kurtosis"] = np.where(variance > 0, central4 / variance**2 - 3.0, np.nan)
+    return {name: values[name] for name in stats}
+
+
+def _window_sums(y: np.ndarray, window: int, starts: np.ndarray, max_power: int) -> list[np.ndarray]:
+    """Per-window sums of ``y**p`` for ``p = 0..max_power`` from block-wise cumulative sums.
+
+    The trace is cut into blocks of ``window`` samples; the window starting at
+    offset ``r`` of block ``k`` is ``block_k[r:]`` plus ``block_{k+1}[:r]``.
+    Both partial sums accumulate only samples of the window, without any
+    subtraction.
+    """
+
+    n_blocks = -(-len(y) // window) + 1
+    padded = np.zeros(n_blocks * window)
+    padded[: len(y)] = y
+    blocks = padded.reshape(n_blocks, window)
+    sums = [np.full(len(starts), float(window))]
+    power = np.ones_like(blocks)
+    for _ in range(max_power):
+        power *= blocks
+        suffix = np.cumsum(power[:, ::-1], axis=1)[:, ::-1].ravel()
+        prefix = np.zeros_like(power)
+        np.cumsum(power[:, :-1], axis=1, out=prefix[:, 1:])
+        sums.append(suffix[starts] + prefix.ravel()[starts + window])
+    return sums
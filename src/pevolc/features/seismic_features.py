@@ -2,21 +2,57 @@
 
 from __future__ import annotations
 
+import math
+import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable, Sequence
+from typing import Iterable, Iterator, Sequence
 
 import numpy as np
 import pandas as pd
 from scipy.signal import detrend
 
-from pevolc.entropy.mpe import compute_mpe
-from pevolc.entropy.pe import compute_pe
-from pevolc.entropy.wpe import compute_wpe
+from pevolc.entropy.batch import (
+    compute_mpe_batch,
+    compute_pe_batch,
+    compute_wpe_batch,
+    window_view,
+)
+from pevolc.entropy.sliding import sliding_mpe, sliding_pe, sliding_wpe
+from pevolc.entropy.sweep import entropy_sweep
+from pevolc.io import apply_dtype_policy, working_float_dtype
+
+from .plan import FeaturePlan
+from .preprocessing import StreamingPreprocessor
+from .rolling import BASIC_STATISTICS, rolling_basic_stats
+
+_ENGINES = ("window", "incremental", "batch")
 
 
 @dataclass
 class WindowConfig:
-    """Configuration for sliding-window feature extraction."""
+    """Configuration for sliding-window feature extraction.
+
+    ``engine`` selects how entropy is evaluated: ``"window"`` recomputes every
+    window from scratch, ``"incremental"`` computes pattern ids once per trace and
+    slides a histogram along them (see :func:`pevolc.entropy.sliding.sliding_pe`),
+    and ``"batch"`` evaluates all windows at once on a zero-copy window view (see
+    :mod:`pevolc.entropy.batch`). The incremental engine takes MPE from a
+    whole-trace multiscale pyramid; ``mpe_alignment`` sets how windows that do not
+    start on a block boundary are handled (see
+    :func:`pevolc.entropy.sliding.sliding_mpe`). ``memory_budget_mb`` bounds the
+    intermediates of whole-trace pattern extraction for the incremental and batch
+    engines and for sweeps; results do not depend on it. ``dtype_policy``
+    (``"float64"``, ``"float32"`` or ``"native"``, see
+    :func:`pevolc.io.apply_dtype_policy`) sets the sample dtype kept through
+    preprocessing and pattern encoding; float32 and native paths match float64
+    entropies to about ``1e-6`` unless rounding changes ordinal ties.
+
+    ``n_jobs > 1`` or ``chunk_seconds`` splits one long trace into chunks aligned
+    to the step grid, each extended by a halo of one window, and evaluates them
+    on a process pool; the stitched table has the same rows and times as the
+    serial path (see :func:`_trace_chunks`).
+    """
 
     window_seconds: float
     step_seconds: float
@@ -30,6 +66,20 @@ class WindowConfig:
     compute_wpe: bool = True
     detrend_signal: bool = False
     zscore: bool = False
+    engine: str = "window"
+    mpe_alignment: str = "exact"
+    memory_budget_mb: float | None = None
+    dtype_policy: str = "float64"
+    n_jobs: int = 1
+    chunk_seconds: float | None = None
+
+    @property
+    def memory_budget(self) -> int | None:
+        """``memory_budget_mb`` in bytes, as taken by the entropy functions."""
+
+        if self.memory_budget_mb is None:
+            return None
+        return int(self.memory_budget_mb * 2**20)
 
 
 def _sliding_windows(x: np.ndarray, window: int, step: int) -> Iterable[tuple[int, int, np.ndarray]]:
@@ -38,28 +88,260 @@ def _sliding_windows(x: np.ndarray, window: int, step: int) -> Iterable[tuple[in
         yield start, end, x[start:end]
 
 
+def _trace_chunks(
+    n_samples: int, window: int, step: int, cfg: WindowConfig, chunk_samples: int
+) -> list[tuple[int, int]]:
+    """Sample ranges ``(start, end)`` of halo-overlapping chunks of one trace.
+
+    Each chunk owns a run of consecutive windows: it starts on the step grid and
+    ends ``window`` samples after its last window start, so the embedding span
+    of every window lies inside the chunk. Preprocessing is applied to the whole
+    trace beforehand, so no filter halo is needed. With ``mpe_alignment="floor"``
+    chunk starts are also multiples of every MPE scale so that block boundaries
+    match the whole-trace pyramid.
+    """
+
+    n_windows = (n_samples - window) // step + 1
+    if n_windows <= 0:
+        return []
+    grid = _window_grid(step, cfg)
+    per_chunk = -(-max(1, chunk_samples // step) // grid) * grid
+    chunks = []
+    for first in range(0, n_windows, per_chunk):
+        last = min(first + per_chunk, n_windows) - 1
+        chunks.append((first * step, last * step + window))
+    return chunks
+
+
+def _window_grid(step: int, cfg: WindowConfig) -> int:
+    """Window count after which window starts are multiples of every MPE scale.
+
+    Only ``mpe_alignment="floor"`` depends on the absolute start of a segment;
+    otherwise any run of windows can be evaluated on its own.
+    """
+
+    if not (cfg.compute_mpe and cfg.mpe_alignment == "floor"):
+        return 1
+    period = math.lcm(*range(1, cfg.scales + 1))
+    return period // math.gcd(period, step)
+
+
+def _n_windows(n_samples: int, window: int, step: int) -> int:
+    return max((n_samples - window) // step + 1, 0)
+
+
+def _chunk_columns(
+    x: np.ndarray, offset: int, sampling_rate_hz: float, window: int, step: int, cfg: WindowConfig
+) -> dict[str, np.ndarray]:
+    """Feature columns of a preprocessed trace segment starting at sample ``offset``.
+
+    Every column is preallocated for the known number of windows; per-window
+    work is limited to the entropy columns the engine did not evaluate for the
+    whole segment and to the basic statistics.
+    """
+
+    n_windows = _n_windows(len(x), window, step)
+    starts = np.arange(n_windows, dtype=np.int64) * step
+    columns: dict[str, np.ndarray] = {
+        "start_s": (offset + starts) / sampling_rate_hz,
+        "end_s": (offset + starts + window) / sampling_rate_hz,
+    }
+    trace_columns = _trace_columns(x, window, step, cfg) if n_windows else {}
+    plan = FeaturePlan.from_config(cfg)
+    missing = [name for name in plan.columns if name not in trace_columns]
+    for name in plan.columns:
+        column = trace_columns.get(name)
+        columns[name] = np.empty(n_windows) if column is None else np.asarray(column, dtype=float)
+    if missing:
+        for i, (_, _, segment) in enumerate(_sliding_windows(x, window, step)):
+            precomputed = {name: float(values[i]) for name, values in trace_columns.items()}
+            values = plan.evaluate(segment, precomputed)
+            for name in missing:
+                columns[name][i] = values[name]
+    columns.update(_basic_columns(x, window, step))
+    return columns
+
+
+def _basic_columns(x: np.ndarray, window: int, step: int) -> dict[str, np.ndarray]:
+    """``basic_*`` columns of :func:`extract_basic_features` for every window at once."""
+
+    stats = rolling_basic_stats(x, window, step, BASIC_STATISTICS)
+    return {f"basic_{name}": values for name, values in stats.items()}
+
+
 def _preprocess(x: np.ndarray, cfg: WindowConfig) -> np.ndarray:
+    if not (cfg.detrend_signal or cfg.zscore):
+        return x
+    dtype = working_float_dtype(x.dtype)
     if cfg.detrend_signal:
-        x = detrend(x)
+        x = detrend(x).astype(dtype, copy=False)
     if cfg.zscore:
-        std = x.std() or 1.0
-        x = (x - x.mean()) / std
+        mean = x.mean(dtype=np.float64)
+        std = x.std(dtype=np.float64) or 1.0
+        x = ((x - mean) / std).astype(dtype, copy=False)
     return x
 
 
+def _trace_columns(
+    x: np.ndarray, window: int, step: int, cfg: WindowConfig
+) -> dict[str, np.ndarray]:
+    """Entropy columns that the configured engine evaluates for all windows at once.
+
+    Columns not returned here are computed per window by :class:`FeaturePlan`.
+    """
+
+    columns: dict[str, np.ndarray] = {}
+    entropy_kwargs = dict(
+        order=cfg.order,
+        delay=cfg.delay,
+        base=cfg.base,
+        normalize=cfg.normalize,
+        memory_budget=cfg.memory_budget,
+    )
+    if cfg.engine == "incremental":
+        if cfg.compute_pe:
+            columns["pe"] = sliding_pe(x, window, step, **entropy_kwargs)
+        if cfg.compute_wpe:
+            columns["wpe"] = sliding_wpe(x, window, step, **entropy_kwargs)
+        if cfg.compute_mpe:
+            mpe_values = sliding_mpe(
+                x, window, step, scales=cfg.scales, alignment=cfg.mpe_alignment, **entropy_kwargs
+            )
+            for j in range(cfg.scales):
+                columns[f"mpe_scale_{j + 1}"] = mpe_values[:, j]
+    elif cfg.engine == "batch":
+        windows = window_view(x, window, step)
+        if cfg.compute_pe or cfg.compute_mpe:
+            columns["pe"] = compute_pe_batch(windows, **entropy_kwargs)
+        if cfg.compute_mpe and cfg.scales >= 1:
+            # MPE scale 1 is PE; filling it here keeps every window out of the plan loop.
+            columns["mpe_scale_1"] = columns["pe"]
+        if cfg.compute_wpe:
+            columns["wpe"] = compute_wpe_batch(windows, **entropy_kwargs)
+        if cfg.compute_mpe and cfg.scales > 1:
+            scales = list(range(2, cfg.scales + 1))
+            mpe_values = compute_mpe_batch(windows, scales=scales, **entropy_kwargs)
+            for j, scale in enumerate(scales):
+                columns[f"mpe_scale_{scale}"] = mpe_values[:, j]
+    return columns
+
+
 def extract_basic_features(signal: Sequence[float]) -> dict[str, float]:
     """Return a small set of descriptive statistics for a time series."""
 
-    x = np.asarray(signal, dtype=float)
+    x = np.asarray(signal)
     return {
-        "mean": float(x.mean()),
-        "std": float(x.std()),
-        "rms": float(np.sqrt(np.mean(x**2))),
+        "mean": float(x.mean(dtype=np.float64)),
+        "std": float(x.std(dtype=np.float64)),
+        "rms": float(np.sqrt(np.mean(np.square(x, dtype=np.float64)))),
         "max": float(x.max()),
         "min": float(x.min()),
     }
 
 
+def extract_entropy_columns(
+    signal: Sequence[float],
+    sampling_rate_hz: float,
+    cfg: WindowConfig,
+) -> dict[str, np.ndarray]:
+    """Column arrays of :func:`extract_entropy_features`, without pandas.
+
+    Returns a dict mapping ``start_s``, ``end_s``, the entropy columns and the
+    ``basic_*`` statistics to float arrays with one value per window, in the
+    column order of the DataFrame.
+    """
+
+    x = apply_dtype_policy(signal, cfg.dtype_policy)
+    x = _preprocess(x, cfg)
+    window_samples = int(cfg.window_seconds * sampling_rate_hz)
+    step_samples = int(cfg.step_seconds * sampling_rate_hz)
+    if window_samples <= 0 or step_samples <= 0:
+        raise ValueError("window_seconds and step_seconds must be positive")
+    if cfg.engine not in _ENGINES:
+        raise ValueError(f"Unknown engine '{cfg.engine}'")
+    if cfg.n_jobs < 1:
+        raise ValueError("n_jobs must be >= 1")
+
+    shared = (sampling_rate_hz, window_samples, step_samples, cfg)
+    if cfg.n_jobs == 1 and cfg.chunk_seconds is None:
+        return _chunk_columns(x, 0, *shared)
+    if cfg.chunk_seconds is not None:
+        chunk_samples = int(cfg.chunk_seconds * sampling_rate_hz)
+    else:
+        chunk_samples = -(-max(len(x) - window_samples, 0) // cfg.n_jobs) + step_samples
+    chunks = _trace_chunks(len(x), window_samples, step_samples, cfg, chunk_samples)
+    if len(chunks) <= 1:
+        return _chunk_columns(x, 0, *shared)
+    segments = [x[start:end] for start, end in chunks]
+    offsets = [start for start, _ in chunks]
+    if cfg.n_jobs == 1:
+        parts = [_chunk_columns(seg, off, *shared) for seg, off in zip(segments, offsets)]
+    else:
+        with ProcessPoolExecutor(max_workers=cfg.n_jobs) as pool:
+            repeated = [[value] * len(chunks) for value in shared]
+            parts = list(pool.map(_chunk_columns, segments, offsets, *repeated))
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def iter_entropy_blocks(
+    signal: Sequence[float],
+    sampling_rate_hz: float,
+    cfg: WindowConfig,
+    block_samples: int,
+    preprocessor: StreamingPreprocessor | None = None,
+) -> Iterator[dict[str, np.ndarray]]:
+    """Feature columns of a long trace, evaluated one block of samples at a time.
+
+    ``signal`` is read in slices of ``block_samples`` samples (e.g. from a
+    memory-mapped ``.npy``), so only one block, plus the samples of windows not
+    yet complete, is held in memory at once. Each slice is cast with
+    ``cfg.dtype_policy`` and passed through ``preprocessor`` (whole-trace
+    ``detrend_signal``/``zscore`` are rejected). The concatenated blocks equal
+    :func:`extract_entropy_columns` on the preprocessed trace, with the same
+    ``start_s``/``end_s``; ``n_jobs``/``chunk_seconds`` are not used.
+    """
+
+    if cfg.detrend_signal or cfg.zscore:
+        raise ValueError(
+            "detrend_signal and zscore need the whole trace; use a StreamingPreprocessor"
+        )
+    window_samples = int(cfg.window_seconds * sampling_rate_hz)
+    step_samples = int(cfg.step_seconds * sampling_rate_hz)
+    if window_samples <= 0 or step_samples <= 0:
+        raise ValueError("window_seconds and step_seconds must be positive")
+    if cfg.engine not in _ENGINES:
+        raise ValueError(f"Unknown engine '{cfg.engine}'")
+    if block_samples <= 0:
+        raise ValueError("block_samples must be positive")
+
+    grid = _window_grid(step_samples, cfg)
+    n_samples = len(signal)
+    pending: np.ndarray | None = None
+    pending_start = 0  # trace index of pending[0], always the next window start
+    for start in range(0, n_samples, block_samples):
+        piece = apply_dtype_policy(signal[start : start + block_samples], cfg.dtype_policy)
+        if preprocessor is not None:
+            piece = preprocessor.process(piece)
+        stop = start + len(piece)
+        if stop <= pending_start:
+            continue
+        piece = piece[max(pending_start - start, 0) :]
+        pending = piece if pending is None or len(pending) == 0 else np.concatenate([pending, piece])
+        n_windows = _n_windows(len(pending), window_samples, step_samples)
+        if stop < n_samples:
+            # Keep block starts on the grid the whole-trace path would use.
+            n_windows -= n_windows % grid
+        if n_windows == 0:
+            continue
+        used = (n_windows - 1) * step_samples + window_samples
+        yield _chunk_columns(
+            pending[:used], pending_start, sampling_rate_hz, window_samples, step_samples, cfg
+        )
+        consumed = n_windows * step_samples
+        pending = pending[consumed:]
+        pending_start += consumed
+
+
 def extract_entropy_features(
     signal: Sequence[float],
     sampling_rate_hz: float,
@@ -68,41 +350,91 @@ def extract_entropy_features(
     """Compute PE/MPE/WPE over sliding windows for a seismic trace.
 
     Returns a tidy DataFrame with one row per window and columns:
-    ``start_s``, ``end_s``, ``pe``, ``wpe``, and ``mpe_scale_k``.
+    ``start_s``, ``end_s``, ``pe``, ``wpe``, and ``mpe_scale_k``. The DataFrame is
+    built once from the arrays of :func:`extract_entropy_columns`.
+    """
+
+    return pd.DataFrame(extract_entropy_columns(signal, sampling_rate_hz, cfg))
+
+
+_SWEEP_COLUMN = re.compile(r"^(?P<feature>.+)_m(?P<order>\d+)_tau(?P<delay>\d+)$")
+
+
+def extract_sweep_features(
+    signal: Sequence[float],
+    sampling_rate_hz: float,
+    cfg: WindowConfig,
+    orders: Sequence[int],
+    delays: Sequence[int],
+) -> pd.DataFrame:
+    """Compute PE/WPE/MPE for every (order, delay) pair in one pass over a trace.
+
+    ``cfg`` provides the windowing, preprocessing, scales and entropy options;
+    its ``order``/``delay`` are replaced by ``orders``/``delays``. Returns a wide
+    DataFrame with ``start_s``, ``end_s``, one column per feature and parameter
+    pair (see :func:`pevolc.entropy.sweep.sweep_column`) and ``basic_*`` stats.
+    Use :func:`select_sweep_columns` to recover the table of one configuration.
     """
 
-    x = np.asarray(signal, dtype=float)
+    x = apply_dtype_policy(signal, cfg.dtype_policy)
     x = _preprocess(x, cfg)
     window_samples = int(cfg.window_seconds * sampling_rate_hz)
     step_samples = int(cfg.step_seconds * sampling_rate_hz)
     if window_samples <= 0 or step_samples <= 0:
         raise ValueError("window_seconds and step_seconds must be positive")
 
-    records: list[dict[str, float]] = []
-    for start_idx, end_idx, segment in _sliding_windows(x, window_samples, step_samples):
-        record: dict[str, float] = {
-            "start_s": start_idx / sampling_rate_hz,
-            "end_s": end_idx / sampling_rate_hz,
-        }
-        if cfg.compute_pe:
-            record["pe"] = compute_pe(
-                segment, order=cfg.order, delay=cfg.delay, base=cfg.base, normalize=cfg.normalize
-            )
-        if cfg.compute_wpe:
-            record["wpe"] = compute_wpe(
-                segment, order=cfg.order, delay=cfg.delay, base=cfg.base, normalize=cfg.normalize
-            )
-        if cfg.compute_mpe:
-            mpe_vals = compute_mpe(
-                segment,
-                scales=cfg.scales,
-                order=cfg.order,
-                delay=cfg.delay,
-                base=cfg.base,
-                normalize=cfg.normalize,
-            )
-            for i, val in enumerate(mpe_vals, start=1):
-                record[f"mpe_scale_{i}"] = val
-        record.update({f"basic_{k}": v for k, v in extract_basic_features(segment).items()})
-        records.append(record)
-    return pd.DataFrame.from_records(records)
+    columns = entropy_sweep(
+        x,
+        window_samples,
+        step_samples,
+        orders,
+        delays,
+        scales=cfg.scales if cfg.compute_mpe else 0,
+        base=cfg.base,
+        normalize=cfg.normalize,
+        pe=cfg.compute_pe,
+        wpe=cfg.compute_wpe,
+        mpe_alignment=cfg.mpe_alignment,
+        memory_budget=cfg.memory_budget,
+    )
+    starts = np.arange(_n_windows(len(x), window_samples, step_samples), dtype=np.int64)
+    starts *= step_samples
+    table: dict[str, np.ndarray] = {
+        "start_s": starts / sampling_rate_hz,
+        "end_s": (starts + window_samples) / sampling_rate_hz,
+    }
+    table.update(columns)
+    table.update(_basic_columns(x, window_samples, step_samples))
+    return pd.DataFrame(table)
+
+
+def select_sweep_columns(
+    table: pd.DataFrame, order: int, delay: int, scales: int | None = None
+) -> pd.DataFrame:
+    """Slice one (order, delay, scales) configuration out of a sweep table.
+
+    Sweep columns for the requested pair are renamed to the names produced by
+    :func:`extract_entropy_features` (``pe``, ``wpe``, ``mpe_scale_k``), MPE
+    scales above ``scales`` are dropped, and all other sweep columns are removed.
+    Non-sweep columns (times, ``basic_*``, labels) are kept as they are. Raises
+    ``ValueError`` if the table has no columns for ``(order, delay)``.
+    """
+
+    keep: dict[str, str] = {}
+    found = False
+    for column in table.columns:
+        match = _SWEEP_COLUMN.match(str(column))
+        if match is None:
+            keep[column] = column
+            continue
+        if int(match["order"]) != order or int(match["delay"]) != delay:
+            continue
+        found = True
+        feature = match["feature"]
+        if scales is not None and feature.startswith("mpe_scale_"):
+            if int(feature.rsplit("_", 1)[1]) > scales:
+                continue
+        keep[column] = feature
+    if not found:
+        raise ValueError(f"Sweep table has no columns for order={order}, delay={delay}")
+    return table[list(keep)].rename(columns=keep)
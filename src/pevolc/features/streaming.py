@@ -0,0 +1,273 @@
+"""Stateful feature extraction for sample streams.
+
+:class:`StreamingEntropyExtractor` accepts sample packets of any length and
+emits one feature row per window as soon as the window's last sample arrives.
+The latest window of samples lives in a preallocated ring buffer. Ordinal
+pattern ids and WPE weights are computed once per sample from the new samples
+and the ``(order - 1) * delay`` samples before them; they enter ring buffers of
+their own and update :class:`~pevolc.entropy.sliding.SlidingPatternHistogram`
+instances bin by bin, adding entering ids and removing the ids they evict. MPE
+keeps one such stream per scale and block phase, fed with the block means as
+blocks complete. A push therefore costs time proportional to its own length,
+not to the window, and memory stays constant however long the stream runs.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+from pevolc.entropy.sliding import SlidingPatternHistogram
+from pevolc.entropy.utils import _pattern_dtype, coarse_grain, ordinal_pattern_indices
+from pevolc.entropy.wpe import rolling_weights
+from pevolc.io import apply_dtype_policy
+
+from .plan import FeaturePlan
+from .preprocessing import StreamingPreprocessor
+from .rolling import BASIC_STATISTICS
+from .seismic_features import WindowConfig, extract_basic_features
+
+
+class _Ring:
+    """Fixed-capacity FIFO over a preallocated array."""
+
+    def __init__(self, capacity: int, dtype: np.dtype) -> None:
+        self.data = np.empty(capacity, dtype=dtype)
+        self.capacity = capacity
+        self.size = 0
+        self._head = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _take(self, offset: int, n: int) -> np.ndarray:
+        return self.data[(self._head + offset + np.arange(n)) % self.capacity]
+
+    def values(self) -> np.ndarray:
+        """Contents, oldest first."""
+
+        return self._take(0, self.size)
+
+    def last(self, n: int) -> np.ndarray:
+        """The ``n`` most recent values (fewer while the buffer fills), oldest first."""
+
+        n = min(n, self.size)
+        return self._take(self.size - n, n)
+
+    def push(self, values: np.ndarray) -> np.ndarray:
+        """Append ``values`` and return the values they evict, oldest first."""
+
+        k = len(values)
+        if k >= self.capacity:
+            evicted = np.concatenate([self.values(), values[: k - self.capacity]])
+            self.data[:] = values[k - self.capacity :]
+            self._head, self.size = 0, self.capacity
+            return evicted
+        n_evicted = max(self.size + k - self.capacity, 0)
+        evicted = self._take(0, n_evicted)
+        tail = (self._head + self.size + np.arange(k)) % self.capacity
+        self.data[tail] = values
+        self._head = (self._head + n_evicted) % self.capacity
+        self.size = min(self.size + k, self.capacity)
+        return evicted
+
+
+class _PatternStream:
+    """Pattern ids of the latest ``capacity`` embedded vectors of a series.
+
+    Keeps an unweighted histogram and/or, with ``weighted``, a WPE histogram up
+    to date as values are appended. Both are rebuilt exactly once their ids
+    have fully turned over (or large weights have left), as in
+    :func:`~pevolc.entropy.sliding.sliding_pe`, which bounds rounding error at
+    constant amortised cost.
+    """
+
+    def __init__(
+        self, capacity: int, order: int, delay: int, counts: bool = True, weighted: bool = False
+    ) -> None:
+        self.order = order
+        self.delay = delay
+        self._span = (order - 1) * delay
+        self._history: np.ndarray | None = None
+        self.ids = _Ring(capacity, _pattern_dtype(order))
+        self.weights = _Ring(capacity, np.float64) if weighted else None
+        self.counts = SlidingPatternHistogram(math.factorial(order)) if counts else None
+        self.weighted = (
+            SlidingPatternHistogram(math.factorial(order), weighted=True) if weighted else None
+        )
+        self._since_refresh = 0
+
+    def extend(self, values: np.ndarray) -> None:
+        """Append the next values of the series."""
+
+        history = values[:0] if self._history is None else self._history
+        context = np.concatenate([history, values])
+        self._history = context[max(len(context) - self._span, 0) :]
+        if len(context) <= self._span:
+            return
+        ids = ordinal_pattern_indices(context, self.order, self.delay)
+        leaving = self.ids.push(ids)
+        if self.counts is not None:
+            self.counts.update(ids, leaving)
+        if self.weights is not None:
+            weights = rolling_weights(context, self.order, self.delay, "variance")
+            self.weighted.update(ids, leaving, weights, self.weights.push(weights))
+        self._since_refresh += len(ids)
+        if self._since_refresh >= self.ids.capacity or (
+            self.weighted is not None and self.weighted.needs_refresh
+        ):
+            current = self.ids.values()
+            if self.counts is not None:
+                self.counts.refresh(current)
+            if self.weighted is not None:
+                self.weighted.refresh(current, self.weights.values())
+            self._since_refresh = 0
+
+
+class StreamingEntropyExtractor:
+    """Emit the rows of :func:`~pevolc.features.extract_entropy_features` from a stream.
+
+    Parameters
+    ----------
+    sampling_rate_hz:
+        Sampling rate of the stream.
+    cfg:
+        Window and entropy configuration. Whole-trace preprocessing
+        (``detrend_signal``/``zscore``) cannot be applied to a stream and is
+        rejected; ``engine``, ``n_jobs`` and ``chunk_seconds`` do not apply.
+    preprocessor:
+        Optional :class:`~pevolc.features.StreamingPreprocessor` applied to each
+        packet before windowing, for causal band-pass, detrending and z-scoring.
+
+    Rows have the columns of ``extract_entropy_features`` and the same
+    ``start_s``/``end_s``. Entropy values come from the same pattern ids, weights
+    and block means as the ``"window"`` engine and match it to floating-point
+    rounding, as do the ``basic_*`` statistics (computed from the ring buffer for
+    each emitted row).
+    """
+
+    def __init__(
+        self,
+        sampling_rate_hz: float,
+        cfg: WindowConfig,
+        preprocessor: StreamingPreprocessor | None = None,
+    ) -> None:
+        if cfg.detrend_signal or cfg.zscore:
+            raise ValueError(
+                "detrend_signal and zscore need the whole trace; use a StreamingPreprocessor"
+            )
+        self.preprocessor = preprocessor
+        self.sampling_rate_hz = float(sampling_rate_hz)
+        self.cfg = cfg
+        self.window = int(cfg.window_seconds * sampling_rate_hz)
+        self.step = int(cfg.step_seconds * sampling_rate_hz)
+        if self.window <= 0 or self.step <= 0:
+            raise ValueError("window_seconds and step_seconds must be positive")
+        self._span = (cfg.order - 1) * cfg.delay
+        self._n_patterns = self.window - self._span
+        if self._n_patterns <= 0:
+            raise ValueError("Signal too short for requested order and delay")
+        self._plan = FeaturePlan.from_config(cfg)
+        self._need_pe = cfg.compute_pe or cfg.compute_mpe
+        # Window starts are multiples of step, so a scale's blocks start at few phases.
+        self._phases = {
+            scale: sorted({k * self.step % scale for k in range(scale)})
+            for scale in self._plan.mpe_scales
+            if scale > 1
+        }
+        for scale in self._phases:
+            if self.window // scale - self._span <= 0:
+                raise ValueError("Signal too short for requested order and delay")
+        self._context = max(self._phases, default=1) - 1
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all samples received so far (and reset the preprocessor)."""
+
+        if self.preprocessor is not None:
+            self.preprocessor.reset()
+        cfg = self.cfg
+        self.n_samples = 0
+        self._next_end = self.window
+        self._samples: _Ring | None = None
+        self._patterns = _PatternStream(
+            self._n_patterns, cfg.order, cfg.delay, counts=self._need_pe, weighted=cfg.compute_wpe
+        )
+        self._scale_streams = {
+            (scale, phase): _PatternStream(self.window // scale - self._span, cfg.order, cfg.delay)
+            for scale, phases in self._phases.items()
+            for phase in phases
+        }
+
+    @property
+    def columns(self) -> list[str]:
+        """Names of the fields of each emitted row, in table order."""
+
+        basic = [f"basic_{name}" for name in BASIC_STATISTICS]
+        return ["start_s", "end_s", *self._plan.columns, *basic]
+
+    def push(self, samples: Sequence[float]) -> list[dict[str, float]]:
+        """Append a packet of samples and return the rows of windows it completes."""
+
+        x = apply_dtype_policy(samples, self.cfg.dtype_policy)
+        if self.preprocessor is not None:
+            x = self.preprocessor.process(x)
+        rows: list[dict[str, float]] = []
+        pos = 0
+        while pos < len(x):
+            # Stop at the next window end so the buffers hold exactly that window.
+            take = min(len(x) - pos, self._next_end - self.n_samples)
+            self._append(x[pos : pos + take])
+            pos += take
+            if self.n_samples == self._next_end:
+                rows.append(self._emit())
+                self._next_end += self.step
+        return rows
+
+    def _append(self, piece: np.ndarray) -> None:
+        if self._samples is None:
+            # Keep the dtype chosen by the dtype policy.
+            self._samples = _Ring(self.window, piece.dtype)
+        start = self.n_samples
+        history = self._samples.last(self._context)
+        self._samples.push(piece)
+        self.n_samples += len(piece)
+        self._patterns.extend(piece)
+        if not self._scale_streams:
+            return
+        context = np.concatenate([history, piece])
+        offset = start - len(history)
+        for (scale, phase), stream in self._scale_streams.items():
+            # Blocks [e - scale, e) with e = phase + j * scale that complete in this piece.
+            first_end = phase + scale * max((start - phase) // scale + 1, 1)
+            last_end = phase + scale * ((self.n_samples - phase) // scale)
+            if first_end <= last_end:
+                block = context[first_end - scale - offset : last_end - offset]
+                stream.extend(coarse_grain(block, scale))
+
+    def _emit(self) -> dict[str, float]:
+        cfg = self.cfg
+        end = self.n_samples
+        entropies: dict[str, float] = {}
+        if self._need_pe:
+            entropies["pe"] = self._patterns.counts.entropy(cfg.order, cfg.base, cfg.normalize)
+        if cfg.compute_wpe:
+            entropies["wpe"] = self._patterns.weighted.entropy(cfg.order, cfg.base, cfg.normalize)
+        for i, scale in enumerate(self._plan.mpe_scales, start=1):
+            if scale == 1:
+                entropies[f"mpe_scale_{i}"] = entropies["pe"]
+            else:
+                stream = self._scale_streams[(scale, (end - self.window) % scale)]
+                entropies[f"mpe_scale_{i}"] = stream.counts.entropy(
+                    cfg.order, cfg.base, cfg.normalize
+                )
+        samples = self._samples.values()
+        row: dict[str, float] = {
+            "start_s": (end - self.window) / self.sampling_rate_hz,
+            "end_s": end / self.sampling_rate_hz,
+        }
+        row.update({name: entropies[name] for name in self._plan.columns})
+        row.update({f"basic_{k}": v for k, v in extract_basic_features(samples).items()})
+        return row
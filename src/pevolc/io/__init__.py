@@ -1,5 +1,33 @@
 """Input/output helpers."""
 
-from .seismic_readers import load_waveforms, read_waveform
+from .mapped import MAPPED_SUFFIXES, open_mapped, write_raw_binary
+from .seismic_readers import (
+    DTYPE_POLICIES,
+    apply_dtype_policy,
+    load_waveforms,
+    read_waveform,
+    working_float_dtype,
+)
+from .tables import (
+    TABLE_FORMATS,
+    read_feature_chunks,
+    read_feature_table,
+    table_format,
+    write_feature_table,
+)
 
-__all__ = ["load_waveform", "load_waveforms"]
+__all__ = [
+    "DTYPE_POLICIES",
+    "MAPPED_SUFFIXES",
+    "TABLE_FORMATS",
+    "apply_dtype_policy",
+    "load_waveforms",
+    "open_mapped",
+    "read_feature_chunks",
+    "read_feature_table",
+    "read_waveform",
+    "table_format",
+    "working_float_dtype",
+    "write_feature_table",
+    "write_raw_binary",
+]
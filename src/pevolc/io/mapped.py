@@ -0,0 +1,110 @@
+"""Memory-mapped access to large sample archives.
+
+Three on-disk layouts are opened without reading the whole file into RAM:
+
+``.npy``
+    NumPy arrays, opened with ``np.load(..., mmap_mode="r")``.
+``.bin`` / ``.raw``
+    Headerless little- or big-endian samples described by a JSON sidecar with
+    the same stem (``trace.bin`` -> ``trace.json``)::
+
+        {"dtype": "<i4", "sampling_rate_hz": 200.0, "offset": 0}
+
+    ``dtype`` is any NumPy dtype string (byte order included), ``offset`` the
+    number of header bytes to skip (default 0). :func:`write_raw_binary` writes
+    both files.
+text
+    Whitespace-separated values are parsed once with ``np.loadtxt`` and cached
+    as ``.npy`` in ``cache_dir`` (default :func:`default_text_cache_dir`, never
+    the data directory, which may be read-only or globbed for inputs); later
+    runs map the cache as long as it is newer than the text file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+RAW_SUFFIXES = (".bin", ".raw")
+MAPPED_SUFFIXES = (".npy", *RAW_SUFFIXES)
+
+
+def raw_sidecar_path(path: Path) -> Path:
+    """Sidecar metadata file of a raw binary archive."""
+
+    return Path(path).with_suffix(".json")
+
+
+def write_raw_binary(path: Path, data: np.ndarray, sampling_rate_hz: float) -> Path:
+    """Write ``data`` as headerless raw samples plus its JSON sidecar."""
+
+    path = Path(path)
+    array = np.ascontiguousarray(data)
+    array.tofile(path)
+    metadata = {"dtype": array.dtype.str, "sampling_rate_hz": float(sampling_rate_hz), "offset": 0}
+    raw_sidecar_path(path).write_text(json.dumps(metadata), encoding="utf-8")
+    return path
+
+
+def open_raw_binary(path: Path) -> Tuple[np.memmap, float | None]:
+    """Memory-map a raw binary archive described by its sidecar."""
+
+    path = Path(path)
+    sidecar = raw_sidecar_path(path)
+    if not sidecar.exists():
+        raise FileNotFoundError(f"Raw binary {path} needs sidecar metadata {sidecar}")
+    metadata = json.loads(sidecar.read_text(encoding="utf-8"))
+    if "dtype" not in metadata:
+        raise ValueError(f"Sidecar {sidecar} must define 'dtype'")
+    dtype = np.dtype(metadata["dtype"])
+    data = np.memmap(path, dtype=dtype, mode="r", offset=int(metadata.get("offset", 0)))
+    sr = metadata.get("sampling_rate_hz")
+    return data, None if sr is None else float(sr)
+
+
+def default_text_cache_dir() -> Path:
+    """``$XDG_CACHE_HOME/pevolc/text`` (``~/.cache/pevolc/text`` by default)."""
+
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "pevolc" / "text"
+
+
+def text_cache_path(path: Path, cache_dir: Path | None = None) -> Path:
+    """Location of the ``.npy`` cache of a text archive.
+
+    The name includes a hash of the absolute source path, so archives with the
+    same name in different directories can share a cache directory.
+    """
+
+    path = Path(path)
+    digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+    return Path(cache_dir or default_text_cache_dir()) / f"{path.name}.{digest}.npy"
+
+
+def open_mapped(path: Path, cache_dir: Path | None = None) -> Tuple[np.ndarray, float | None]:
+    """Open a sample archive as a read-only memory map.
+
+    Returns ``(data, sampling_rate_hz)``; the sampling rate is only known for
+    raw binaries with a sidecar and is ``None`` otherwise. Text files are
+    converted to a cached ``.npy`` on first use.
+    """
+
+    path = Path(path)
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r"), None
+    if path.suffix in RAW_SUFFIXES:
+        return open_raw_binary(path)
+    cache = text_cache_path(path, cache_dir)
+    if not cache.exists() or cache.stat().st_mtime < path.stat().st_mtime:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, np.loadtxt(path))
+        # Atomic so that concurrent workers never map a half-written cache.
+        os.replace(tmp, cache)
+    return np.load(cache, mmap_mode="r"), None
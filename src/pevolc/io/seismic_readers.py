@@ -12,18 +12,63 @@ try:
 except Exception:  # pragma: no cover - optional dependency path
     read = None
 
+DTYPE_POLICIES = ("float64", "float32", "native")
 
-def read_waveform(path: Path) -> Tuple[np.ndarray, float]:
-    """Read a waveform file, returning (data, sampling_rate)."""
+
+def apply_dtype_policy(data: np.ndarray, policy: str = "float64") -> np.ndarray:
+    """Cast samples according to a dtype policy, copying only when the dtype changes.
+
+    ``"float64"`` upcasts everything to double precision (the historical
+    behaviour), ``"float32"`` stores samples in single precision (integer counts
+    above ``2**24`` lose their last bits), and ``"native"`` keeps integer and
+    floating samples as read, converting only non-numeric data to float64.
+    """
+
+    if policy not in DTYPE_POLICIES:
+        raise ValueError(f"Unknown dtype policy '{policy}'")
+    x = np.asarray(data)
+    if policy == "float64":
+        return x.astype(np.float64, copy=False)
+    if policy == "float32":
+        return x.astype(np.float32, copy=False)
+    if x.dtype.kind in "iuf":
+        return x
+    return x.astype(np.float64)
+
+
+def working_float_dtype(dtype: np.dtype) -> np.dtype:
+    """Floating dtype for arithmetic (filtering, z-scoring) on samples of ``dtype``.
+
+    Single precision is kept for float32/float16 data and for integers that
+    float32 represents exactly (at most 16 bits); wider integers such as int32
+    counts need float64.
+    """
+
+    dtype = np.dtype(dtype)
+    if dtype.kind == "f" and dtype.itemsize <= 4:
+        return np.dtype(np.float32)
+    if dtype.kind in "iu" and dtype.itemsize <= 2:
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+def read_waveform(path: Path, dtype_policy: str = "float64") -> Tuple[np.ndarray, float]:
+    """Read a waveform file, returning (data, sampling_rate).
+
+    Samples are cast with :func:`apply_dtype_policy`; ``"native"`` keeps e.g.
+    int32 miniSEED counts without a float copy.
+    """
 
     if read is None:
         raise ImportError("ObsPy is required to read seismic formats")
     st = read(str(path))
     tr = st[0]
-    return tr.data.astype(float), float(tr.stats.sampling_rate)
+    return apply_dtype_policy(tr.data, dtype_policy), float(tr.stats.sampling_rate)
 
 
-def load_waveforms(paths: Iterable[Path]) -> list[Tuple[np.ndarray, float]]:
+def load_waveforms(
+    paths: Iterable[Path], dtype_policy: str = "float64"
+) -> list[Tuple[np.ndarray, float]]:
     """Load multiple seismic waveforms."""
 
-    return [read_waveform(Path(p)) for p in paths]
+    return [read_waveform(Path(p), dtype_policy) for p in paths]
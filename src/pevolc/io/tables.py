@@ -0,0 +1,276 @@
+"""Storage of feature tables as CSV or partitioned Parquet datasets.
+
+Parquet output (needs the optional ``pyarrow`` dependency) is a directory of
+files partitioned by ``source_file`` and, optionally, by fixed-length time bins
+of the ``start_s`` column::
+
+    entropy_features.parquet/
+        _feature_table.json
+        source_file=eruption_1.npy/time_bin=0/part-0.parquet
+        ...
+
+Readers load only the requested columns and push time-range filters down to
+the partition directories and the row-group statistics, so selecting a few
+features over a few days does not parse the whole table. CSV stays available
+for export and small tables. The format follows the path suffix (``.csv``,
+``.parquet``/``.pq``) unless given explicitly.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import shutil
+from pathlib import Path
+from typing import Iterator, Sequence
+
+import pandas as pd
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pragma: no cover - optional dependency path
+    pa = None
+    pq = None
+
+TABLE_FORMATS = ("csv", "parquet")
+_SUFFIX_FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+_METADATA_FILE = "_feature_table.json"
+TIME_BIN_COLUMN = "time_bin"
+
+
+def table_format(path: Path, fmt: str | None = None) -> str:
+    """Storage format of ``path``: ``fmt`` if given, else inferred from its suffix.
+
+    Existing directories are Parquet datasets; any other unknown suffix is read
+    and written as CSV, as before Parquet support.
+    """
+
+    if fmt is None:
+        path = Path(path)
+        default = "parquet" if path.is_dir() else "csv"
+        fmt = _SUFFIX_FORMATS.get(path.suffix.lower(), default)
+    if fmt not in TABLE_FORMATS:
+        raise ValueError(f"Unknown table format '{fmt}'")
+    return fmt
+
+
+def _require_pyarrow() -> None:
+    if pq is None:
+        raise ImportError("pyarrow is required for Parquet feature tables")
+
+
+def write_feature_table(
+    table: pd.DataFrame,
+    path: Path,
+    fmt: str | None = None,
+    partition_cols: Sequence[str] = ("source_file",),
+    time_column: str = "start_s",
+    time_partition_seconds: float | None = None,
+) -> Path:
+    """Write a feature table, replacing any previous table at ``path``.
+
+    An existing Parquet dataset directory is only replaced if it holds the
+    metadata file this function writes; other non-empty directories raise
+    :class:`FileExistsError`.
+
+    Parameters
+    ----------
+    table:
+        Feature table.
+    path:
+        Output file (CSV) or dataset directory (Parquet).
+    fmt:
+        ``"csv"`` or ``"parquet"``; inferred from the suffix of ``path`` if omitted.
+    partition_cols:
+        Parquet partition columns (those missing from ``table`` are ignored).
+    time_column, time_partition_seconds:
+        When ``time_partition_seconds`` is set, Parquet rows are further
+        partitioned into ``time_bin = floor(time_column / time_partition_seconds)``.
+    """
+
+    path = Path(path)
+    fmt = table_format(path, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "csv":
+        table.to_csv(path, index=False)
+        return path
+
+    _require_pyarrow()
+    partitions = [col for col in partition_cols if col in table.columns]
+    if time_partition_seconds is not None:
+        table = table.assign(
+            **{TIME_BIN_COLUMN: (table[time_column] // float(time_partition_seconds)).astype(int)}
+        )
+        partitions.append(TIME_BIN_COLUMN)
+    if path.is_dir():
+        # Only ever delete a dataset this module wrote (or an empty directory).
+        if (path / _METADATA_FILE).exists():
+            shutil.rmtree(path)
+        elif any(path.iterdir()):
+            raise FileExistsError(
+                f"{path} is a directory but not a feature table; refusing to replace it"
+            )
+    elif path.exists():
+        path.unlink()
+    pq.write_to_dataset(
+        pa.Table.from_pandas(table, preserve_index=False),
+        path,
+        partition_cols=partitions or None,
+    )
+    metadata = {
+        "columns": [col for col in table.columns if col != TIME_BIN_COLUMN],
+        "partition_cols": partitions,
+        "time_column": time_column,
+        "time_partition_seconds": time_partition_seconds,
+        "dtypes": {col: str(dtype) for col, dtype in table.dtypes.items() if col in partitions},
+    }
+    (path / _METADATA_FILE).write_text(json.dumps(metadata), encoding="utf-8")
+    return path
+
+
+def read_feature_table(
+    path: Path,
+    columns: Sequence[str] | None = None,
+    time_range: tuple[float | None, float | None] | None = None,
+    time_column: str = "start_s",
+    fmt: str | None = None,
+) -> pd.DataFrame:
+    """Read a feature table written by :func:`write_feature_table`.
+
+    Parameters
+    ----------
+    path:
+        CSV file or Parquet dataset directory.
+    columns:
+        Columns to load (default: all).
+    time_range:
+        Optional ``(start, stop)`` keeping rows with ``start <= time_column < stop``;
+        either bound may be ``None``.
+    time_column:
+        Column the time range applies to.
+    fmt:
+        ``"csv"`` or ``"parquet"``; inferred from the suffix of ``path`` if omitted.
+
+    Partition columns come back with their original dtypes and position; the
+    helper ``time_bin`` column is dropped. Parquet rows are sorted by partition
+    and then by ``time_column``.
+    """
+
+    path = Path(path)
+    fmt = table_format(path, fmt)
+    columns = None if columns is None else list(dict.fromkeys(columns))
+    start, stop = time_range if time_range is not None else (None, None)
+    if fmt == "csv":
+        load = None
+        if columns is not None:
+            load = columns + ([time_column] if time_range and time_column not in columns else [])
+        table = pd.read_csv(path, usecols=load)
+        if start is not None:
+            table = table[table[time_column] >= start]
+        if stop is not None:
+            table = table[table[time_column] < stop]
+        return table[columns].reset_index(drop=True) if columns else table.reset_index(drop=True)
+
+    _require_pyarrow()
+    metadata = _parquet_metadata(path)
+    filters = _parquet_filters(metadata, start, stop, time_column)
+    table = pq.read_table(path, columns=columns, filters=filters).to_pandas()
+    table = _restore_partitions(table, metadata, columns)
+    # Partition directories are listed as strings ("time_bin=10" < "time_bin=2").
+    order = [c for c in metadata.get("partition_cols", []) if c in table.columns]
+    if time_column in table.columns:
+        order.append(time_column)
+    if order:
+        table = table.sort_values(order, kind="stable", ignore_index=True)
+    if columns is None and "columns" in metadata:
+        table = table[[col for col in metadata["columns"] if col in table.columns]]
+    return table
+
+
+def read_feature_chunks(
+    path: Path,
+    columns: Sequence[str] | None = None,
+    time_range: tuple[float | None, float | None] | None = None,
+    time_column: str = "start_s",
+    fmt: str | None = None,
+    chunk_rows: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Stream a feature table in chunks of at most ``chunk_rows`` rows.
+
+    Same selection as :func:`read_feature_table`, but only one chunk is held in
+    memory at a time. Rows arrive in file order (partition by partition for
+    Parquet); chunks emptied by the time filter are skipped.
+    """
+
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be positive")
+    path = Path(path)
+    fmt = table_format(path, fmt)
+    columns = None if columns is None else list(dict.fromkeys(columns))
+    start, stop = time_range if time_range is not None else (None, None)
+    if fmt == "csv":
+        load = None
+        if columns is not None:
+            load = columns + ([time_column] if time_range and time_column not in columns else [])
+        for chunk in pd.read_csv(path, usecols=load, chunksize=chunk_rows):
+            if start is not None:
+                chunk = chunk[chunk[time_column] >= start]
+            if stop is not None:
+                chunk = chunk[chunk[time_column] < stop]
+            if len(chunk):
+                yield (chunk[columns] if columns else chunk).reset_index(drop=True)
+        return
+
+    _require_pyarrow()
+    import pyarrow.dataset as ds  # type: ignore
+
+    metadata = _parquet_metadata(path)
+    filters = _parquet_filters(metadata, start, stop, time_column)
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    batches = dataset.to_batches(
+        columns=columns,
+        filter=None if filters is None else pq.filters_to_expression(filters),
+        batch_size=chunk_rows,
+    )
+    for batch in batches:
+        if batch.num_rows:
+            yield _restore_partitions(batch.to_pandas(), metadata, columns)
+
+
+def _parquet_metadata(path: Path) -> dict:
+    metadata_path = Path(path) / _METADATA_FILE
+    if not metadata_path.exists():
+        return {}
+    return json.loads(metadata_path.read_text(encoding="utf-8"))
+
+
+def _parquet_filters(
+    metadata: dict, start: float | None, stop: float | None, time_column: str
+) -> list[tuple] | None:
+    filters = []
+    if start is not None:
+        filters.append((time_column, ">=", start))
+    if stop is not None:
+        filters.append((time_column, "<", stop))
+    seconds = metadata.get("time_partition_seconds")
+    if seconds and time_column == metadata.get("time_column"):
+        # Prune whole time partitions before any file is opened.
+        if start is not None:
+            filters.append((TIME_BIN_COLUMN, ">=", math.floor(start / seconds)))
+        if stop is not None:
+            filters.append((TIME_BIN_COLUMN, "<=", math.floor(stop / seconds)))
+    return filters or None
+
+
+def _restore_partitions(
+    table: pd.DataFrame, metadata: dict, columns: Sequence[str] | None
+) -> pd.DataFrame:
+    """Drop the helper time-bin column and restore partition column dtypes."""
+
+    if TIME_BIN_COLUMN in table.columns and (columns is None or TIME_BIN_COLUMN not in columns):
+        table = table.drop(columns=TIME_BIN_COLUMN)
+    for col, dtype in metadata.get("dtypes", {}).items():
+        if col in table.columns:
+            table[col] = table[col].astype(dtype)
+    return table
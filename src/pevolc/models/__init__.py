@@ -1,14 +1,28 @@
 """Modeling utilities."""
 
 from .forecasting import (
+    INCREMENTAL_MODEL_TYPES,
     PermutationEntropyForecaster,
     evaluate_auc,
     predict_proba,
     train_forecasting_model,
 )
+from .alerts import (
+    ALERT_LEVELS,
+    AlertPolicy,
+    alert_codes,
+    apply_alert_rules,
+    load_alert_thresholds,
+)
 from .calibration import PlattCalibrator, calibrate_probabilities
 
 __all__ = [
+    "ALERT_LEVELS",
+    "AlertPolicy",
+    "alert_codes",
+    "apply_alert_rules",
+    "load_alert_thresholds",
+    "INCREMENTAL_MODEL_TYPES",
     "PermutationEntropyForecaster",
     "PlattCalibrator",
     "train_forecasting_model",
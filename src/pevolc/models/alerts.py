@@ -0,0 +1,236 @@
+"""Vectorised alert levels with per-station thresholds, hysteresis and dwell.
+
+Probabilities map to ``green``/``yellow``/``red`` codes (``0``/``1``/``2``,
+``int8``) through ``low``/``high`` thresholds. Two rules, both evaluated with
+array operations over each station's time-ordered windows, suppress flapping:
+
+hysteresis
+    A level is entered when the probability reaches its threshold and left only
+    once it drops below ``threshold - hysteresis``.
+minimum dwell
+    A level is reported only after it has held for ``min_dwell`` consecutive
+    windows; until then the previously reported level persists. The rule is
+    causal, so the result for a window never depends on later windows.
+
+Thresholds may differ per station: :func:`load_alert_thresholds` reads a table
+with ``station, low, high[, hysteresis, min_dwell]`` columns (a ``default`` row
+covers unlisted stations) or derives one pair from the ``alert_thresholds.csv``
+precision/recall table written by ``run_training``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+ALERT_LEVELS = ("green", "yellow", "red")
+DEFAULT_STATION = "default"
+_THRESHOLD_COLUMNS = ("low", "high", "hysteresis", "min_dwell")
+
+
+def alert_codes(
+    probs: Sequence[float], low: float | np.ndarray = 0.33, high: float | np.ndarray = 0.66
+) -> np.ndarray:
+    """Alert code per probability: ``0`` below ``low``, ``2`` from ``high``, ``1`` between."""
+
+    p = np.asarray(probs, dtype=float)
+    return ((p >= low).astype(np.int8) + (p >= high)).astype(np.int8)
+
+
+def _forward_fill(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Carry the last valid entry forward (``valid[0]`` must be true)."""
+
+    last = np.maximum.accumulate(np.where(valid, np.arange(len(values)), 0))
+    return values[last]
+
+
+def _segment_starts(n: int, segment_starts: np.ndarray | None) -> np.ndarray:
+    if segment_starts is None:
+        starts = np.zeros(n, dtype=bool)
+    else:
+        starts = np.array(segment_starts, dtype=bool)
+    if n:
+        starts[0] = True
+    return starts
+
+
+def _schmitt(
+    p: np.ndarray, threshold: np.ndarray, hysteresis: np.ndarray, starts: np.ndarray
+) -> np.ndarray:
+    """State of a threshold with hysteresis: set at ``>= t``, cleared below ``t - h``."""
+
+    on = p >= threshold
+    decided = on | (p < threshold - hysteresis) | starts
+    return _forward_fill(on, decided)
+
+
+def apply_alert_rules(
+    probs: Sequence[float],
+    low: float | np.ndarray = 0.33,
+    high: float | np.ndarray = 0.66,
+    hysteresis: float | np.ndarray = 0.0,
+    min_dwell: int | np.ndarray = 1,
+    segment_starts: np.ndarray | None = None,
+) -> np.ndarray:
+    """Alert codes of a time-ordered probability series with hysteresis and dwell.
+
+    Parameters
+    ----------
+    probs:
+        Probabilities in time order.
+    low, high, hysteresis, min_dwell:
+        Scalars or per-row arrays (e.g. per-station values broadcast to rows).
+        ``hysteresis=0`` and ``min_dwell=1`` reduce to :func:`alert_codes`.
+    segment_starts:
+        Optional boolean mask of rows that start an independent series (one per
+        station); state never carries across a segment start and every segment
+        starts from ``green``.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``int8`` codes indexing :data:`ALERT_LEVELS`.
+    """
+
+    p = np.asarray(probs, dtype=float)
+    n = len(p)
+    if n == 0:
+        return np.empty(0, dtype=np.int8)
+    starts = _segment_starts(n, segment_starts)
+    low, high, hysteresis, min_dwell = np.broadcast_arrays(low, high, hysteresis, min_dwell)
+    yellow = _schmitt(p, low, hysteresis, starts)
+    red = _schmitt(p, high, hysteresis, starts)
+    levels = np.maximum(yellow.astype(np.int8), 2 * red.astype(np.int8))
+
+    if np.any(min_dwell > 1):
+        index = np.arange(n)
+        run_start = starts.copy()
+        run_start[1:] |= levels[1:] != levels[:-1]
+        first = np.maximum.accumulate(np.where(run_start, index, 0))
+        accepted = index - first >= np.asarray(min_dwell) - 1
+        # A segment opens in green unless its first level is already accepted.
+        opening = starts & ~accepted
+        values = np.where(opening, 0, levels).astype(np.int8)
+        levels = _forward_fill(values, accepted | starts)
+    return levels.astype(np.int8)
+
+
+def thresholds_from_pr_table(
+    table: pd.DataFrame, recall_target: float = 0.9, precision_target: float = 0.8
+) -> tuple[float, float]:
+    """``(low, high)`` from a ``threshold, precision, recall`` table.
+
+    ``low`` is the largest threshold that still reaches ``recall_target`` and
+    ``high`` the smallest that reaches ``precision_target`` (or the largest
+    threshold if none does); ``high`` is never below ``low``.
+    """
+
+    ordered = table.sort_values("threshold")
+    thresholds = ordered["threshold"].to_numpy(float)
+    recall_ok = thresholds[ordered["recall"].to_numpy(float) >= recall_target]
+    precision_ok = thresholds[ordered["precision"].to_numpy(float) >= precision_target]
+    low = float(recall_ok.max()) if len(recall_ok) else float(thresholds.min())
+    high = float(precision_ok.min()) if len(precision_ok) else float(thresholds.max())
+    return low, max(low, high)
+
+
+def load_alert_thresholds(
+    path: Path, recall_target: float = 0.9, precision_target: float = 0.8
+) -> pd.DataFrame:
+    """Per-station threshold table indexed by station.
+
+    Reads a CSV with ``station, low, high`` and optional ``hysteresis`` and
+    ``min_dwell`` columns, or a ``threshold, precision, recall`` table as written
+    by ``run_training`` (turned into a single ``default`` row with
+    :func:`thresholds_from_pr_table`).
+    """
+
+    table = pd.read_csv(path)
+    if {"threshold", "precision", "recall"} <= set(table.columns):
+        low, high = thresholds_from_pr_table(table, recall_target, precision_target)
+        table = pd.DataFrame({"station": [DEFAULT_STATION], "low": [low], "high": [high]})
+    missing = {"station", "low", "high"} - set(table.columns)
+    if missing:
+        raise ValueError(f"Threshold table {path} lacks columns {sorted(missing)}")
+    return table.astype({"station": str}).set_index("station")
+
+
+@dataclass
+class AlertPolicy:
+    """Alert thresholds and anti-flapping rules, optionally per station.
+
+    ``thresholds`` is a table as returned by :func:`load_alert_thresholds`; its
+    columns override the scalar defaults for the listed stations, and a
+    ``default`` row replaces the defaults for every other station.
+    """
+
+    thresholds: pd.DataFrame = field(default_factory=pd.DataFrame)
+    low: float = 0.33
+    high: float = 0.66
+    hysteresis: float = 0.0
+    min_dwell: int = 1
+
+    def _station_values(self, stations: np.ndarray) -> dict[str, np.ndarray]:
+        defaults = {name: getattr(self, name) for name in _THRESHOLD_COLUMNS}
+        if DEFAULT_STATION in self.thresholds.index:
+            row = self.thresholds.loc[DEFAULT_STATION]
+            for name in _THRESHOLD_COLUMNS:
+                if name in row.index and pd.notna(row[name]):
+                    defaults[name] = row[name]
+        values = {}
+        for name, default in defaults.items():
+            if name in self.thresholds.columns:
+                mapped = pd.Series(stations).map(self.thresholds[name]).to_numpy(float)
+                values[name] = np.where(np.isnan(mapped), default, mapped)
+            else:
+                values[name] = np.full(len(stations), default, dtype=float)
+        values["min_dwell"] = values["min_dwell"].astype(int)
+        return values
+
+    def evaluate(
+        self,
+        probs: Sequence[float],
+        stations: Sequence[str] | None = None,
+        times: Sequence[float] | None = None,
+    ) -> pd.Categorical:
+        """Alert levels of each row as a categorical over :data:`ALERT_LEVELS`.
+
+        Rows are grouped by ``stations`` (one series if omitted) and ordered by
+        ``times`` within each station (input order if omitted); the result is
+        in the input row order.
+        """
+
+        p = np.asarray(probs, dtype=float)
+        n = len(p)
+        if stations is None:
+            station = np.full(n, DEFAULT_STATION, dtype=object)
+        else:
+            station = np.asarray(stations, dtype=object)
+        time = np.arange(n, dtype=float) if times is None else np.asarray(times, dtype=float)
+        order = np.lexsort((time, station.astype(str)))
+        sorted_station = station[order]
+        starts = np.ones(n, dtype=bool)
+        starts[1:] = sorted_station[1:] != sorted_station[:-1]
+        values = self._station_values(sorted_station.astype(str))
+        codes = np.empty(n, dtype=np.int8)
+        codes[order] = apply_alert_rules(p[order], segment_starts=starts, **values)
+        return pd.Categorical.from_codes(codes, categories=ALERT_LEVELS)
+
+    def evaluate_frame(
+        self,
+        frame: pd.DataFrame,
+        prob_column: str = "probability",
+        station_column: str = "source_file",
+        time_column: str = "start_s",
+    ) -> pd.Categorical:
+        """:meth:`evaluate` on the columns of a feature/score table."""
+
+        return self.evaluate(
+            frame[prob_column].to_numpy(),
+            frame[station_column].to_numpy() if station_column in frame.columns else None,
+            frame[time_column].to_numpy() if time_column in frame.columns else None,
+        )
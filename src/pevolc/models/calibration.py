@@ -19,10 +19,15 @@ class PlattCalibrator:
         self._lr = LogisticRegression(max_iter=self.max_iter)
         self._fitted = False
 
-    def fit(self, probs: Sequence[float], labels: Sequence[int]) -> "PlattCalibrator":
+    def fit(
+        self,
+        probs: Sequence[float],
+        labels: Sequence[int],
+        sample_weight: Sequence[float] | None = None,
+    ) -> "PlattCalibrator":
         X = np.asarray(probs, dtype=float).reshape(-1, 1)
         y = np.asarray(labels, dtype=int)
-        self._lr.fit(X, y)
+        self._lr.fit(X, y, sample_weight=sample_weight)
         self._fitted = True
         return self
 
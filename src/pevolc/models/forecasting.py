@@ -3,16 +3,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Sequence
+from typing import Any, Callable, Iterable, Sequence
 
 import numpy as np
 from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.metrics import roc_auc_score
 from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
 
+from .alerts import ALERT_LEVELS, alert_codes
 from .calibration import PlattCalibrator
 
+# Model types that can be trained chunk by chunk with fit_stream.
+INCREMENTAL_MODEL_TYPES = ("sgd",)
+
 
 def _build_model(model_type: str) -> Any:
     if model_type == "logreg":
@@ -23,6 +29,14 @@ def _build_model(model_type: str) -> Any:
         )
     if model_type == "gradient_boosting":
         return GradientBoostingClassifier(random_state=42)
+    if model_type == "sgd":
+        # Logistic loss with averaged weights: less sensitive to the order of chunks.
+        return Pipeline(
+            [
+                ("scale", StandardScaler()),
+                ("clf", SGDClassifier(loss="log_loss", average=True, random_state=42)),
+            ]
+        )
     raise ValueError(f"Unsupported model_type '{model_type}'")
 
 
@@ -51,6 +65,88 @@ class PermutationEntropyForecaster:
             self.model.fit(X, y)
         return self
 
+    def fit_stream(
+        self,
+        chunks: Callable[[], Iterable[tuple[Sequence[Sequence[float]], Sequence[int]]]],
+        epochs: int = 5,
+        calibration_fraction: float = 0.2,
+        calibration_bins: int = 1000,
+        random_state: int = 42,
+    ) -> "PermutationEntropyForecaster":
+        """Fit an incremental model on a stream of ``(features, labels)`` chunks.
+
+        Parameters
+        ----------
+        chunks:
+            Callable returning a fresh iterator over the same chunks on every
+            call; it is traversed ``epochs + 2`` times.
+        epochs:
+            Passes of ``partial_fit`` over the training rows (shuffled within
+            each chunk).
+        calibration_fraction:
+            Random fraction of rows, fixed across passes, held out from training
+            for Platt scaling when ``calibrate`` is set.
+        calibration_bins:
+            The held-out scores are accumulated in this many equal-width bins,
+            so calibration needs constant memory.
+
+        The first pass fits the streaming standardizer (``StandardScaler.partial_fit``),
+        the next ``epochs`` the classifier, and the last one scores the
+        held-out rows. Only model types in :data:`INCREMENTAL_MODEL_TYPES`
+        support this.
+        """
+
+        if self.model_type not in INCREMENTAL_MODEL_TYPES:
+            raise ValueError(f"Unsupported incremental model_type '{self.model_type}'")
+        scaler = self.model.named_steps["scale"]
+        clf = self.model.named_steps["clf"]
+        held_out = calibration_fraction if self.calibrate else 0.0
+        shuffle_rng = np.random.default_rng(random_state)
+
+        def split() -> Iterable[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+            # Re-seeded on every pass so each row keeps its train/calibration role.
+            rng = np.random.default_rng(random_state)
+            for features, labels in chunks():
+                X = np.asarray(features, dtype=float)
+                y = np.asarray(labels, dtype=int)
+                yield X, y, rng.random(len(y)) < held_out
+
+        for X, y, cal in split():
+            if (~cal).any():
+                scaler.partial_fit(X[~cal])
+        fitted = False
+        for _ in range(epochs):
+            for X, y, cal in split():
+                train = shuffle_rng.permutation(np.flatnonzero(~cal))
+                if len(train):
+                    clf.partial_fit(scaler.transform(X[train]), y[train], classes=[0, 1])
+                    fitted = True
+        if not fitted:
+            raise ValueError("No training rows in the stream")
+
+        self.calibrator = None
+        if self.calibrate:
+            counts = np.zeros((calibration_bins, 2))
+            for X, y, cal in split():
+                if cal.any():
+                    raw = self.model.predict_proba(X[cal])[:, 1]
+                    bins = np.minimum((raw * calibration_bins).astype(int), calibration_bins - 1)
+                    np.add.at(counts, (bins, y[cal]), 1.0)
+            centers = (np.arange(calibration_bins) + 0.5) / calibration_bins
+            used = counts > 0
+            self.calibrator = PlattCalibrator().fit(
+                np.concatenate([centers[used[:, 0]], centers[used[:, 1]]]),
+                np.repeat([0, 1], used.sum(axis=0)),
+                sample_weight=np.concatenate([counts[used[:, 0], 0], counts[used[:, 1], 1]]),
+            )
+        return self
+
+    @property
+    def n_features_in_(self) -> int | None:
+        """Number of features seen during fit (``None`` before fitting)."""
+
+        return getattr(self.model, "n_features_in_", None)
+
     def predict_proba(self, features: Sequence[Sequence[float]]) -> np.ndarray:
         X = np.asarray(features, dtype=float)
         probs = self.model.predict_proba(X)[:, 1]
@@ -61,19 +157,14 @@ class PermutationEntropyForecaster:
     def predict_alert_level(
         self, features: Sequence[Sequence[float]], thresholds: tuple[float, float] = (0.33, 0.66)
     ) -> list[str]:
-        """Return alert levels (green/yellow/red) for given features."""
-
-        probs = self.predict_proba(features)
-        levels = []
-        low, high = thresholds
-        for p in probs:
-            if p < low:
-                levels.append("green")
-            elif p < high:
-                levels.append("yellow")
-            else:
-                levels.append("red")
-        return levels
+        """Return alert levels (green/yellow/red) for given features.
+
+        See :class:`pevolc.models.alerts.AlertPolicy` for per-station thresholds,
+        hysteresis and minimum dwell.
+        """
+
+        codes = alert_codes(self.predict_proba(features), *thresholds)
+        return np.asarray(ALERT_LEVELS)[codes].tolist()
 
 
 def train_forecasting_model(
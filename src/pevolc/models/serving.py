@@ -0,0 +1,324 @@
+"""Long-lived local scoring service for fitted forecasters.
+
+:class:`ScoringServer` loads a ``forecaster.joblib`` (or its compiled
+``forecaster.npz``, see :mod:`pevolc.compiled`) once and serves it over HTTP
+on localhost, so alert evaluations no longer pay for interpreter start-up,
+imports and unpickling:
+
+``POST /score``
+    Body ``{"rows": [[f1, f2, ...], ...]}`` (feature order of training);
+    answers ``{"probabilities": [...]}``.
+``GET /stats``
+    Request count, latency percentiles (ms), batching and reload counters.
+``GET /health``
+    ``{"status": "ok"}``.
+
+Concurrent requests are queued and scored together by a single worker thread
+(:class:`MicroBatcher`): it waits at most ``max_wait_ms`` for more rows after
+the first request of a batch, then makes one ``predict_proba`` call for up to
+``max_batch_rows`` rows. :class:`ModelHandle` reloads the model when the file's
+modification time or size changes; a file that fails to load (e.g. while it is
+being written) leaves the previous model in service. Publish new models with an
+atomic rename to avoid that window altogether.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import joblib
+import numpy as np
+
+from pevolc.compiled import load_compiled
+
+logger = logging.getLogger(__name__)
+
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+class ModelHandle:
+    """A model loaded from ``path`` and reloaded when the file changes.
+
+    The file is checked at most every ``check_interval`` seconds. ``.npz``
+    files are loaded with :func:`pevolc.compiled.load_compiled`, anything else
+    with ``joblib``.
+    """
+
+    def __init__(self, path: Path, check_interval: float = 1.0) -> None:
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._signature = self._stat()
+        self._model = self._load()
+        self._checked = time.monotonic()
+
+    def _load(self) -> Any:
+        if self.path.suffix == ".npz":
+            return load_compiled(self.path)
+        return joblib.load(self.path)
+
+    def _stat(self) -> tuple[int, int]:
+        stat = self.path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self) -> Any:
+        """The current model, reloading it first if the file changed."""
+
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked >= self.check_interval:
+                self._checked = now
+                self._maybe_reload()
+            return self._model
+
+    def _maybe_reload(self) -> None:
+        try:
+            signature = self._stat()
+            if signature == self._signature:
+                return
+            model = self._load()
+        except Exception as exc:
+            logger.warning("Keeping the loaded model; reloading %s failed: %s", self.path, exc)
+            return
+        self._model, self._signature = model, signature
+        self.reloads += 1
+        logger.info("Reloaded model from %s", self.path)
+
+
+class MicroBatcher:
+    """Coalesce concurrent scoring requests into single ``score`` calls.
+
+    Parameters
+    ----------
+    score:
+        Vectorised scorer mapping an ``(n, d)`` array to ``n`` values.
+    max_batch_rows:
+        Upper bound on the rows of one call (a larger request is scored alone).
+    max_wait_ms:
+        How long the worker waits for more requests after the first one.
+    """
+
+    def __init__(
+        self,
+        score: Callable[[np.ndarray], np.ndarray],
+        max_batch_rows: int = 4096,
+        max_wait_ms: float = 2.0,
+    ) -> None:
+        self.score = score
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.batched_requests = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, rows: np.ndarray) -> Future:
+        """Queue ``rows`` for scoring; the future resolves to their scores."""
+
+        future: Future = Future()
+        self._queue.put((rows, future))
+        return future
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._worker.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            n_rows = len(item[0])
+            deadline = time.monotonic() + self.max_wait
+            while n_rows < self.max_batch_rows:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None or n_rows + len(item[0]) > self.max_batch_rows:
+                    # Leave it (or the stop signal) for the next round.
+                    self._queue.put(item)
+                    break
+                batch.append(item)
+                n_rows += len(item[0])
+            self._score_batch(batch)
+
+    def _score_batch(self, batch: list[tuple[np.ndarray, Future]]) -> None:
+        try:
+            scores = np.asarray(self.score(np.concatenate([rows for rows, _ in batch])))
+        except Exception as exc:
+            if len(batch) == 1:
+                batch[0][1].set_exception(exc)
+                return
+            # Score the requests one by one so only the offending one fails.
+            for item in batch:
+                self._score_batch([item])
+            return
+        self.batches += 1
+        self.batched_requests += len(batch)
+        start = 0
+        for rows, future in batch:
+            future.set_result(scores[start : start + len(rows)])
+            start += len(rows)
+
+
+class LatencyTracker:
+    """Percentiles over the latencies of the most recent ``window`` requests."""
+
+    def __init__(self, window: int = 10_000) -> None:
+        self.count = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self._latencies.append(seconds)
+
+    def percentiles(self, percentiles: Sequence[float] = LATENCY_PERCENTILES) -> dict[str, float]:
+        """Latency percentiles in milliseconds (``NaN`` before the first request)."""
+
+        with self._lock:
+            values = np.array(self._latencies) * 1000.0
+        if len(values) == 0:
+            return {f"p{p:g}_ms": float("nan") for p in percentiles}
+        values = np.percentile(values, percentiles)
+        return {f"p{p:g}_ms": float(v) for p, v in zip(percentiles, values)}
+
+
+def _n_features(model: Any) -> int | None:
+    """Feature count a forecaster (or its compiled artifact) was fitted on, if known."""
+
+    return getattr(model, "n_features_in_", None)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "ScoringServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._reply(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._reply(200, self.server.stats())
+        else:
+            self._reply(404, {"error": f"Unknown path '{self.path}'"})
+
+    def do_POST(self) -> None:
+        if self.path != "/score":
+            self._reply(404, {"error": f"Unknown path '{self.path}'"})
+            return
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            rows = np.asarray(json.loads(self.rfile.read(length))["rows"], dtype=float)
+            if rows.ndim != 2:
+                raise ValueError("rows must be a list of feature rows")
+            n_features = _n_features(self.server.model.get())
+            if n_features is not None and rows.shape[1] != n_features:
+                raise ValueError(
+                    f"rows have {rows.shape[1]} features, the model expects {n_features}"
+                )
+            if not np.isfinite(rows).all():
+                raise ValueError("rows must not contain NaN or infinite values")
+        except (ValueError, KeyError, TypeError) as exc:
+            self._reply(400, {"error": str(exc)})
+            return
+        try:
+            probs = self.server.batcher.submit(rows).result()
+        except Exception as exc:
+            self._reply(500, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+        self.server.latency.record(time.perf_counter() - start)
+        self._reply(200, {"probabilities": probs.tolist()})
+
+
+class ScoringServer(ThreadingHTTPServer):
+    """HTTP scoring service for a forecaster saved with ``joblib``.
+
+    Parameters
+    ----------
+    model_path:
+        Forecaster file (``forecaster.joblib`` or a compiled ``.npz`` artifact).
+    host, port:
+        Bind address; the default only accepts local connections and
+        ``port=0`` picks a free port (see ``server_address``).
+    max_batch_rows, max_wait_ms:
+        Micro-batching limits, see :class:`MicroBatcher`.
+    reload_interval:
+        Seconds between checks of the model file for changes.
+
+    Call ``serve_forever()`` (blocking) and ``shutdown()``/``server_close()``.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        model_path: Path,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        max_batch_rows: int = 4096,
+        max_wait_ms: float = 2.0,
+        reload_interval: float = 1.0,
+    ) -> None:
+        self.model = ModelHandle(model_path, check_interval=reload_interval)
+        self.batcher = MicroBatcher(
+            lambda rows: self.model.get().predict_proba(rows), max_batch_rows, max_wait_ms
+        )
+        self.latency = LatencyTracker()
+        super().__init__((host, port), _Handler)
+
+    def stats(self) -> dict:
+        batches = self.batcher.batches
+        return {
+            "requests": self.latency.count,
+            "batches": batches,
+            "mean_requests_per_batch": self.batcher.batched_requests / batches if batches else 0.0,
+            "model_reloads": self.model.reloads,
+            "latency": self.latency.percentiles(),
+        }
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.batcher.close()
+
+
+def serve(model_path: Path, **kwargs: Any) -> None:
+    """Run a :class:`ScoringServer` until interrupted."""
+
+    server = ScoringServer(model_path, **kwargs)
+    host, port = server.server_address[:2]
+    logger.info("Scoring %s on http://%s:%d (pid %d)", model_path, host, port, os.getpid())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
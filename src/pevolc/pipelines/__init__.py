@@ -1,6 +1,13 @@
 """Training and feature computation pipelines."""
 
-from .compute_entropy import compute_entropy_dataset, run_from_config
+from .compute_entropy import compute_entropy_dataset, compute_sweep_dataset, run_from_config
+from .cross_validation import cross_validate_time_series
 from .train_forecaster import run_training
 
-__all__ = ["compute_entropy_dataset", "run_from_config", "run_training"]
+__all__ = [
+    "compute_entropy_dataset",
+    "compute_sweep_dataset",
+    "cross_validate_time_series",
+    "run_from_config",
+    "run_training",
+]
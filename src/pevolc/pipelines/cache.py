@@ -0,0 +1,216 @@
+"""Content-addressed on-disk cache of per-file feature tables.
+
+Entries are keyed by a SHA-256 digest of the input file (plus the JSON sidecar
+of raw binaries) and of every configuration value that changes the features,
+so a rerun only recomputes files whose content or parameters changed, and a
+file that is renamed or copied still hits. Hashing a large file is avoided when
+its size and modification time match the fingerprint recorded the last time it
+was hashed.
+
+Each entry is an ``.npz`` of the feature columns. Entries and fingerprints are
+written to a temporary file and moved into place with ``os.replace``, so
+several pipeline processes can share a cache directory: readers never see a
+partial entry and concurrent writers of the same key store identical content.
+Hits refresh the entry's modification time, and :meth:`FeatureCache.evict`
+removes entries older than ``max_age_seconds`` and then the least recently
+used ones until the cache fits in ``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import time
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from pevolc.io.mapped import RAW_SUFFIXES, raw_sidecar_path
+
+CACHE_VERSION = 1
+
+# Execution settings that do not change the feature values, and keys that only
+# affect what happens to the table after extraction.
+_IGNORED_KEYS = frozenset(
+    {
+        "data_glob",
+        "output_path",
+        "n_workers",
+        "executor",
+        "n_jobs",
+        "memory_budget_mb",
+        "text_cache_dir",
+        "label_mapping",
+        "label_value",
+        "label_shift_windows",
+        "cache_dir",
+        "cache_max_mb",
+        "cache_max_age_days",
+    }
+)
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def feature_params(
+    cfg: dict, orders: Sequence[int] | None = None, delays: Sequence[int] | None = None
+) -> dict:
+    """Configuration values that determine a file's feature table."""
+
+    params = {key: value for key, value in cfg.items() if key not in _IGNORED_KEYS}
+    if orders is not None:
+        params["sweep"] = {"orders": sorted(set(orders)), "delays": sorted(set(delays))}
+    return params
+
+
+class FeatureCache:
+    """Directory of feature tables keyed by input content and parameters.
+
+    Parameters
+    ----------
+    directory:
+        Cache root; created on first use.
+    max_bytes:
+        Optional bound on the total size of the entries, enforced by :meth:`evict`.
+    max_age_seconds:
+        Optional bound on the time since an entry was last written or read.
+
+    ``hits``, ``misses`` and ``evicted`` count the lookups and removals made
+    through this instance.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int | None = None,
+        max_age_seconds: float | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._entries = self.directory / "entries"
+        self._fingerprints = self.directory / "fingerprints"
+        self._entries.mkdir(parents=True, exist_ok=True)
+        self._fingerprints.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "FeatureCache | None":
+        """Cache described by ``cache_dir``/``cache_max_mb``/``cache_max_age_days``, if any."""
+
+        if not cfg.get("cache_dir"):
+            return None
+        max_mb = cfg.get("cache_max_mb")
+        max_days = cfg.get("cache_max_age_days")
+        return cls(
+            Path(cfg["cache_dir"]),
+            max_bytes=None if max_mb is None else int(float(max_mb) * 1024**2),
+            max_age_seconds=None if max_days is None else float(max_days) * 86400.0,
+        )
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evicted": self.evicted}
+
+    def content_digest(self, path: Path) -> str:
+        """SHA-256 of a file, reused while its size and mtime are unchanged."""
+
+        path = Path(path).resolve()
+        stat = path.stat()
+        name = hashlib.sha256(str(path).encode("utf-8")).hexdigest()
+        fingerprint = self._fingerprints / f"{name}.json"
+        try:
+            known = json.loads(fingerprint.read_text(encoding="utf-8"))
+            if known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+                return known["sha256"]
+        except (OSError, ValueError, KeyError):
+            pass
+        digest = _file_digest(path)
+        record = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        _write_atomic(fingerprint, json.dumps(record).encode("utf-8"))
+        return digest
+
+    def key(self, path: Path, params: dict) -> str:
+        """Cache key of ``path`` featurized with ``params`` (see :func:`feature_params`)."""
+
+        path = Path(path)
+        content = [self.content_digest(path)]
+        sidecar = raw_sidecar_path(path)
+        if path.suffix in RAW_SUFFIXES and sidecar.exists():
+            content.append(self.content_digest(sidecar))
+        payload = {"version": CACHE_VERSION, "content": content, "params": params}
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self._entries / f"{key}.npz"
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """Cached table for ``key``, or ``None`` (counted as a miss)."""
+
+        entry = self._entry(key)
+        try:
+            with np.load(entry) as stored:
+                table = pd.DataFrame({name: stored[name] for name in stored.files})
+            os.utime(entry)
+        except (OSError, ValueError, zipfile.BadZipFile):
+            # Missing, evicted by another process meanwhile, or unreadable.
+            self.misses += 1
+            return None
+        self.hits += 1
+        return table
+
+    def put(self, key: str, table: pd.DataFrame) -> None:
+        """Store a table of numeric feature columns under ``key``."""
+
+        buffer = io.BytesIO()
+        np.savez(buffer, **{str(name): table[name].to_numpy() for name in table.columns})
+        _write_atomic(self._entry(key), buffer.getvalue())
+
+    def evict(self) -> int:
+        """Apply the age and size bounds; returns the number of entries removed."""
+
+        entries = []
+        for entry in self._entries.glob("*.npz"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort()
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, entry in entries:
+            expired = self.max_age_seconds is not None and now - mtime > self.max_age_seconds
+            oversized = self.max_bytes is not None and total > self.max_bytes
+            if not (expired or oversized):
+                continue
+            entry.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self.evicted += removed
+        return removed
@@ -3,51 +3,92 @@
 from __future__ import annotations
 
 import glob
+import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Sequence
 
 import numpy as np
 import pandas as pd
 import yaml
 
-from pevolc.features import WindowConfig, extract_entropy_features
-from pevolc.io import read_waveform
+from pevolc.features import (
+    StreamingPreprocessor,
+    WindowConfig,
+    design_filter,
+    extract_entropy_columns,
+    extract_entropy_features,
+    extract_sweep_features,
+    iter_entropy_blocks,
+    preprocess_blocks,
+)
+from pevolc.features.preprocessing import PREPROCESSING_MODES
+from pevolc.io import (
+    MAPPED_SUFFIXES,
+    apply_dtype_policy,
+    open_mapped,
+    read_waveform,
+    table_format,
+    working_float_dtype,
+    write_feature_table,
+)
 
+from .cache import FeatureCache, feature_params
 
-def _load_signal(path: Path, sampling_rate: float | None = None) -> tuple[np.ndarray, float]:
-    try:
-        data, sr = read_waveform(path)
-        return data, sr
-    except Exception:
-        # Fallback to generic text/npy with provided sampling rate
-        if sampling_rate is None:
-            raise
-        if path.suffix == ".npy":
-            data = np.load(path)
-        else:
-            data = np.loadtxt(path)
-        return data.astype(float), sampling_rate
+logger = logging.getLogger(__name__)
+
+_EXECUTORS = ("serial", "process")
+
+
+def _load_signal(
+    path: Path,
+    sampling_rate: float | None = None,
+    dtype_policy: str = "float64",
+    mapped: bool = False,
+    cache_dir: Path | None = None,
+) -> tuple[np.ndarray, float]:
+    """Load the samples and sampling rate of one file.
+
+    ``.npy`` files and raw binaries with a JSON sidecar are memory-mapped; other
+    files are read with ObsPy, falling back to text parsed once into a cached
+    ``.npy`` (see :mod:`pevolc.io.mapped`). ``mapped=True`` returns the map itself
+    so that the dtype policy can be applied block by block.
+    """
+
+    if path.suffix in MAPPED_SUFFIXES:
+        data, sr = open_mapped(path)
+    else:
+        try:
+            data, sr = read_waveform(path, dtype_policy)
+            return data, sr
+        except Exception:
+            # Fallback to generic text with provided sampling rate
+            if sampling_rate is None:
+                raise
+            data, sr = open_mapped(path, cache_dir)
+    sr = sampling_rate if sr is None else sr
+    if sr is None:
+        raise ValueError(f"sampling_rate_hz is required for {path.name}")
+    return (data if mapped else apply_dtype_policy(data, dtype_policy)), sr
 
 
 def _bandpass(signal: np.ndarray, sr: float, low: float | None, high: float | None, order: int = 4) -> np.ndarray:
-    """Apply Butterworth bandpass if bounds are provided."""
+    """Apply Butterworth bandpass if bounds are provided.
+
+    Zero-phase ``filtfilt`` on the whole trace (the ``"offline"`` preprocessing
+    mode); the design is cached by :func:`pevolc.features.design_filter`. The
+    filter runs in double precision; its output is stored in
+    :func:`pevolc.io.working_float_dtype` of the input, so float32 data stays
+    float32.
+    """
 
-    from scipy.signal import butter, filtfilt
+    from scipy.signal import filtfilt
 
-    nyq = 0.5 * sr
-    if low is None and high is None:
+    design = design_filter(sr, low, high, order, output="ba")
+    if design is None:
         return signal
-    if low is None:
-        btype = "lowpass"
-        Wn = high / nyq
-    elif high is None:
-        btype = "highpass"
-        Wn = low / nyq
-    else:
-        btype = "bandpass"
-        Wn = [low / nyq, high / nyq]
-    b, a = butter(order, Wn, btype=btype)
-    return filtfilt(b, a, signal)
+    b, a = design
+    return filtfilt(b, a, signal).astype(working_float_dtype(signal.dtype), copy=False)
 
 
 def _infer_label(path: Path, cfg: dict) -> float | None:
@@ -62,34 +103,119 @@ def _infer_label(path: Path, cfg: dict) -> float | None:
     return None
 
 
-def compute_entropy_dataset(
-    data_paths: Iterable[Path], output_path: Path, cfg: dict
-) -> pd.DataFrame:
-    """Compute permutation-entropy variants for provided data files and save results."""
+def _text_cache_dir(cfg: dict) -> Path | None:
+    """``text_cache_dir``, else ``<cache_dir>/text``, else the library default."""
 
-    sampling_rate = float(cfg["sampling_rate_hz"])
-    band_low = cfg.get("bandpass_low")
-    band_high = cfg.get("bandpass_high")
-    label_shift = int(cfg.get("label_shift_windows", 0))
-    window_cfg = WindowConfig(
+    if cfg.get("text_cache_dir"):
+        return Path(cfg["text_cache_dir"])
+    if cfg.get("cache_dir"):
+        return Path(cfg["cache_dir"]) / "text"
+    return None
+
+
+def _preprocessing_mode(cfg: dict) -> str:
+    mode = str(cfg.get("preprocessing", "offline"))
+    if mode not in PREPROCESSING_MODES:
+        raise ValueError(f"Unknown preprocessing mode '{mode}'")
+    return mode
+
+
+def _window_config(cfg: dict) -> WindowConfig:
+    # In causal mode detrending and z-scoring already ran in _prepared_signal.
+    offline = _preprocessing_mode(cfg) == "offline"
+    return WindowConfig(
         window_seconds=float(cfg.get("window_seconds", 10.0)),
         step_seconds=float(cfg.get("step_seconds", 5.0)),
         order=int(cfg.get("order", 3)),
         delay=int(cfg.get("delay", 1)),
         scales=int(cfg.get("scales", 3)),
-        detrend_signal=bool(cfg.get("detrend", False)),
+        detrend_signal=offline and bool(cfg.get("detrend", False)),
+        zscore=offline and bool(cfg.get("zscore", False)),
+        engine=str(cfg.get("engine", "window")),
+        mpe_alignment=str(cfg.get("mpe_alignment", "exact")),
+        dtype_policy=str(cfg.get("dtype_policy", "float64")),
+        n_jobs=int(cfg.get("n_jobs", 1)),
+        chunk_seconds=(
+            float(cfg["chunk_seconds"]) if cfg.get("chunk_seconds") is not None else None
+        ),
+        memory_budget_mb=(
+            float(cfg["memory_budget_mb"]) if cfg.get("memory_budget_mb") is not None else None
+        ),
+    )
+
+
+def _prepared_signal(path: Path, cfg: dict) -> tuple[np.ndarray, float]:
+    """Load a file and apply the configured band-pass.
+
+    With ``preprocessing: causal`` the band-pass (second-order sections with
+    carried state), detrending and z-scoring run block by block through a
+    :class:`~pevolc.features.StreamingPreprocessor` instead.
+    """
+
+    data, sr = _load_signal(
+        path,
+        float(cfg["sampling_rate_hz"]),
+        str(cfg.get("dtype_policy", "float64")),
+        cache_dir=_text_cache_dir(cfg),
+    )
+    if _preprocessing_mode(cfg) == "causal":
+        block_size = int(float(cfg.get("preprocess_block_seconds", 3600.0)) * sr)
+        return preprocess_blocks(data, _streaming_preprocessor(cfg, sr), max(block_size, 1)), sr
+    low, high = cfg.get("bandpass_low"), cfg.get("bandpass_high")
+    return _bandpass(data, sr, low, high, order=int(cfg.get("bandpass_order", 4))), sr
+
+
+def _streaming_preprocessor(cfg: dict, sr: float) -> StreamingPreprocessor:
+    return StreamingPreprocessor(
+        sr,
+        cfg.get("bandpass_low"),
+        cfg.get("bandpass_high"),
+        int(cfg.get("bandpass_order", 4)),
+        detrend=bool(cfg.get("detrend", False)),
         zscore=bool(cfg.get("zscore", False)),
     )
-    frames = []
-    for path in data_paths:
-        data, sr = _load_signal(path, sampling_rate)
-        data = _bandpass(data, sr, band_low, band_high, order=int(cfg.get("bandpass_order", 4)))
-        features = extract_entropy_features(data, sr, window_cfg)
-        features.insert(0, "source_file", path.name)
-        label = _infer_label(path, cfg)
-        if label is not None:
-            features["label"] = label
-        frames.append(features)
+
+
+def _blockwise_features(path: Path, cfg: dict) -> pd.DataFrame:
+    """Entropy features of one file, evaluated block by block from its memory map.
+
+    Peak memory is bounded by ``block_seconds`` of samples plus one window; the
+    trace is never copied as a whole. Band-pass, detrending and z-scoring need
+    ``preprocessing: causal`` in this mode.
+    """
+
+    data, sr = _load_signal(
+        path,
+        float(cfg["sampling_rate_hz"]),
+        mapped=True,
+        cache_dir=_text_cache_dir(cfg),
+    )
+    preprocessor = None
+    if _preprocessing_mode(cfg) == "causal":
+        preprocessor = _streaming_preprocessor(cfg, sr)
+    elif any(cfg.get(key) for key in ("bandpass_low", "bandpass_high", "detrend", "zscore")):
+        raise ValueError(
+            "block_seconds with band-pass, detrend or zscore needs preprocessing: causal"
+        )
+    window_cfg = _window_config(cfg)
+    block_samples = max(int(float(cfg["block_seconds"]) * sr), 1)
+    blocks = list(iter_entropy_blocks(data, sr, window_cfg, block_samples, preprocessor))
+    if not blocks:
+        return pd.DataFrame(extract_entropy_columns(data[:0], sr, window_cfg))
+    return pd.DataFrame({name: np.concatenate([b[name] for b in blocks]) for name in blocks[0]})
+
+
+def _assemble_dataset(
+    frames: list[pd.DataFrame], output_path: Path, cfg: dict
+) -> pd.DataFrame:
+    """Concatenate per-file tables, apply the label shift and save the table.
+
+    The format follows ``output_format`` or the suffix of ``output_path`` (see
+    :func:`pevolc.io.write_feature_table`); ``csv_export_path`` additionally
+    writes a CSV copy.
+    """
+
+    label_shift = int(cfg.get("label_shift_windows", 0))
     dataset = pd.concat(frames, ignore_index=True)
     if label_shift != 0 and "label" in dataset.columns:
         shifted = []
@@ -98,20 +224,199 @@ def compute_entropy_dataset(
             shifted_group["label"] = shifted_group["label"].shift(-label_shift).bfill().ffill()
             shifted.append(shifted_group)
         dataset = pd.concat(shifted, ignore_index=True)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    dataset.to_csv(output_path, index=False)
+    partition_seconds = cfg.get("time_partition_seconds")
+    write_feature_table(
+        dataset,
+        output_path,
+        cfg.get("output_format"),
+        time_partition_seconds=None if partition_seconds is None else float(partition_seconds),
+    )
+    if cfg.get("csv_export_path"):
+        write_feature_table(dataset, Path(cfg["csv_export_path"]), "csv")
     return dataset
 
 
-def run_from_config(config_path: Path) -> pd.DataFrame:
-    """Load YAML config and run the entropy computation pipeline."""
+def _with_source(features: pd.DataFrame, path: Path, cfg: dict) -> pd.DataFrame:
+    features.insert(0, "source_file", path.name)
+    label = _infer_label(path, cfg)
+    if label is not None:
+        features["label"] = label
+    return features
+
+
+def _featurize_file(
+    path: Path,
+    cfg: dict,
+    orders: Sequence[int] | None = None,
+    delays: Sequence[int] | None = None,
+) -> pd.DataFrame:
+    """Feature table of one file; a sweep table when ``orders``/``delays`` are given.
+
+    Module-level so that process-pool workers can unpickle it. The table holds
+    the numeric feature columns only; :func:`_with_source` adds the file name
+    and label.
+    """
+
+    if orders is None and cfg.get("block_seconds") is not None:
+        return _blockwise_features(path, cfg)
+    window_cfg = _window_config(cfg)
+    data, sr = _prepared_signal(path, cfg)
+    if orders is None:
+        return extract_entropy_features(data, sr, window_cfg)
+    return extract_sweep_features(data, sr, window_cfg, orders, delays)
+
+
+def _executor_settings(cfg: dict) -> tuple[str, int | None]:
+    """Resolve the ``executor``/``n_workers`` config keys.
+
+    ``n_workers > 1`` implies the process pool; ``executor: process`` without
+    ``n_workers`` uses one worker per CPU.
+    """
+
+    n_workers = cfg.get("n_workers")
+    n_workers = None if n_workers is None else int(n_workers)
+    default = "process" if n_workers is not None and n_workers > 1 else "serial"
+    executor = str(cfg.get("executor", default))
+    if executor not in _EXECUTORS:
+        raise ValueError(f"Unknown executor '{executor}'")
+    if n_workers is not None and n_workers < 1:
+        raise ValueError("n_workers must be >= 1")
+    return executor, n_workers
+
+
+def _featurize_files(
+    paths: Sequence[Path],
+    cfg: dict,
+    orders: Sequence[int] | None = None,
+    delays: Sequence[int] | None = None,
+    cache: FeatureCache | None = None,
+) -> tuple[list[pd.DataFrame], dict[str, str]]:
+    """Featurize every path serially or on a process pool.
+
+    Frames are returned in input order whatever the completion order. In the
+    serial mode errors propagate as before; with the process pool a failing file
+    is logged and reported in the returned ``{path: error}`` mapping while the
+    remaining files continue. With a ``cache`` only the files without an entry
+    are computed; their tables are stored before the source columns are added.
+    """
+
+    executor, n_workers = _executor_settings(cfg)
+    tables: dict[int, pd.DataFrame] = {}
+    keys: dict[int, str] = {}
+    if cache is not None:
+        params = feature_params(cfg, orders, delays)
+        for i, path in enumerate(paths):
+            keys[i] = cache.key(path, params)
+            cached = cache.get(keys[i])
+            if cached is not None:
+                tables[i] = cached
+    pending = [i for i in range(len(paths)) if i not in tables]
+
+    failures: dict[str, str] = {}
+    if executor == "serial":
+        for i in pending:
+            tables[i] = _featurize_file(paths[i], cfg, orders, delays)
+            if cache is not None:
+                cache.put(keys[i], tables[i])
+    elif pending:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = {
+                i: pool.submit(_featurize_file, paths[i], cfg, orders, delays) for i in pending
+            }
+            for i, future in futures.items():
+                try:
+                    tables[i] = future.result()
+                except Exception as exc:
+                    failures[str(paths[i])] = f"{type(exc).__name__}: {exc}"
+                    logger.warning("Feature extraction failed for %s: %s", paths[i], exc)
+                    continue
+                if cache is not None:
+                    cache.put(keys[i], tables[i])
+    if not tables:
+        raise RuntimeError(f"Feature extraction failed for every file: {failures}")
+    frames = [_with_source(tables[i], paths[i], cfg) for i in sorted(tables)]
+    return frames, failures
+
+
+def _build_dataset(
+    data_paths: Iterable[Path],
+    output_path: Path,
+    cfg: dict,
+    orders: Sequence[int] | None = None,
+    delays: Sequence[int] | None = None,
+) -> pd.DataFrame:
+    # Fail on an unknown output format before any file is processed.
+    table_format(Path(output_path), cfg.get("output_format"))
+    cache = FeatureCache.from_config(cfg)
+    frames, failures = _featurize_files(list(data_paths), cfg, orders, delays, cache)
+    dataset = _assemble_dataset(frames, output_path, cfg)
+    dataset.attrs["failed_files"] = failures
+    if cache is not None:
+        cache.evict()
+        dataset.attrs["cache_stats"] = cache.stats
+        logger.info(
+            "Feature cache %s: %d hits, %d misses, %d evicted",
+            cache.directory,
+            cache.hits,
+            cache.misses,
+            cache.evicted,
+        )
+    return dataset
+
+
+def compute_entropy_dataset(
+    data_paths: Iterable[Path], output_path: Path, cfg: dict
+) -> pd.DataFrame:
+    """Compute permutation-entropy variants for provided data files and save results.
+
+    Files are processed serially by default. Set ``n_workers`` (and optionally
+    ``executor: process``) in ``cfg`` to farm them out to a process pool; rows
+    keep the order of ``data_paths`` and files that fail are skipped, logged and
+    listed in ``dataset.attrs["failed_files"]``.
+
+    With ``cache_dir`` set, per-file tables are reused from a
+    :class:`~pevolc.pipelines.cache.FeatureCache` when neither the file content
+    nor the feature parameters changed; ``cache_max_mb`` and
+    ``cache_max_age_days`` bound the cache, and the hit/miss counts are logged
+    and stored in ``dataset.attrs["cache_stats"]``.
+    """
+
+    return _build_dataset(data_paths, output_path, cfg)
+
+
+def compute_sweep_dataset(
+    data_paths: Iterable[Path],
+    output_path: Path,
+    cfg: dict,
+    orders: Sequence[int],
+    delays: Sequence[int],
+) -> pd.DataFrame:
+    """Compute a wide entropy table covering every (order, delay) pair and save it.
+
+    Each file is loaded and filtered once and evaluated with
+    :func:`pevolc.features.extract_sweep_features`; ``cfg["scales"]`` should be the
+    largest MPE scale of interest. Slice one configuration back out with
+    :func:`pevolc.features.select_sweep_columns`. Parallel execution and failure
+    reporting and caching follow :func:`compute_entropy_dataset`.
+    """
+
+    return _build_dataset(data_paths, output_path, cfg, orders, delays)
+
+
+def run_from_config(config_path: Path, n_workers: int | None = None) -> pd.DataFrame:
+    """Load YAML config and run the entropy computation pipeline.
+
+    ``n_workers`` overrides the ``n_workers`` key of the config.
+    """
 
     with open(config_path, "r", encoding="utf-8") as f:
         cfg = yaml.safe_load(f)
+    if n_workers is not None:
+        cfg["n_workers"] = n_workers
     data_glob = cfg.get("data_glob")
     if not data_glob:
         raise ValueError("Config must include data_glob")
-    paths = [Path(p) for p in glob.glob(data_glob)]
+    paths = [Path(p) for p in sorted(glob.glob(data_glob))]
     if not paths:
         raise FileNotFoundError(f"No files matched {data_glob}")
     output = Path(cfg.get("output_path", "data/processed/entropy_features.csv"))
@@ -0,0 +1,165 @@
+"""Time-series cross-validation with folds fitted in parallel processes.
+
+Rows are ordered by time and cut into ``n_folds + 1`` contiguous blocks. Fold
+``k`` validates on block ``k + 1`` and trains on
+
+* blocks ``0 .. k`` (``scheme="expanding"``), or
+* block ``k`` only (``scheme="blocked"``),
+
+optionally dropping the last ``gap`` training rows so that windows overlapping
+the validation block do not leak into training.
+
+Eruption labels cluster in time, so early folds often train on a single class.
+Such folds are not fitted: they are reported with NaN scores and the reason in
+their ``note`` and left out of the aggregate rows.
+
+The time-ordered feature matrix and labels are written once to ``.npy`` files
+in a temporary directory; each worker maps them read-only, so a fold only
+receives four row bounds instead of a pickled copy of the data.
+"""
+
+from __future__ import annotations
+
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import average_precision_score, roc_auc_score
+
+from pevolc.models import PermutationEntropyForecaster
+
+CV_SCHEMES = ("expanding", "blocked")
+_SCORE_COLUMNS = ("roc_auc", "pr_auc", "fit_time_s", "total_time_s")
+
+
+def time_series_folds(
+    n_rows: int, n_folds: int = 5, scheme: str = "expanding", gap: int = 0
+) -> list[tuple[int, int, int, int]]:
+    """Row bounds ``(train_start, train_stop, val_start, val_stop)`` of each fold.
+
+    Bounds index rows sorted by time.
+    """
+
+    if scheme not in CV_SCHEMES:
+        raise ValueError(f"Unknown cross-validation scheme '{scheme}'")
+    if n_folds < 1:
+        raise ValueError("n_folds must be >= 1")
+    edges = np.linspace(0, n_rows, n_folds + 2).astype(int)
+    folds = []
+    for k in range(n_folds):
+        train_start = 0 if scheme == "expanding" else int(edges[k])
+        train_stop = max(int(edges[k + 1]) - gap, train_start)
+        folds.append((train_start, train_stop, int(edges[k + 1]), int(edges[k + 2])))
+    return folds
+
+
+def _score(labels: np.ndarray, probs: np.ndarray, metric) -> float:
+    if len(np.unique(labels)) < 2:
+        # A validation block with a single class has no ROC/PR curve.
+        return float("nan")
+    return float(metric(labels, probs))
+
+
+def _fit_fold(
+    matrix_path: Path,
+    labels_path: Path,
+    model_type: str,
+    fold: int,
+    bounds: tuple[int, int, int, int],
+) -> dict:
+    """Fit and score one fold on the memory-mapped matrix.
+
+    Module-level so that process-pool workers can unpickle it.
+    """
+
+    start = time.perf_counter()
+    X = np.load(matrix_path, mmap_mode="r")
+    y = np.load(labels_path, mmap_mode="r")
+    train_start, train_stop, val_start, val_stop = bounds
+    row = {"fold": fold, "n_train": train_stop - train_start, "n_val": val_stop - val_start}
+    counts = np.bincount(np.asarray(y[train_start:train_stop]), minlength=2)
+    if np.count_nonzero(counts) < 2 or counts[counts > 0].min() < 2:
+        # Fitting (and its stratified calibration split) needs two rows of each class.
+        nan = float("nan")
+        note = f"skipped: training class counts {counts.tolist()}"
+        return row | dict.fromkeys(_SCORE_COLUMNS, nan) | {"note": note}
+    forecaster = PermutationEntropyForecaster(model_type=model_type, calibrate=True)
+    forecaster.fit(X[train_start:train_stop], y[train_start:train_stop])
+    fit_time = time.perf_counter() - start
+    y_val = np.asarray(y[val_start:val_stop])
+    probs = forecaster.predict_proba(X[val_start:val_stop])
+    return row | {
+        "roc_auc": _score(y_val, probs, roc_auc_score),
+        "pr_auc": _score(y_val, probs, average_precision_score),
+        "fit_time_s": fit_time,
+        "total_time_s": time.perf_counter() - start,
+        "note": "" if len(np.unique(y_val)) > 1 else "validation block has a single class",
+    }
+
+
+def cross_validate_time_series(
+    features: pd.DataFrame | np.ndarray,
+    labels: Sequence[int],
+    times: Sequence[float],
+    model_type: str = "logreg",
+    n_folds: int = 5,
+    scheme: str = "expanding",
+    gap: int = 0,
+    n_workers: int | None = 1,
+) -> pd.DataFrame:
+    """Blocked or expanding-window cross-validation of a forecaster.
+
+    Parameters
+    ----------
+    features, labels, times:
+        Feature matrix, binary labels and the time of each row.
+    model_type:
+        Any :class:`~pevolc.models.PermutationEntropyForecaster` model type.
+    n_folds, scheme, gap:
+        Fold layout, see :func:`time_series_folds`.
+    n_workers:
+        Worker processes fitting folds concurrently (``None``: one per CPU);
+        ``1`` fits them in this process.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per fold (``fold``, ``n_train``, ``n_val``, ``roc_auc``,
+        ``pr_auc``, ``fit_time_s``, ``total_time_s``, ``note``) followed by
+        ``mean`` and ``std`` rows aggregating the folds (NaN scores, including
+        those of skipped single-class folds, are ignored).
+    """
+
+    order = np.argsort(np.asarray(times, dtype=float), kind="stable")
+    X = np.asarray(features, dtype=float)[order]
+    y = np.asarray(labels, dtype=int)[order]
+    folds = time_series_folds(len(y), n_folds, scheme, gap)
+
+    with tempfile.TemporaryDirectory(prefix="pevolc_cv_") as tmp:
+        matrix_path, labels_path = Path(tmp) / "features.npy", Path(tmp) / "labels.npy"
+        np.save(matrix_path, X)
+        np.save(labels_path, y)
+        del X
+        if n_workers == 1:
+            rows = [
+                _fit_fold(matrix_path, labels_path, model_type, k, bounds)
+                for k, bounds in enumerate(folds)
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                futures = [
+                    pool.submit(_fit_fold, matrix_path, labels_path, model_type, k, bounds)
+                    for k, bounds in enumerate(folds)
+                ]
+                rows = [future.result() for future in futures]
+
+    results = pd.DataFrame(rows)
+    summary = results.drop(columns=["fold", "note"]).agg(["mean", "std"])
+    summary.insert(0, "fold", summary.index)
+    skipped = int(results["note"].str.startswith("skipped").sum())
+    summary["note"] = f"{skipped} of {len(results)} folds skipped" if skipped else ""
+    return pd.concat([results.astype({"fold": object}), summary], ignore_index=True)
@@ -0,0 +1,313 @@
+"""Dependency-graph planner for entropy/model parameter grids.
+
+A grid over embedding orders, delays, MPE scales and model types expands into
+three kinds of tasks:
+
+* one ``sweep`` task computing the wide table of every (order, delay) pair with
+  :func:`~pevolc.pipelines.compute_entropy.compute_sweep_dataset`;
+* one ``features`` task per (order, delay, scales), slicing its columns out of
+  the sweep, shared by every model type;
+* one ``train`` task per feature configuration and model type.
+
+A task runs as soon as its dependencies are done, and ready tasks run
+concurrently on a process pool whose workers are replaced after every task
+(``max_tasks_per_child=1``), so the peak resident memory recorded for a task is
+its own. Outputs are moved into place atomically.
+
+Every task carries a fingerprint: a hash of the configuration its output depends
+on, including the fingerprints of its dependencies. The fingerprint is stored
+next to the output (``<output>.fingerprint``), and a task is skipped only when
+its output exists with a matching fingerprint. An interrupted grid therefore
+resumes where it stopped, while a change to ``base``, the grid axes, the split
+or a model type recomputes every affected task.
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+from pevolc.features import select_sweep_columns
+
+from .compute_entropy import compute_sweep_dataset
+from .train_forecaster import run_training
+
+try:  # pragma: no cover - resource is POSIX-only
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+TASK_KINDS = ("sweep", "features", "train")
+
+
+@dataclass
+class GridTask:
+    """One node of the grid graph; complete once ``output`` exists with ``fingerprint``."""
+
+    name: str
+    kind: str
+    output: Path
+    depends_on: tuple[str, ...] = ()
+    params: dict = field(default_factory=dict)
+    fingerprint: str = ""
+
+    @property
+    def fingerprint_path(self) -> Path:
+        return self.output.with_name(f"{self.output.name}.fingerprint")
+
+    def is_complete(self) -> bool:
+        """Whether the output exists and was produced by the current configuration."""
+
+        if not (self.output.exists() and self.fingerprint_path.exists()):
+            return False
+        return self.fingerprint_path.read_text(encoding="utf-8").strip() == self.fingerprint
+
+
+def _fingerprint(*parts: object) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _feature_name(order: int, delay: int, scales: int) -> str:
+    return f"m{order}_tau{delay}_s{scales}"
+
+
+def plan_grid(grid_cfg: dict, root: Path) -> list[GridTask]:
+    """Expand a grid config into tasks, listed in dependency order.
+
+    ``grid_cfg`` has the layout of ``configs/experiment_grid.yaml``: a ``base``
+    pipeline config plus ``orders``, ``delays``, ``scales`` and ``model_types``
+    lists. Training runs keep their historical names and directories
+    (``<root>/m3_tau1_s3_logreg``).
+    """
+
+    root = Path(root)
+    orders = grid_cfg.get("orders", [3])
+    delays = grid_cfg.get("delays", [1])
+    scales_list = grid_cfg.get("scales", [3])
+    model_types = grid_cfg.get("model_types", ["logreg"])
+    base = grid_cfg.get("base", {})
+
+    sweep = GridTask(
+        "sweep",
+        "sweep",
+        root / "sweep_features.csv",
+        fingerprint=_fingerprint("sweep", base, orders, delays, max(scales_list)),
+    )
+    tasks = [sweep]
+    trains = []
+    for order in orders:
+        for delay in delays:
+            for scales in scales_list:
+                name = _feature_name(order, delay, scales)
+                features = GridTask(
+                    f"features_{name}",
+                    "features",
+                    root / "features" / f"{name}.csv",
+                    (sweep.name,),
+                    {"order": order, "delay": delay, "scales": scales},
+                    _fingerprint("features", sweep.fingerprint, order, delay, scales),
+                )
+                tasks.append(features)
+                for model_type in model_types:
+                    run = f"{name}_{model_type}"
+                    trains.append(
+                        GridTask(
+                            run,
+                            "train",
+                            root / run / "run.json",
+                            (features.name,),
+                            {
+                                "order": order,
+                                "delay": delay,
+                                "scales": scales,
+                                "model_type": model_type,
+                                "features_path": str(features.output),
+                            },
+                            _fingerprint(
+                                "train",
+                                features.fingerprint,
+                                model_type,
+                                base.get("label_column", "label"),
+                                base.get("split"),
+                            ),
+                        )
+                    )
+    return tasks + trains
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}.{os.getpid()}.tmp{path.suffix}")
+
+
+def _run_sweep(task: GridTask, grid_cfg: dict) -> None:
+    base = grid_cfg.get("base", {})
+    data_glob = base.get("data_glob", "data/raw/*.npy")
+    paths = [Path(p) for p in sorted(glob.glob(data_glob))]
+    if not paths:
+        raise FileNotFoundError(f"No data files matched {data_glob}")
+    tmp = _tmp_path(task.output)
+    # The sweep is an intermediate CSV whatever output format the base config asks for.
+    sweep_cfg = base | {"output_format": "csv", "csv_export_path": None}
+    compute_sweep_dataset(
+        paths,
+        tmp,
+        sweep_cfg | {"scales": max(grid_cfg.get("scales", [3]))},
+        grid_cfg.get("orders", [3]),
+        grid_cfg.get("delays", [1]),
+    )
+    os.replace(tmp, task.output)
+
+
+def _run_features(task: GridTask, sweep_path: Path) -> None:
+    sweep = pd.read_csv(sweep_path)
+    task.output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp_path(task.output)
+    p = task.params
+    select_sweep_columns(sweep, p["order"], p["delay"], p["scales"]).to_csv(tmp, index=False)
+    os.replace(tmp, task.output)
+
+
+def _run_train(task: GridTask, grid_cfg: dict) -> dict:
+    base = grid_cfg.get("base", {})
+    run_dir = task.output.parent
+    run_dir.mkdir(parents=True, exist_ok=True)
+    train_cfg = {
+        "dataset_path": task.params["features_path"],
+        "label_column": base.get("label_column", "label"),
+        "feature_columns": None,
+        "model_type": task.params["model_type"],
+        "model_path": str(run_dir / "forecaster.joblib"),
+        "metrics_path": str(run_dir / "metrics.csv"),
+        "split": base.get("split", {"type": "time", "val_fraction": 0.2, "time_column": "start_s"}),
+    }
+    config_path = run_dir / "train_config.yaml"
+    with open(config_path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(train_cfg, f)
+    return run_training(config_path)
+
+
+def _execute(task: GridTask, grid_cfg: dict, root: Path) -> dict:
+    """Run one task in a worker and return its timing record.
+
+    Module-level so that process-pool workers can unpickle it.
+    """
+
+    start = time.perf_counter()
+    metrics: dict = {}
+    if task.kind == "sweep":
+        task.output.parent.mkdir(parents=True, exist_ok=True)
+        _run_sweep(task, grid_cfg)
+    elif task.kind == "features":
+        _run_features(task, Path(root) / "sweep_features.csv")
+    elif task.kind == "train":
+        metrics = _run_train(task, grid_cfg)
+    else:
+        raise ValueError(f"Unknown task kind '{task.kind}'")
+    record = {
+        "task": task.name,
+        "kind": task.kind,
+        "wall_time_s": time.perf_counter() - start,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    if task.kind == "train":
+        # run.json is written last: its presence marks a completed run.
+        record = {
+            "run": task.name,
+            **{k: task.params[k] for k in ("order", "delay", "scales", "model_type")},
+            **metrics,
+            "wall_time_s": record["wall_time_s"],
+            "peak_rss_mb": record["peak_rss_mb"],
+        }
+        tmp = _tmp_path(task.output)
+        tmp.write_text(json.dumps(record), encoding="utf-8")
+        os.replace(tmp, task.output)
+    tmp = _tmp_path(task.fingerprint_path)
+    tmp.write_text(task.fingerprint, encoding="utf-8")
+    os.replace(tmp, task.fingerprint_path)
+    return record
+
+
+def run_grid(
+    grid_cfg: dict,
+    root: Path = Path("experiments/grid"),
+    n_workers: int | None = None,
+    resume: bool = True,
+) -> pd.DataFrame:
+    """Run every task of the grid and write ``<root>/summary.csv``.
+
+    Parameters
+    ----------
+    grid_cfg:
+        Grid configuration (see :func:`plan_grid`).
+    root:
+        Output directory of the grid.
+    n_workers:
+        Size of the process pool (default: one worker per CPU).
+    resume:
+        Skip tasks whose outputs exist with the current configuration's
+        fingerprint. With ``False`` every task reruns.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per training run with its parameters, metrics, ``wall_time_s``
+        and ``peak_rss_mb`` (peak resident memory of the worker, ``NaN`` where
+        unavailable) and ``status`` (``"computed"`` or ``"resumed"``).
+    """
+
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    tasks = plan_grid(grid_cfg, root)
+    done = {task.name for task in tasks if resume and task.is_complete()}
+    resumed = set(done)
+    pending = [task for task in tasks if task.name not in done]
+    logger.info("Grid: %d tasks, %d already complete", len(tasks), len(done))
+
+    with ProcessPoolExecutor(max_workers=n_workers, max_tasks_per_child=1) as pool:
+        running = {}
+        while pending or running:
+            ready = [task for task in pending if set(task.depends_on) <= done]
+            for task in ready:
+                pending.remove(task)
+                running[pool.submit(_execute, task, grid_cfg, root)] = task
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                task = running.pop(future)
+                record = future.result()
+                done.add(task.name)
+                logger.info(
+                    "Grid task %s finished in %.1f s", task.name, record["wall_time_s"]
+                )
+
+    rows = []
+    for task in tasks:
+        if task.kind != "train":
+            continue
+        row = json.loads(task.output.read_text(encoding="utf-8"))
+        row["status"] = "resumed" if task.name in resumed else "computed"
+        rows.append(row)
+    summary = pd.DataFrame(rows)
+    summary.to_csv(root / "summary.csv", index=False)
+    return summary
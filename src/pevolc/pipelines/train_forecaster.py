@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import os
+from functools import partial
 from pathlib import Path
-from typing import Sequence
+from typing import Iterator, Sequence
 
 import joblib
 import matplotlib.pyplot as plt
@@ -11,8 +13,13 @@ import numpy as np
 import pandas as pd
 import yaml
 from sklearn.metrics import average_precision_score, precision_recall_curve, roc_auc_score
+from sklearn.model_selection import train_test_split
 
-from pevolc.models import PermutationEntropyForecaster
+from pevolc.compiled import save_compiled
+from pevolc.io import read_feature_chunks, read_feature_table
+from pevolc.models import INCREMENTAL_MODEL_TYPES, PermutationEntropyForecaster
+
+from .cross_validation import cross_validate_time_series
 
 
 def _select_features(df: pd.DataFrame, feature_columns: Sequence[str] | None, label_column: str) -> pd.DataFrame:
@@ -28,49 +35,222 @@ def _time_split(df: pd.DataFrame, val_fraction: float, time_column: str) -> tupl
     return sorted_df.iloc[:split_idx], sorted_df.iloc[split_idx:]
 
 
-def run_training(config_path: Path) -> dict:
-    """Run the full training workflow using the provided config file."""
+def _load_dataset(
+    dataset_path: Path,
+    cfg: dict,
+    feature_columns: Sequence[str] | None,
+    label_column: str,
+    split_cfg: dict,
+) -> pd.DataFrame:
+    """Read only the columns and rows training needs.
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        cfg = yaml.safe_load(f)
+    With explicit ``feature_columns`` just those, the label and the split time
+    column are loaded; ``time_range: [start, stop]`` keeps the rows with
+    ``start <= start_s < stop``. ``dataset_format`` overrides the format inferred
+    from the file suffix.
+    """
+
+    columns = None
+    if feature_columns is not None:
+        columns = [*feature_columns, label_column]
+        if split_cfg.get("type", "random") in ("time", "cv"):
+            columns.append(split_cfg.get("time_column", "start_s"))
+    time_range = cfg.get("time_range")
+    return read_feature_table(
+        dataset_path,
+        columns=columns,
+        time_range=None if time_range is None else tuple(time_range),
+        fmt=cfg.get("dataset_format"),
+    )
+
+
+def _check_class_counts(labels: pd.Series, rows: str) -> None:
+    """Stratified splits need at least two rows of each class."""
+
+    counts = labels.value_counts()
+    if len(counts) < 2 or counts.min() < 2:
+        raise ValueError(
+            f"The random split needs at least two {rows} of each class, got "
+            f"{counts.to_dict()}; add labelled windows or use split type 'time'"
+        )
+
+
+def _fit_in_memory(
+    cfg: dict,
+    df: pd.DataFrame,
+    feature_columns: Sequence[str] | None,
+    label_column: str,
+    split_cfg: dict,
+) -> tuple[PermutationEntropyForecaster, np.ndarray, pd.Series]:
+    """Split the loaded dataset and fit; returns the model and validation scores."""
 
-    dataset_path = Path(cfg["dataset_path"])
-    df = pd.read_csv(dataset_path)
-    label_column = cfg.get("label_column", "label")
-    if label_column not in df.columns:
-        raise ValueError(f"Label column '{label_column}' not found in dataset")
-    feature_columns = cfg.get("feature_columns")
     # Split strategy
-    split_cfg = cfg.get("split", {"type": "random", "val_fraction": 0.2})
     val_fraction = float(split_cfg.get("val_fraction", 0.2))
-    if split_cfg.get("type", "random") == "time":
+    if split_cfg.get("type", "random") in ("time", "cv"):
         time_col = split_cfg.get("time_column", "start_s")
         if time_col not in df.columns:
             raise ValueError(f"time_column '{time_col}' not found in dataset")
         train_df, val_df = _time_split(df, val_fraction, time_col)
-        X_train = _select_features(train_df, feature_columns, label_column)
-        y_train = train_df[label_column].astype(int)
-        X_val = _select_features(val_df, feature_columns, label_column)
-        y_val = val_df[label_column].astype(int)
     else:
-        X_all = _select_features(df, feature_columns, label_column)
-        y_all = df[label_column].astype(int)
-        # Forecaster handles calibration split internally; validation uses full set
-        X_train, y_train = X_all, y_all
-        X_val, y_val = X_all, y_all
+        # Held-out rows; the forecaster splits its calibration set off the training rows.
+        _check_class_counts(df[label_column], "rows")
+        train_df, val_df = train_test_split(
+            df, test_size=val_fraction, random_state=42, stratify=df[label_column]
+        )
+        _check_class_counts(train_df[label_column], "training rows")
+    X_train = _select_features(train_df, feature_columns, label_column)
+    y_train = train_df[label_column].astype(int)
+    X_val = _select_features(val_df, feature_columns, label_column)
+    y_val = val_df[label_column].astype(int)
 
     model_type = cfg.get("model_type", "logreg")
     forecaster = PermutationEntropyForecaster(model_type=model_type, calibrate=True)
     forecaster.fit(X_train, y_train)
+    return forecaster, forecaster.predict_proba(X_val), y_val
+
+
+def _fit_incremental(
+    cfg: dict,
+    dataset_path: Path,
+    feature_columns: Sequence[str] | None,
+    label_column: str,
+    split_cfg: dict,
+) -> tuple[PermutationEntropyForecaster, np.ndarray, np.ndarray]:
+    """Fit an incremental model while streaming the dataset in ``chunk_rows`` chunks.
 
-    probs = forecaster.predict_proba(X_val)
+    Only one chunk is in memory at a time (plus the validation scores). The
+    time split holds out rows with ``time_column >= t_min + (1 - val_fraction) *
+    (t_max - t_min)``; the random split holds out a seeded random
+    ``val_fraction`` of the rows.
+    """
+
+    time_range = cfg.get("time_range")
+    read = partial(
+        read_feature_chunks,
+        dataset_path,
+        time_range=None if time_range is None else tuple(time_range),
+        fmt=cfg.get("dataset_format"),
+        chunk_rows=int(cfg.get("chunk_rows", 100_000)),
+    )
+    val_fraction = float(split_cfg.get("val_fraction", 0.2))
+    time_col = None
+    if split_cfg.get("type", "random") == "time":
+        time_col = split_cfg.get("time_column", "start_s")
+    if feature_columns is None:
+        first = next(read(), None)
+        if first is None:
+            raise ValueError(f"Dataset {dataset_path} has no rows")
+        if label_column not in first.columns:
+            raise ValueError(f"Label column '{label_column}' not found in dataset")
+        feature_columns = list(_select_features(first, None, label_column).columns)
+    columns = [*feature_columns, label_column]
+    if time_col is not None:
+        columns.append(time_col)
+        t_min, t_max = np.inf, -np.inf
+        for chunk in read(columns=[time_col]):
+            t_min = min(t_min, float(chunk[time_col].min()))
+            t_max = max(t_max, float(chunk[time_col].max()))
+        cutoff = t_min + (1 - val_fraction) * (t_max - t_min)
+
+    def split_chunks() -> Iterator[tuple[pd.DataFrame, np.ndarray]]:
+        # Fresh generator per pass: the random split is identical on every pass.
+        rng = np.random.default_rng(0)
+        for chunk in read(columns=columns):
+            if time_col is not None:
+                val = chunk[time_col].to_numpy() >= cutoff
+            else:
+                val = rng.random(len(chunk)) < val_fraction
+            yield chunk, val
+
+    def train_chunks() -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        for chunk, val in split_chunks():
+            train = chunk[~val]
+            yield train[feature_columns].to_numpy(float), train[label_column].to_numpy(int)
+
+    forecaster = PermutationEntropyForecaster(model_type=cfg["model_type"], calibrate=True)
+    forecaster.fit_stream(
+        train_chunks,
+        epochs=int(cfg.get("epochs", 5)),
+        calibration_fraction=float(cfg.get("calibration_fraction", 0.2)),
+    )
+    probs, labels = [], []
+    for chunk, val in split_chunks():
+        if val.any():
+            probs.append(forecaster.predict_proba(chunk.loc[val, feature_columns]))
+            labels.append(chunk.loc[val, label_column].to_numpy(int))
+    if not probs:
+        raise ValueError("Validation split is empty")
+    return forecaster, np.concatenate(probs), np.concatenate(labels)
+
+
+def _cross_validate(
+    cfg: dict,
+    df: pd.DataFrame,
+    feature_columns: Sequence[str] | None,
+    label_column: str,
+    split_cfg: dict,
+) -> pd.DataFrame:
+    """Time-series cross-validation configured by the ``split`` section."""
+
+    time_col = split_cfg.get("time_column", "start_s")
+    n_workers = split_cfg.get("n_workers", 1)
+    return cross_validate_time_series(
+        _select_features(df, feature_columns, label_column),
+        df[label_column].astype(int),
+        df[time_col],
+        model_type=cfg.get("model_type", "logreg"),
+        n_folds=int(split_cfg.get("n_folds", 5)),
+        scheme=str(split_cfg.get("scheme", "expanding")),
+        gap=int(split_cfg.get("gap", 0)),
+        n_workers=None if n_workers is None else int(n_workers),
+    )
+
+
+def run_training(config_path: Path) -> dict:
+    """Run the full training workflow using the provided config file.
+
+    ``model_type: sgd`` selects out-of-core training: the dataset is streamed
+    in chunks through :meth:`PermutationEntropyForecaster.fit_stream` instead
+    of being loaded at once. ``split: {type: cv}`` additionally runs time-series
+    cross-validation (see :mod:`pevolc.pipelines.cross_validation`) and writes
+    the per-fold and aggregated scores to ``cv_path``; the saved model and its
+    metrics then use a time split.
+    """
+
+    with open(config_path, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+
+    dataset_path = Path(cfg["dataset_path"])
+    label_column = cfg.get("label_column", "label")
+    feature_columns = cfg.get("feature_columns")
+    split_cfg = cfg.get("split", {"type": "random", "val_fraction": 0.2})
+    incremental = cfg.get("model_type") in INCREMENTAL_MODEL_TYPES
+    if incremental and split_cfg.get("type") == "cv":
+        raise ValueError("split type 'cv' is not supported for incremental model types")
+    if incremental:
+        forecaster, probs, y_val = _fit_incremental(
+            cfg, dataset_path, feature_columns, label_column, split_cfg
+        )
+    else:
+        df = _load_dataset(dataset_path, cfg, feature_columns, label_column, split_cfg)
+        if label_column not in df.columns:
+            raise ValueError(f"Label column '{label_column}' not found in dataset")
+        forecaster, probs, y_val = _fit_in_memory(
+            cfg, df, feature_columns, label_column, split_cfg
+        )
     metrics = {
         "roc_auc": float(roc_auc_score(y_val, probs)),
         "pr_auc": float(average_precision_score(y_val, probs)),
     }
-    precision, recall, thresholds = precision_recall_curve(y_val, probs)
     eval_path = Path(cfg.get("metrics_path", "experiments/last_run/metrics.csv"))
     eval_path.parent.mkdir(parents=True, exist_ok=True)
+    if split_cfg.get("type") == "cv":
+        folds = _cross_validate(cfg, df, feature_columns, label_column, split_cfg)
+        cv_path = Path(cfg.get("cv_path", eval_path.parent / "cv_folds.csv"))
+        folds.to_csv(cv_path, index=False)
+        mean = folds.set_index("fold").loc["mean"]
+        metrics.update({"cv_roc_auc": float(mean["roc_auc"]), "cv_pr_auc": float(mean["pr_auc"])})
+    precision, recall, thresholds = precision_recall_curve(y_val, probs)
     fig_dir = eval_path.parent / "figures"
     fig_dir.mkdir(parents=True, exist_ok=True)
     pd.DataFrame({"precision": precision[:-1], "recall": recall[:-1], "threshold": thresholds}).to_csv(
@@ -86,13 +266,21 @@ def run_training(config_path: Path) -> dict:
 
     model_path = Path(cfg.get("model_path", "experiments/last_run/forecaster.joblib"))
     model_path.parent.mkdir(parents=True, exist_ok=True)
-    joblib.dump(forecaster, model_path)
+    # Atomic replace: a running scoring server never loads a half-written model.
+    tmp_model_path = model_path.with_name(f"{model_path.name}.{os.getpid()}.tmp")
+    joblib.dump(forecaster, tmp_model_path)
+    os.replace(tmp_model_path, model_path)
+    result = {"model_path": str(model_path)}
+    # NumPy-only copy of the model for hosts that score without scikit-learn.
+    compiled_path = cfg.get("compiled_path", str(model_path.with_suffix(".npz")))
+    if compiled_path is not None:
+        result["compiled_path"] = str(save_compiled(forecaster, Path(compiled_path)))
 
     # Alert thresholds table
     thresholds_table = _alert_threshold_table(probs, y_val)
     thresholds_table.to_csv(fig_dir / "alert_thresholds.csv", index=False)
 
-    return {"model_path": str(model_path), "metrics_path": str(eval_path), **metrics}
+    return {**result, "metrics_path": str(eval_path), **metrics}
 
 
 def _reliability_curve(y_true, y_prob, bins=10):
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from pevolc.models import AlertPolicy, alert_codes, apply_alert_rules, load_alert_thresholds
+
+
+def _reference(probs, low, high, hysteresis, min_dwell):
+    """Plain loop implementation of hysteresis and causal minimum dwell."""
+
+    yellow = red = False
+    reported, candidate, held = 0, 0, 0
+    out = []
+    for p in probs:
+        yellow = p >= low or (yellow and p >= low - hysteresis)
+        red = p >= high or (red and p >= high - hysteresis)
+        level = 2 if red else int(yellow)
+        held = held + 1 if level == candidate else 1
+        candidate = level
+        if held >= min_dwell:
+            reported = level
+        out.append(reported)
+    return np.array(out)
+
+
+def test_alert_codes_match_thresholds():
+    probs = np.array([0.1, 0.33, 0.5, 0.66, 0.9])
+    np.testing.assert_array_equal(alert_codes(probs), [0, 1, 1, 2, 2])
+
+
+def test_rules_match_reference_loop():
+    rng = np.random.default_rng(0)
+    probs = np.clip(np.cumsum(rng.normal(scale=0.08, size=2000)) % 1.0, 0, 1)
+    for hysteresis, dwell in [(0.0, 1), (0.05, 1), (0.0, 4), (0.1, 3)]:
+        expected = _reference(probs, 0.33, 0.66, hysteresis, dwell)
+        codes = apply_alert_rules(probs, 0.33, 0.66, hysteresis, dwell)
+        np.testing.assert_array_equal(codes, expected)
+
+
+def test_policy_per_station_thresholds(tmp_path):
+    pd.DataFrame(
+        {"station": ["A", "default"], "low": [0.5, 0.2], "high": [0.9, 0.4], "min_dwell": [2, None]}
+    ).to_csv(tmp_path / "thresholds.csv", index=False)
+    policy = AlertPolicy(load_alert_thresholds(tmp_path / "thresholds.csv"))
+    stations = np.array(["B", "A", "A", "B", "A"])
+    times = np.array([1.0, 2.0, 0.0, 0.0, 1.0])
+    probs = np.array([0.3, 0.6, 0.6, 0.5, 0.6])
+    levels = policy.evaluate(probs, stations, times)
+    # A (time order 0, 1, 2): yellow only once it held for two windows.
+    # B (time order 0, 1): red then yellow with the default row.
+    assert list(levels) == ["yellow", "yellow", "green", "red", "yellow"]
+    assert levels.codes.dtype == np.int8
+
+
+def test_thresholds_from_training_table(tmp_path):
+    pd.DataFrame(
+        {"threshold": [0.1, 0.4, 0.7], "precision": [0.5, 0.7, 0.9], "recall": [1.0, 0.95, 0.5]}
+    ).to_csv(tmp_path / "alert_thresholds.csv", index=False)
+    table = load_alert_thresholds(tmp_path / "alert_thresholds.csv")
+    assert table.loc["default", "low"] == 0.4 and table.loc["default", "high"] == 0.7
@@ -0,0 +1,54 @@
+import numpy as np
+
+from pevolc.entropy import batch, mpe, pe, wpe
+from pevolc.features import WindowConfig, extract_entropy_features
+from pevolc.features.plan import FeaturePlan
+
+
+def test_batch_functions_match_row_by_row():
+    rng = np.random.default_rng(11)
+    signals = np.round(rng.normal(size=(6, 240)), 1)
+    signals[0] = 1.0  # constant row
+    np.testing.assert_allclose(
+        batch.compute_pe_batch(signals, order=4, delay=2, base=2),
+        [pe.compute_pe(row, order=4, delay=2, base=2) for row in signals],
+        atol=1e-12,
+    )
+    np.testing.assert_allclose(
+        batch.compute_wpe_batch(signals, order=3, weight_strategy="energy"),
+        [wpe.compute_wpe(row, order=3, weight_strategy="energy") for row in signals],
+        atol=1e-12,
+    )
+    np.testing.assert_allclose(
+        batch.compute_mpe_batch(signals, scales=[1, 3], order=3),
+        [mpe.compute_mpe(row, scales=[1, 3], order=3) for row in signals],
+        atol=1e-12,
+    )
+    # order 8 (40320 patterns) over ~230 windows per row takes the sparse path.
+    np.testing.assert_allclose(
+        batch.compute_wpe_batch(signals, order=8),
+        [wpe.compute_wpe(row, order=8) for row in signals],
+        atol=1e-12,
+    )
+
+
+def test_batch_engine_matches_window_engine():
+    sampling_rate = 20.0
+    signal = np.random.default_rng(2).normal(size=1200)
+    base_cfg = dict(window_seconds=5.0, step_seconds=2.0, order=3, scales=3)
+    expected = extract_entropy_features(signal, sampling_rate, WindowConfig(**base_cfg))
+    df = extract_entropy_features(signal, sampling_rate, WindowConfig(**base_cfg, engine="batch"))
+    assert list(df.columns) == list(expected.columns)
+    np.testing.assert_allclose(df.to_numpy(), expected.to_numpy(), atol=1e-12)
+
+
+def test_batch_engine_skips_per_window_plan(monkeypatch):
+    def per_window(*args, **kwargs):
+        raise AssertionError("batch engine fell back to per-window evaluation")
+
+    monkeypatch.setattr(FeaturePlan, "evaluate", per_window)
+    signal = np.random.default_rng(3).normal(size=1200)
+    for scales in (1, 3):
+        cfg = WindowConfig(window_seconds=5.0, step_seconds=2.0, scales=scales, engine="batch")
+        df = extract_entropy_features(signal, 20.0, cfg)
+        np.testing.assert_array_equal(df["mpe_scale_1"], df["pe"])
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from pevolc.compiled import compile_forecaster, load_compiled, save_compiled
+from pevolc.models import PermutationEntropyForecaster
+
+
+@pytest.mark.parametrize("model_type", ["logreg", "sgd", "random_forest", "gradient_boosting"])
+def test_compiled_matches_forecaster(tmp_path, model_type):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 3))
+    y = (X[:, 0] - 0.5 * X[:, 2] + rng.normal(scale=0.5, size=400) > 0).astype(int)
+    forecaster = PermutationEntropyForecaster(model_type=model_type).fit(X, y)
+    compiled = load_compiled(save_compiled(forecaster, tmp_path / "model.npz"))
+    X_new = rng.normal(size=(5000, 3))
+    np.testing.assert_allclose(
+        compiled.predict_proba(X_new), forecaster.predict_proba(X_new), rtol=1e-6, atol=1e-9
+    )
+
+
+def test_compiled_uncalibrated_and_no_sklearn(tmp_path):
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(200, 2))
+    y = (X[:, 1] > 0).astype(int)
+    forecaster = PermutationEntropyForecaster(calibrate=False).fit(X, y)
+    assert "platt" not in compile_forecaster(forecaster)
+    path = save_compiled(forecaster, tmp_path / "model.npz")
+    code = (
+        "import sys; from pevolc.compiled import load_compiled; "
+        f"load_compiled({str(path)!r}).predict_proba([[0.0, 1.0]]); "
+        "assert not any(m.startswith('sklearn') for m in sys.modules)"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from pevolc.pipelines import train_forecaster
+from pevolc.pipelines.cross_validation import cross_validate_time_series, time_series_folds
+
+
+def test_fold_layouts():
+    assert time_series_folds(12, n_folds=3) == [(0, 3, 3, 6), (0, 6, 6, 9), (0, 9, 9, 12)]
+    assert time_series_folds(12, n_folds=3, scheme="blocked", gap=1)[1] == (3, 5, 6, 9)
+    with pytest.raises(ValueError):
+        time_series_folds(12, scheme="rolling")
+
+
+def test_parallel_folds_match_serial():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 3))
+    y = (X[:, 0] + rng.normal(scale=0.5, size=600) > 0).astype(int)
+    times = rng.permutation(600).astype(float)
+    serial = cross_validate_time_series(X, y, times, n_folds=3)
+    parallel = cross_validate_time_series(X, y, times, n_folds=3, n_workers=2)
+    assert list(serial["fold"]) == [0, 1, 2, "mean", "std"]
+    pd.testing.assert_series_equal(serial["roc_auc"], parallel["roc_auc"])
+    assert serial.loc[3, "roc_auc"] > 0.8 and (serial["fit_time_s"] > 0).all()
+
+
+def test_training_cv_mode(tmp_path):
+    rng = np.random.default_rng(1)
+    n = 300
+    pe_feature = rng.normal(size=n)
+    label = (pe_feature > 0).astype(int)
+    df = pd.DataFrame({"start_s": np.arange(n) * 5.0, "pe": pe_feature, "label": label})
+    df.to_csv(tmp_path / "dataset.csv", index=False)
+    cfg = {
+        "dataset_path": str(tmp_path / "dataset.csv"),
+        "feature_columns": ["pe"],
+        "split": {"type": "cv", "n_folds": 3, "time_column": "start_s"},
+        "model_path": str(tmp_path / "model.joblib"),
+        "metrics_path": str(tmp_path / "metrics.csv"),
+    }
+    (tmp_path / "config.yaml").write_text(yaml.safe_dump(cfg))
+    result = train_forecaster.run_training(tmp_path / "config.yaml")
+    assert result["cv_roc_auc"] > 0.9
+    assert len(pd.read_csv(tmp_path / "cv_folds.csv")) == 5
+
+
+def test_single_class_folds_are_reported_not_fatal():
+    # Positives cluster at the end of the record, as eruptions do.
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(1000, 2))
+    y = (np.arange(1000) >= 700).astype(int)
+    X[:, 0] += y
+    folds = cross_validate_time_series(X, y, np.arange(1000.0), n_folds=5)
+    skipped = folds["note"].str.startswith("skipped")
+    assert skipped.iloc[:5].tolist() == [True, True, True, True, False]
+    assert folds.loc[skipped, "roc_auc"].isna().all()
+    assert folds.loc[4, "note"] == "validation block has a single class"
+    assert folds.loc[5, "note"] == "4 of 5 folds skipped"
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from pevolc.features import StreamingPreprocessor, WindowConfig, extract_entropy_features
+from pevolc.pipelines import compute_entropy_dataset
+
+
+def _write_traces(tmp_path, n_files=3):
+    rng = np.random.default_rng(5)
+    paths = []
+    for i in range(n_files):
+        path = tmp_path / f"{'eruption' if i % 2 else 'background'}_{i}.npy"
+        np.save(path, rng.normal(size=3000))
+        paths.append(path)
+    return paths
+
+
+def test_process_pool_matches_serial_and_reports_failures(tmp_path):
+    paths = _write_traces(tmp_path)
+    broken = tmp_path / "broken.npy"
+    broken.write_text("not an array")
+    cfg = {
+        "sampling_rate_hz": 100.0,
+        "window_seconds": 5,
+        "step_seconds": 2.5,
+        "label_mapping": {"eruption": 1, "background": 0},
+    }
+    serial = compute_entropy_dataset(paths, tmp_path / "serial.csv", cfg)
+    parallel = compute_entropy_dataset(
+        [paths[0], broken, *paths[1:]], tmp_path / "parallel.csv", cfg | {"n_workers": 2}
+    )
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert list(parallel.attrs["failed_files"]) == [str(broken)]
+    assert serial.attrs["failed_files"] == {}
+    assert list(parallel["source_file"].unique()) == [p.name for p in paths]
+
+
+def test_causal_preprocessing_mode(tmp_path):
+    paths = _write_traces(tmp_path, n_files=1)
+    cfg = {
+        "sampling_rate_hz": 100.0,
+        "window_seconds": 5,
+        "step_seconds": 2.5,
+        "bandpass_low": 1.0,
+        "bandpass_high": 15.0,
+        "detrend": True,
+        "zscore": True,
+    }
+    offline = compute_entropy_dataset(paths, tmp_path / "offline.csv", cfg)
+    causal = compute_entropy_dataset(
+        paths,
+        tmp_path / "causal.csv",
+        cfg | {"preprocessing": "causal", "preprocess_block_seconds": 7},
+    )
+    pd.testing.assert_index_equal(causal.columns, offline.columns)
+    np.testing.assert_array_equal(causal["start_s"], offline["start_s"])
+
+    # Same result as preprocessing the whole trace in one causal pass.
+    preprocessor = StreamingPreprocessor(100.0, 1.0, 15.0, detrend=True, zscore=True)
+    expected = extract_entropy_features(
+        preprocessor.process(np.load(paths[0])), 100.0, WindowConfig(5, 2.5)
+    )
+    np.testing.assert_allclose(causal[expected.columns], expected, rtol=1e-9, atol=1e-12)
+    # Filter, trend and normalisation state carries across preprocessing blocks.
+    reblocked = compute_entropy_dataset(
+        paths,
+        tmp_path / "reblocked.csv",
+        cfg | {"preprocessing": "causal", "preprocess_block_seconds": 3.3},
+    )
+    np.testing.assert_allclose(
+        reblocked[expected.columns], causal[expected.columns], rtol=1e-9, atol=1e-12
+    )
+
+
+def test_feature_cache_reuses_unchanged_files(tmp_path):
+    paths = _write_traces(tmp_path)
+    cfg = {
+        "sampling_rate_hz": 100.0,
+        "window_seconds": 5,
+        "step_seconds": 2.5,
+        "label_mapping": {"eruption": 1, "background": 0},
+        "cache_dir": str(tmp_path / "cache"),
+    }
+    first = compute_entropy_dataset(paths, tmp_path / "first.csv", cfg)
+    assert first.attrs["cache_stats"]["misses"] == 3
+
+    np.save(paths[1], np.random.default_rng(9).normal(size=3000))
+    second = compute_entropy_dataset(paths, tmp_path / "second.csv", cfg | {"n_workers": 2})
+    assert second.attrs["cache_stats"] == {"hits": 2, "misses": 1, "evicted": 0}
+    uncached = compute_entropy_dataset(paths, tmp_path / "plain.csv", cfg | {"cache_dir": None})
+    pd.testing.assert_frame_equal(second, uncached)
+
+    changed = compute_entropy_dataset(paths, tmp_path / "third.csv", cfg | {"order": 4})
+    assert changed.attrs["cache_stats"]["hits"] == 0
+    bounded = compute_entropy_dataset(paths, tmp_path / "fourth.csv", cfg | {"cache_max_mb": 0})
+    assert bounded.attrs["cache_stats"]["evicted"] == 7
+    assert not list((tmp_path / "cache" / "entries").iterdir())
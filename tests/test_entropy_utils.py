@@ -0,0 +1,79 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from pevolc.entropy import compute_wpe, entropy_sweep
+from pevolc.entropy.utils import (
+    _embed,
+    iter_pattern_chunks,
+    ordinal_pattern_indices,
+    pattern_distribution,
+    pattern_histogram,
+)
+
+
+def _reference_indices(signal, order, delay):
+    lookup = {perm: idx for idx, perm in enumerate(itertools.permutations(range(order)))}
+    emb = _embed(np.asarray(signal, dtype=float), order, delay)
+    argsorted = np.argsort(emb, axis=1, kind="mergesort")
+    return np.array([lookup[tuple(row)] for row in argsorted])
+
+
+@pytest.mark.parametrize("order,delay", [(2, 1), (3, 1), (4, 2), (5, 1), (6, 3)])
+def test_ordinal_pattern_indices_match_permutation_lookup(order, delay):
+    rng = np.random.default_rng(order)
+    # Quantised noise exercises tie-breaking alongside distinct values.
+    signal = np.round(rng.normal(size=600), 1)
+    ids = ordinal_pattern_indices(signal, order, delay)
+    np.testing.assert_array_equal(ids, _reference_indices(signal, order, delay))
+
+
+def test_ordinal_pattern_indices_compact_dtype_high_order():
+    rng = np.random.default_rng(0)
+    ids = ordinal_pattern_indices(rng.normal(size=5000), order=10, delay=1)
+    assert ids.dtype == np.int32
+    assert ids.min() >= 0 and ids.max() < math.factorial(10)
+    assert ordinal_pattern_indices(np.arange(10.0), order=5, delay=1).dtype == np.int8
+
+
+def test_sparse_histogram_matches_dense_and_counts_forbidden_patterns():
+    rng = np.random.default_rng(4)
+    signal = rng.normal(size=300)
+    weights = rng.uniform(0.5, 2.0, size=300 - 5)
+    for w in (None, weights):
+        sparse = pattern_histogram(signal, order=6, delay=1, weights=w, sparse=True)
+        dense = pattern_histogram(signal, order=6, delay=1, weights=w, sparse=False)
+        np.testing.assert_array_equal(sparse.ids, dense.ids)
+        assert sparse.entropy(base=2) == pytest.approx(dense.entropy(base=2), abs=1e-12)
+        np.testing.assert_allclose(sparse.to_dense()[0], pattern_distribution(signal, 6, 1, w)[0])
+    n_observed = len(np.unique(ordinal_pattern_indices(signal, 6, 1)))
+    assert dense.n_forbidden == math.factorial(6) - n_observed
+    # order 10 has 3.6M patterns; the automatic sparse path never builds that vector.
+    assert pattern_histogram(signal, order=10, delay=1).n_forbidden > math.factorial(10) - 300
+
+
+@pytest.mark.parametrize("budget", [64, 1000, 10**6])
+def test_memory_budget_matches_one_shot_extraction(budget):
+    rng = np.random.default_rng(11)
+    signal = np.round(rng.normal(size=2000), 1)
+    ids = ordinal_pattern_indices(signal, order=5, delay=3)
+    chunked = ordinal_pattern_indices(signal, order=5, delay=3, memory_budget=budget)
+    np.testing.assert_array_equal(chunked, ids)
+    np.testing.assert_array_equal(
+        np.concatenate(list(iter_pattern_chunks(signal, 5, 3, budget))), ids
+    )
+    one_shot = pattern_histogram(signal, order=5, delay=3)
+    bounded = pattern_histogram(signal, order=5, delay=3, memory_budget=budget)
+    np.testing.assert_array_equal(bounded.ids, one_shot.ids)
+    np.testing.assert_array_equal(bounded.counts, one_shot.counts)
+    assert compute_wpe(signal, order=5, delay=3, memory_budget=budget) == pytest.approx(
+        compute_wpe(signal, order=5, delay=3), abs=1e-12
+    )
+    sweep = entropy_sweep(signal, 400, 150, orders=[3, 5], delays=[1, 3], scales=2)
+    bounded_sweep = entropy_sweep(
+        signal, 400, 150, orders=[3, 5], delays=[1, 3], scales=2, memory_budget=budget
+    )
+    for name, values in sweep.items():
+        np.testing.assert_allclose(bounded_sweep[name], values, rtol=0, atol=1e-12)
@@ -1,7 +1,10 @@
+import joblib
 import yaml
 import numpy as np
 import pandas as pd
+import pytest
 
+from pevolc.compiled import load_compiled
 from pevolc.pipelines import train_forecaster
 
 
@@ -30,3 +33,52 @@ def test_training_pipeline_placeholder(tmp_path):
     assert "roc_auc" in result
     assert (tmp_path / "model.joblib").exists()
     assert (tmp_path / "metrics.csv").exists()
+
+
+def test_incremental_training_streams_chunks(tmp_path):
+    rng = np.random.default_rng(1)
+    n = 3000
+    pe_feature = rng.normal(size=n)
+    label = (pe_feature + rng.normal(scale=0.5, size=n) > 0).astype(int)
+    df = pd.DataFrame(
+        {"start_s": np.arange(n) * 5.0, "pe": pe_feature, "wpe": 50 + rng.normal(size=n), "label": label}
+    )
+    dataset_path = tmp_path / "dataset.csv"
+    df.to_csv(dataset_path, index=False)
+
+    cfg = {
+        "dataset_path": str(dataset_path),
+        "label_column": "label",
+        "feature_columns": ["pe", "wpe"],
+        "model_type": "sgd",
+        "chunk_rows": 250,
+        "split": {"type": "time", "val_fraction": 0.2, "time_column": "start_s"},
+        "model_path": str(tmp_path / "model.joblib"),
+        "metrics_path": str(tmp_path / "metrics.csv"),
+    }
+    cfg_path = tmp_path / "config.yaml"
+    cfg_path.write_text(yaml.safe_dump(cfg))
+
+    result = train_forecaster.run_training(cfg_path)
+    assert result["roc_auc"] > 0.85
+    model = joblib.load(tmp_path / "model.joblib")
+    probs = model.predict_proba(df[["pe", "wpe"]].to_numpy())
+    assert model.calibrator is not None and ((probs > 0) & (probs < 1)).all()
+    compiled = load_compiled(result["compiled_path"])
+    np.testing.assert_allclose(compiled.predict_proba(df[["pe", "wpe"]].to_numpy()), probs)
+    assert set(model.predict_alert_level(df[["pe", "wpe"]].to_numpy()[:50])) <= {"green", "yellow", "red"}
+
+
+def test_random_split_rejects_single_row_class(tmp_path):
+    df = pd.DataFrame({"pe": np.linspace(0, 1, 40), "label": [0] * 39 + [1]})
+    df.to_csv(tmp_path / "dataset.csv", index=False)
+    cfg = {
+        "dataset_path": str(tmp_path / "dataset.csv"),
+        "split": {"type": "random", "val_fraction": 0.2},
+        "model_path": str(tmp_path / "model.joblib"),
+        "metrics_path": str(tmp_path / "metrics.csv"),
+    }
+    cfg_path = tmp_path / "config.yaml"
+    cfg_path.write_text(yaml.safe_dump(cfg))
+    with pytest.raises(ValueError, match="at least two rows of each class"):
+        train_forecaster.run_training(cfg_path)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pevolc.features import select_sweep_columns
+from pevolc.pipelines.grid import plan_grid, run_grid
+
+
+def _grid_cfg(tmp_path):
+    rng = np.random.default_rng(3)
+    for name, scale in (("background_0", 1.0), ("eruption_1", 3.0)):
+        np.save(tmp_path / f"{name}.npy", rng.normal(scale=scale, size=6000))
+    return {
+        "base": {
+            "data_glob": str(tmp_path / "*.npy"),
+            "sampling_rate_hz": 100,
+            "window_seconds": 2,
+            "step_seconds": 1,
+            "label_mapping": {"eruption": 1, "background": 0},
+            "split": {"type": "random", "val_fraction": 0.2},
+        },
+        "orders": [3],
+        "delays": [1, 2],
+        "scales": [2],
+        "model_types": ["logreg", "random_forest"],
+    }
+
+
+def test_plan_shares_feature_tasks(tmp_path):
+    tasks = plan_grid(_grid_cfg(tmp_path), tmp_path / "grid")
+    kinds = [task.kind for task in tasks]
+    assert kinds.count("sweep") == 1 and kinds.count("features") == 2
+    assert kinds.count("train") == 4
+    features = {task.name for task in tasks if task.kind == "features"}
+    assert all(t.depends_on[0] in features for t in tasks if t.kind == "train")
+
+
+def test_run_grid_resumes(tmp_path):
+    cfg = _grid_cfg(tmp_path) | {"model_types": ["logreg"]}
+    root = tmp_path / "grid"
+    first = run_grid(cfg, root, n_workers=2)
+    assert len(first) == 2 and set(first["status"]) == {"computed"}
+    assert (first["wall_time_s"] > 0).all() and (first["peak_rss_mb"] > 0).all()
+    assert (root / "summary.csv").exists()
+
+    (root / "m3_tau2_s2_logreg" / "run.json").unlink()
+    second = run_grid(cfg, root, n_workers=2)
+    status = dict(zip(second["run"], second["status"]))
+    assert status.pop("m3_tau2_s2_logreg") == "computed"
+    assert set(status.values()) == {"resumed"}
+    np.testing.assert_allclose(second["roc_auc"], first["roc_auc"])
+
+
+def test_run_grid_recomputes_stale_outputs(tmp_path):
+    cfg = _grid_cfg(tmp_path) | {"delays": [1], "model_types": ["logreg"]}
+    root = tmp_path / "grid"
+    run_grid(cfg, root, n_workers=1)
+
+    # A new order invalidates the sweep, hence every slice and run built on it.
+    grown = run_grid(cfg | {"orders": [3, 4]}, root, n_workers=1)
+    assert set(grown["status"]) == {"computed"}
+    assert "pe" in pd.read_csv(root / "features" / "m4_tau1_s2.csv").columns
+    again = run_grid(cfg | {"orders": [3, 4]}, root, n_workers=1)
+    assert set(again["status"]) == {"resumed"}
+
+    with pytest.raises(ValueError):
+        select_sweep_columns(pd.read_csv(root / "sweep_features.csv"), order=5, delay=1)
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from pevolc.features import WindowConfig, extract_entropy_columns, iter_entropy_blocks
+from pevolc.io import open_mapped, write_raw_binary
+from pevolc.io.mapped import text_cache_path
+from pevolc.pipelines import compute_entropy_dataset
+
+
+def test_open_mapped_formats(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    data = np.random.default_rng(0).integers(-500, 500, size=1000).astype(np.int32)
+    np.save(tmp_path / "a.npy", data)
+    write_raw_binary(tmp_path / "a.bin", data.astype(">i4"), 50.0)
+    np.savetxt(tmp_path / "a.txt", data)
+
+    mapped, sr = open_mapped(tmp_path / "a.npy")
+    assert isinstance(mapped, np.memmap) and sr is None
+    raw, sr = open_mapped(tmp_path / "a.bin")
+    assert isinstance(raw, np.memmap) and sr == 50.0 and raw.dtype == np.dtype(">i4")
+    np.testing.assert_array_equal(raw, data)
+
+    text, _ = open_mapped(tmp_path / "a.txt")
+    np.testing.assert_array_equal(text, data)
+    cache = text_cache_path(tmp_path / "a.txt")
+    # The cache never lands in the data directory.
+    assert cache.parent == tmp_path / "xdg" / "pevolc" / "text"
+    assert sorted(p.name for p in tmp_path.glob("a.*")) == ["a.bin", "a.json", "a.npy", "a.txt"]
+    mtime = cache.stat().st_mtime_ns
+    open_mapped(tmp_path / "a.txt")
+    assert cache.stat().st_mtime_ns == mtime
+
+
+def test_entropy_blocks_match_whole_trace():
+    x = np.random.default_rng(1).normal(size=4000)
+    cfg = WindowConfig(window_seconds=3, step_seconds=1.5, scales=2)
+    full = extract_entropy_columns(x, 100.0, cfg)
+    blocks = list(iter_entropy_blocks(x, 100.0, cfg, block_samples=700))
+    assert len(blocks) > 1
+    for name, values in full.items():
+        np.testing.assert_allclose(np.concatenate([b[name] for b in blocks]), values, atol=1e-12)
+
+
+def test_block_mode_pipeline_matches_in_memory(tmp_path):
+    path = tmp_path / "background_0.bin"
+    write_raw_binary(path, np.random.default_rng(2).normal(size=3000).astype(np.float32), 100.0)
+    cfg = {"sampling_rate_hz": 100.0, "window_seconds": 5, "step_seconds": 2.5}
+    in_memory = compute_entropy_dataset([path], tmp_path / "full.csv", cfg)
+    blocked = compute_entropy_dataset([path], tmp_path / "blocks.csv", cfg | {"block_seconds": 8})
+    pd.testing.assert_frame_equal(blocked, in_memory, atol=1e-9)
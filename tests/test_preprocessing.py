@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.signal import detrend
+
+from pevolc.features import (
+    StreamingEntropyExtractor,
+    StreamingPreprocessor,
+    WindowConfig,
+    design_filter,
+    extract_entropy_features,
+    preprocess_blocks,
+)
+from pevolc.features.preprocessing import CausalDetrend, RunningZScore, _design
+
+
+def _trace(n=20000):
+    rng = np.random.default_rng(0)
+    return np.cumsum(rng.normal(size=n)) + 0.01 * np.arange(n) + 1e4
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 1000, 4096])
+def test_causal_preprocessing_does_not_depend_on_blocks(block_size):
+    signal = _trace()
+    one_shot = StreamingPreprocessor(100.0, 1.0, 15.0, detrend=True, zscore=True).process(signal)
+    preprocessor = StreamingPreprocessor(100.0, 1.0, 15.0, detrend=True, zscore=True)
+    blocks = preprocess_blocks(signal, preprocessor, block_size)
+    np.testing.assert_allclose(blocks, one_shot, rtol=0, atol=1e-12)
+
+
+def test_running_statistics_reach_whole_trace_values():
+    signal = _trace()
+    zscored = RunningZScore().process(signal)
+    assert zscored[-1] == pytest.approx((signal[-1] - signal.mean()) / signal.std(), rel=1e-9)
+    assert CausalDetrend().process(signal)[-1] == pytest.approx(detrend(signal)[-1], rel=1e-9)
+    assert zscored[0] == 0.0
+
+
+def test_filter_designs_are_cached():
+    _design.cache_clear()
+    first = design_filter(100, 1, 15)
+    second = design_filter(100.0, 1.0, 15.0)
+    np.testing.assert_array_equal(first, second)
+    assert _design.cache_info().hits == 1
+    assert design_filter(100.0) is None
+
+
+def test_streaming_extractor_with_preprocessor_matches_block_preprocessing():
+    signal = _trace(6000)
+    cfg = WindowConfig(5, 2)
+
+    def preprocessor():
+        return StreamingPreprocessor(100.0, 1.0, 15.0, detrend=True, zscore=True)
+
+    expected = extract_entropy_features(preprocess_blocks(signal, preprocessor(), 512), 100.0, cfg)
+    extractor = StreamingEntropyExtractor(100.0, cfg, preprocessor=preprocessor())
+    rows = []
+    for start in range(0, len(signal), 333):
+        rows.extend(extractor.push(signal[start : start + 333]))
+    streamed = pd.DataFrame(rows, columns=extractor.columns)
+    np.testing.assert_allclose(streamed, expected, rtol=1e-9, atol=1e-9)
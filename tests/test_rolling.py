@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from scipy.stats import kurtosis
+
+from pevolc.features import extract_basic_features, rolling_basic_stats
+from pevolc.features.rolling import sliding_extremum
+
+
+@pytest.mark.parametrize(
+    "signal",
+    [
+        np.random.default_rng(0).normal(size=5000),
+        np.random.default_rng(1).normal(size=5000) + 2e6,
+        (np.random.default_rng(2).normal(size=5000) * 1000).astype(np.int32),
+        np.r_[np.zeros(700), np.random.default_rng(3).normal(size=3000)],
+    ],
+)
+def test_rolling_basic_stats_match_per_window(signal):
+    window, step = 300, 70
+    starts = range(0, len(signal) - window + 1, step)
+    stats = rolling_basic_stats(signal, window, step, stats=("mean", "std", "rms", "max", "min"))
+    for name, values in stats.items():
+        expected = [extract_basic_features(signal[s : s + window])[name] for s in starts]
+        if name in ("max", "min"):
+            np.testing.assert_array_equal(values, expected)
+        else:
+            np.testing.assert_allclose(values, expected, rtol=1e-10, atol=1e-12)
+    if signal[0] == 0:
+        n_flat = (700 - window) // step + 1
+        assert np.all(stats["std"][:n_flat] == 0)
+    kurt = rolling_basic_stats(signal, window, step, stats=("kurtosis",))["kurtosis"]
+    np.testing.assert_allclose(kurt, [kurtosis(signal[s : s + window]) for s in starts], atol=1e-6)
+
+
+def test_sliding_extremum_matches_naive():
+    x = np.random.default_rng(4).integers(-50, 50, size=1001)
+    for window in (1, 7, 64, 1001):
+        expected = [x[s : s + window].max() for s in range(len(x) - window + 1)]
+        np.testing.assert_array_equal(sliding_extremum(x, window, np.maximum), expected)
+
+
+def test_rolling_basic_stats_precision_after_burst():
+    # A burst must not degrade the moments of later windows of a long trace.
+    x = np.random.default_rng(5).normal(size=2_000_000)
+    x[200_000:300_000] *= 1e5
+    window, step = 1000, 500
+    stats = rolling_basic_stats(x, window, step)
+    starts = np.arange(0, len(x) - window + 1, step)[-50:]
+    for name in ("mean", "std", "rms"):
+        expected = [extract_basic_features(x[s : s + window])[name] for s in starts]
+        np.testing.assert_allclose(stats[name][-50:], expected, rtol=1e-10, atol=1e-12)
@@ -1,6 +1,15 @@
 import numpy as np
+import pytest
 
-from pevolc.features import WindowConfig, extract_basic_features, extract_entropy_features
+from pevolc.entropy import compute_mpe, compute_pe, compute_wpe
+from pevolc.features import (
+    FeaturePlan,
+    WindowConfig,
+    extract_basic_features,
+    extract_entropy_columns,
+    extract_entropy_features,
+)
+from pevolc.io import apply_dtype_policy
 
 
 def test_extract_basic_features_placeholder():
@@ -16,3 +25,66 @@ def test_extract_entropy_features_dataframe_shape():
     df = extract_entropy_features(signal, sampling_rate, cfg)
     assert not df.empty
     assert {"pe", "wpe", "mpe_scale_1", "mpe_scale_2"}.issubset(df.columns)
+
+
+def test_feature_plan_matches_individual_entropy_calls():
+    rng = np.random.default_rng(3)
+    segment = np.round(rng.normal(size=300), 1)
+    cfg = WindowConfig(window_seconds=3.0, step_seconds=3.0, order=4, delay=2, scales=3)
+    values = FeaturePlan.from_config(cfg).evaluate(segment)
+    assert values["pe"] == compute_pe(segment, order=4, delay=2)
+    assert values["wpe"] == compute_wpe(segment, order=4, delay=2)
+    mpe_vals = compute_mpe(segment, scales=3, order=4, delay=2)
+    assert [values[f"mpe_scale_{i}"] for i in (1, 2, 3)] == mpe_vals
+
+    cfg.compute_pe = False
+    plan = FeaturePlan.from_config(cfg)
+    assert plan.columns == ["wpe", "mpe_scale_1", "mpe_scale_2", "mpe_scale_3"]
+    assert list(plan.evaluate(segment)) == plan.columns
+
+
+@pytest.mark.parametrize("engine", ["window", "incremental", "batch"])
+def test_dtype_policies_match_float64_path(engine):
+    rng = np.random.default_rng(3)
+    counts = (np.cumsum(rng.normal(size=6000)) * 300).astype(np.int32)
+    assert apply_dtype_policy(counts, "native").dtype == np.int32
+    assert apply_dtype_policy(counts, "float32").dtype == np.float32
+    entropy_cols = ["pe", "wpe", "mpe_scale_1", "mpe_scale_2", "mpe_scale_3"]
+    for preprocess in (False, True):
+        kwargs = dict(engine=engine, detrend_signal=preprocess, zscore=preprocess)
+        ref = extract_entropy_features(counts, 100.0, WindowConfig(10, 5, **kwargs))
+        native = extract_entropy_features(
+            counts, 100.0, WindowConfig(10, 5, dtype_policy="native", **kwargs)
+        )
+        single = extract_entropy_features(
+            counts, 100.0, WindowConfig(10, 5, dtype_policy="float32", **kwargs)
+        )
+        np.testing.assert_allclose(native[entropy_cols], ref[entropy_cols], rtol=0, atol=1e-12)
+        np.testing.assert_allclose(single[entropy_cols], ref[entropy_cols], rtol=0, atol=1e-6)
+
+
+@pytest.mark.parametrize("engine,alignment", [("window", "exact"), ("incremental", "floor")])
+def test_chunked_trace_matches_serial_rows(engine, alignment):
+    rng = np.random.default_rng(1)
+    signal = rng.normal(size=12011)
+    kwargs = dict(engine=engine, mpe_alignment=alignment, zscore=True, scales=4)
+    serial = extract_entropy_features(signal, 100.0, WindowConfig(7, 2.3, **kwargs))
+    for split in (dict(n_jobs=2), dict(chunk_seconds=17.0)):
+        chunked = extract_entropy_features(signal, 100.0, WindowConfig(7, 2.3, **kwargs, **split))
+        assert list(chunked.columns) == list(serial.columns)
+        np.testing.assert_array_equal(chunked["start_s"], serial["start_s"])
+        np.testing.assert_array_equal(chunked["end_s"], serial["end_s"])
+        np.testing.assert_allclose(chunked, serial, rtol=0, atol=1e-12)
+
+
+def test_entropy_columns_match_dataframe():
+    rng = np.random.default_rng(2)
+    signal = rng.normal(size=4000)
+    cfg = WindowConfig(window_seconds=5, step_seconds=1.5, engine="incremental", compute_pe=False)
+    columns = extract_entropy_columns(signal, 100.0, cfg)
+    table = extract_entropy_features(signal, 100.0, cfg)
+    assert list(columns) == list(table.columns)
+    assert all(isinstance(values, np.ndarray) for values in columns.values())
+    for name, values in columns.items():
+        np.testing.assert_array_equal(values, table[name].to_numpy())
+    assert len(columns["start_s"]) == (4000 - 500) // 150 + 1
@@ -0,0 +1,94 @@
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import joblib
+import numpy as np
+
+from pevolc.models import PermutationEntropyForecaster
+from pevolc.models.serving import MicroBatcher, ScoringServer
+
+
+def _post(url, rows):
+    request = urllib.request.Request(
+        url, data=json.dumps({"rows": rows}).encode(), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())["probabilities"]
+
+
+def test_server_batches_requests_and_reloads_model(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 2))
+    y = (X[:, 0] > 0).astype(int)
+    model_path = tmp_path / "forecaster.joblib"
+    joblib.dump(PermutationEntropyForecaster(calibrate=False).fit(X, y), model_path)
+
+    server = ScoringServer(model_path, port=0, max_wait_ms=20, reload_interval=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = "http://%s:%d" % server.server_address[:2]
+    try:
+        expected = joblib.load(model_path).predict_proba(X)
+        results = [None] * 20
+
+        def score(i):
+            results[i] = _post(f"{url}/score", X[i * 10 : (i + 1) * 10].tolist())
+
+        threads = [threading.Thread(target=score, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        np.testing.assert_allclose(np.concatenate(results), expected)
+
+        with urllib.request.urlopen(f"{url}/stats") as response:
+            stats = json.loads(response.read())
+        assert stats["requests"] == 20 and stats["batches"] <= 20
+        assert stats["latency"]["p50_ms"] > 0
+
+        flipped = PermutationEntropyForecaster(calibrate=False).fit(X, 1 - y)
+        tmp = tmp_path / "new.joblib"
+        joblib.dump(flipped, tmp)
+        os.replace(tmp, model_path)
+        np.testing.assert_allclose(_post(f"{url}/score", X[:5].tolist()), flipped.predict_proba(X[:5]))
+        assert server.stats()["model_reloads"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_bad_request_does_not_fail_its_batch(tmp_path):
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(100, 2))
+    model = PermutationEntropyForecaster(calibrate=False).fit(X, (X[:, 0] > 0).astype(int))
+
+    batcher = MicroBatcher(model.predict_proba, max_wait_ms=200)
+    try:
+        bad = batcher.submit(np.ones((2, 3)))
+        good = batcher.submit(X[:5])
+        np.testing.assert_allclose(good.result(), model.predict_proba(X[:5]))
+        assert isinstance(bad.exception(), ValueError)
+    finally:
+        batcher.close()
+
+    model_path = tmp_path / "forecaster.joblib"
+    joblib.dump(model, model_path)
+    server = ScoringServer(model_path, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = "http://%s:%d/score" % server.server_address[:2]
+    try:
+        for rows in ([[0.0, 1.0, 2.0]], [[0.0, float("nan")]]):
+            try:
+                _post(url, rows)
+            except urllib.error.HTTPError as exc:
+                assert exc.code == 400
+            else:
+                raise AssertionError("invalid rows were scored")
+        assert len(_post(url, X[:3].tolist())) == 3
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from pevolc.entropy import mpe, pe, sliding, wpe
+from pevolc.features import WindowConfig, extract_entropy_features
+
+
+@pytest.mark.parametrize("window,step", [(100, 10), (100, 100), (60, 150)])
+def test_sliding_pe_matches_per_window(window, step):
+    rng = np.random.default_rng(7)
+    signal = np.round(rng.normal(size=1000), 1)
+    values = sliding.sliding_pe(signal, window, step, order=4, delay=2, base=2)
+    expected = [
+        pe.compute_pe(signal[s : s + window], order=4, delay=2, base=2)
+        for s in range(0, len(signal) - window + 1, step)
+    ]
+    np.testing.assert_allclose(values, expected, rtol=0, atol=1e-12)
+
+
+def test_incremental_engine_matches_window_engine():
+    sampling_rate = 20.0
+    t = np.arange(0, 60, 1 / sampling_rate)
+    signal = np.sin(2 * np.pi * 0.5 * t) + np.random.default_rng(1).normal(scale=0.3, size=t.size)
+    base_cfg = dict(window_seconds=5.0, step_seconds=1.0, order=3, scales=2)
+    expected = extract_entropy_features(signal, sampling_rate, WindowConfig(**base_cfg))
+    df = extract_entropy_features(
+        signal, sampling_rate, WindowConfig(**base_cfg, engine="incremental")
+    )
+    for column in ("pe", "wpe", "mpe_scale_1", "mpe_scale_2"):
+        np.testing.assert_allclose(df[column], expected[column], rtol=0, atol=1e-12)
+    flat = extract_entropy_features(
+        np.ones(200), sampling_rate, WindowConfig(**base_cfg, engine="incremental")
+    )
+    assert (flat["pe"] == 0.0).all()
+
+
+def test_sliding_mpe_matches_compute_mpe_with_misaligned_starts():
+    rng = np.random.default_rng(5)
+    signal = rng.normal(size=900)
+    window, step = 120, 7  # starts hit every phase of scales 2 and 3
+    values = sliding.sliding_mpe(signal, window, step, scales=3, order=3, base=2)
+    expected = [
+        mpe.compute_mpe(signal[s : s + window], scales=3, order=3, base=2)
+        for s in range(0, len(signal) - window + 1, step)
+    ]
+    np.testing.assert_allclose(values, expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("dtype", [float, np.int32])
+def test_sliding_mpe_matches_compute_mpe_on_quantized_counts(dtype):
+    # Small integer counts tie often; block means must tie exactly as in coarse_grain.
+    signal = np.random.default_rng(6).integers(-3, 4, size=5000).astype(dtype)
+    window, step = 1000, 300
+    values = sliding.sliding_mpe(signal, window, step, scales=3)
+    expected = [
+        mpe.compute_mpe(signal[s : s + window], scales=3)
+        for s in range(0, len(signal) - window + 1, step)
+    ]
+    np.testing.assert_allclose(values, expected, atol=1e-12)
+    np.testing.assert_allclose(values[:, 0], sliding.sliding_pe(signal, window, step), atol=1e-12)
+
+    cfg = dict(window_seconds=10.0, step_seconds=3.0, scales=4)
+    windowed = extract_entropy_features(signal, 100.0, WindowConfig(**cfg))
+    incremental = extract_entropy_features(signal, 100.0, WindowConfig(**cfg, engine="incremental"))
+    np.testing.assert_allclose(incremental, windowed, atol=1e-12)
+
+
+def test_sliding_mpe_floor_alignment_uses_block_boundaries():
+    rng = np.random.default_rng(6)
+    signal = rng.normal(size=400)
+    values = sliding.sliding_mpe(signal, 60, 5, scales=[4], order=3, alignment="floor")
+    starts = range(0, len(signal) - 60 + 1, 5)
+    expected = [mpe.compute_mpe(signal[s - s % 4 : s - s % 4 + 60], scales=[4]) for s in starts]
+    np.testing.assert_allclose(values, expected, atol=1e-12)
+
+
+def test_sliding_wpe_tracks_bursts_of_large_amplitude():
+    rng = np.random.default_rng(8)
+    signal = rng.normal(size=1500)
+    signal[500:560] *= 1e6  # burst entering and leaving the window
+    window, step = 200, 15
+    values = sliding.sliding_wpe(signal, window, step, order=3, base=2)
+    expected = [
+        wpe.compute_wpe(signal[s : s + window], order=3, base=2)
+        for s in range(0, len(signal) - window + 1, step)
+    ]
+    np.testing.assert_allclose(values, expected, rtol=1e-9, atol=1e-12)
@@ -0,0 +1,55 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pevolc.features import StreamingEntropyExtractor, WindowConfig, extract_entropy_features
+
+
+@pytest.mark.parametrize("window_s,step_s", [(5, 1.3), (2, 3.5)])
+def test_streaming_rows_match_batch_output(window_s, step_s):
+    rng = np.random.default_rng(0)
+    signal = np.round(rng.normal(size=7003), 1)
+    cfg = WindowConfig(window_s, step_s, order=4, delay=2, scales=3)
+    expected = extract_entropy_features(signal, 100.0, cfg)
+
+    extractor = StreamingEntropyExtractor(100.0, cfg)
+    rows, pos = [], 0
+    while pos < len(signal):
+        size = int(rng.integers(1, 400))
+        rows.extend(extractor.push(signal[pos : pos + size]))
+        pos += size
+    streamed = pd.DataFrame(rows, columns=extractor.columns)
+
+    assert list(streamed.columns) == list(expected.columns)
+    np.testing.assert_allclose(streamed, expected, rtol=1e-10, atol=1e-12)
+    # Buffers never hold more than one window, however long the stream.
+    assert extractor._samples.capacity == extractor.window
+    assert extractor._patterns.ids.capacity <= extractor.window
+
+
+def test_streaming_rejects_whole_trace_preprocessing():
+    with pytest.raises(ValueError):
+        StreamingEntropyExtractor(100.0, WindowConfig(5, 1, zscore=True))
+
+
+def test_streaming_push_cost_independent_of_window():
+    rng = np.random.default_rng(1)
+
+    def per_push_seconds(window_s):
+        cfg = WindowConfig(window_s, window_s, order=4, delay=1, scales=3)
+        extractor = StreamingEntropyExtractor(100.0, cfg)
+        extractor.push(rng.normal(size=extractor.window + 1))
+        best = np.inf
+        for _ in range(3):
+            packets = rng.normal(size=(200, 1))
+            start = time.perf_counter()
+            for packet in packets:
+                extractor.push(packet)
+            best = min(best, (time.perf_counter() - start) / len(packets))
+        return best
+
+    small, large = per_push_seconds(10), per_push_seconds(10_000)
+    # 1000 vs 1,000,000 samples per window: per-push time must not scale with it.
+    assert large < 3 * small
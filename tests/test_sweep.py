@@ -0,0 +1,44 @@
+import numpy as np
+
+from pevolc.entropy import sliding, sweep
+from pevolc.features import (
+    WindowConfig,
+    extract_entropy_features,
+    extract_sweep_features,
+    select_sweep_columns,
+)
+
+
+def test_entropy_sweep_matches_single_configuration_paths():
+    rng = np.random.default_rng(12)
+    signal = np.round(rng.normal(size=800), 1)
+    columns = sweep.entropy_sweep(signal, 150, 25, orders=[3, 5], delays=[1, 2], scales=2)
+    for order in (3, 5):
+        for delay in (1, 2):
+            kwargs = dict(order=order, delay=delay)
+            np.testing.assert_allclose(
+                columns[sweep.sweep_column("pe", order, delay)],
+                sliding.sliding_pe(signal, 150, 25, **kwargs),
+                atol=1e-12,
+            )
+            np.testing.assert_allclose(
+                columns[sweep.sweep_column("wpe", order, delay)],
+                sliding.sliding_wpe(signal, 150, 25, **kwargs),
+                atol=1e-12,
+            )
+            mpe_values = sliding.sliding_mpe(signal, 150, 25, scales=2, **kwargs)
+            np.testing.assert_allclose(
+                columns[sweep.sweep_column("mpe_scale_2", order, delay)], mpe_values[:, 1]
+            )
+
+
+def test_select_sweep_columns_recovers_configuration_table():
+    sampling_rate = 20.0
+    signal = np.random.default_rng(13).normal(size=1000)
+    cfg = WindowConfig(window_seconds=5.0, step_seconds=2.5, scales=3)
+    table = extract_sweep_features(signal, sampling_rate, cfg, orders=[3, 4], delays=[1, 2])
+    cfg.order, cfg.delay, cfg.scales = 4, 2, 2
+    expected = extract_entropy_features(signal, sampling_rate, cfg)
+    sliced = select_sweep_columns(table, order=4, delay=2, scales=2)
+    assert list(sliced.columns) == list(expected.columns)
+    np.testing.assert_allclose(sliced.to_numpy(), expected.to_numpy(), atol=1e-12)
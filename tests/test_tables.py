@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pevolc.io import read_feature_table, write_feature_table
+from pevolc.pipelines import compute_entropy_dataset
+
+
+def _table():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "source_file": ["a.npy"] * 30 + ["b.npy"] * 30,
+            "start_s": np.tile(np.arange(30) * 10.0, 2),
+            "pe": rng.random(60),
+            "wpe": rng.random(60),
+            "label": [0.0] * 30 + [1.0] * 30,
+        }
+    )
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_feature_table_roundtrip_and_filters(tmp_path, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    table = _table()
+    path = write_feature_table(table, tmp_path / f"features{suffix}", time_partition_seconds=100)
+    pd.testing.assert_frame_equal(read_feature_table(path), table)
+
+    subset = read_feature_table(path, columns=["pe", "label"], time_range=(95.0, 205.0))
+    expected = table[(table["start_s"] >= 95.0) & (table["start_s"] < 205.0)]
+    assert list(subset.columns) == ["pe", "label"]
+    np.testing.assert_allclose(subset["pe"], expected["pe"], rtol=1e-12)
+
+
+def test_parquet_partitions_and_csv_export(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "train.npy"
+    np.save(path, np.random.default_rng(1).normal(size=3000))
+    cfg = {
+        "sampling_rate_hz": 100.0,
+        "window_seconds": 5,
+        "step_seconds": 2.5,
+        "time_partition_seconds": 10,
+        "csv_export_path": str(tmp_path / "export.csv"),
+    }
+    dataset = compute_entropy_dataset([path], tmp_path / "features.parquet", cfg)
+    assert (tmp_path / "features.parquet" / "source_file=train.npy" / "time_bin=1").is_dir()
+    pd.testing.assert_frame_equal(read_feature_table(tmp_path / "features.parquet"), dataset)
+    pd.testing.assert_frame_equal(read_feature_table(tmp_path / "export.csv"), dataset)
+    # Unknown suffixes stay CSV; only unknown explicit formats are rejected.
+    legacy = compute_entropy_dataset([path], tmp_path / "features.dat", {"sampling_rate_hz": 100.0})
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "features.dat"), legacy)
+    with pytest.raises(ValueError):
+        compute_entropy_dataset(
+            [path], tmp_path / "features.h5", {"sampling_rate_hz": 100.0, "output_format": "hdf5"}
+        )
+
+
+def test_write_refuses_to_replace_foreign_directory(tmp_path):
+    pytest.importorskip("pyarrow")
+    processed = tmp_path / "processed"
+    processed.mkdir()
+    (processed / "keep.csv").write_text("x\n1\n")
+    with pytest.raises(FileExistsError):
+        write_feature_table(_table(), processed)
+    assert (processed / "keep.csv").exists()
+
+    # A dataset written here earlier is replaced.
+    path = write_feature_table(_table(), tmp_path / "features.parquet")
+    write_feature_table(_table().head(10), path)
+    assert len(read_feature_table(path)) == 10
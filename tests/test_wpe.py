@@ -1,6 +1,8 @@
 import numpy as np
+import pytest
 
 from pevolc.entropy import wpe
+from pevolc.entropy.utils import _embed
 
 
 def test_compute_wpe_constant_signal_zero_entropy():
@@ -17,3 +19,20 @@ def test_compute_wpe_energy_weights_matches_range():
 
 def test_compute_wpe_placeholder():
     assert callable(wpe.compute_wpe)
+
+
+@pytest.mark.parametrize(
+    "strategy,reference",
+    [
+        ("variance", lambda emb: emb.var(axis=1)),
+        ("energy", lambda emb: np.sum(emb**2, axis=1)),
+        ("range", lambda emb: np.ptp(emb, axis=1)),
+        ("mad", lambda emb: np.abs(emb - emb.mean(axis=1, keepdims=True)).mean(axis=1)),
+    ],
+)
+def test_rolling_weights_match_embedding_moments(strategy, reference):
+    rng = np.random.default_rng(9)
+    # Raw-count-like amplitudes on a large DC offset.
+    signal = 2.0e6 + rng.integers(-500, 500, size=400).astype(float)
+    weights = wpe.rolling_weights(signal, order=4, delay=2, weight_strategy=strategy)
+    np.testing.assert_allclose(weights, reference(_embed(signal, 4, 2)), rtol=1e-9)